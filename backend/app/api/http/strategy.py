@@ -1,13 +1,34 @@
 from __future__ import annotations
 
-from typing import Literal
+import asyncio
+from typing import Annotated, Any, Hashable, Literal
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Body, HTTPException
+from pydantic import BaseModel, Field, ValidationError
 
-from app.domain.strategy.gt_blackjack import analyze_decision_state
+from app.config import settings
+from app.domain.strategy.bet_sizing import kelly_bet
+from app.domain.strategy.gt_blackjack import (
+    _coerce_player_state,
+    _parse_card_token,
+    _split_pair_card,
+    analysis_cache_info,
+    analyze_decision_state,
+    configure_analysis_cache,
+    security_sweep,
+)
+from app.domain.strategy.tables import lookup_decision_state
+from app.infra.redis import repo
+from app.infra.redis.client import get_redis
+from app.services.round_service import _meta_float, _meta_int
+from app.services.strategy_executor import StrategyUnavailable, get_strategy_executor
 
 router = APIRouter()
+configure_analysis_cache(settings.strategy_cache_size)
+
+MAX_BATCH_SIZE = 1000
+MAX_LAMBDA_GRID = 401
+MAX_BANKROLL_GRID = 1000
 
 
 class StrategyRequest(BaseModel):
@@ -21,22 +42,97 @@ class StrategyRequest(BaseModel):
     can_double: bool | None = None
     infer_can_double: bool = False
     risk_lambda: float = Field(default=1.0, ge=0.0, le=4.0)
+    hit_mode: Literal["optimal", "one_step"] = "optimal"
+    # The table path already scores the default sqrt utility; this forces the full analysis.
+    include_utility: bool = False
+    outcome_format: Literal["entries", "compact"] = "entries"
+    can_split: bool | None = None
+    max_split_hands: int = Field(default=4, ge=2, le=8)
+    double_after_split: bool = True
+    extra_actions: list[Literal["surrender", "insurance"]] = Field(default_factory=list)
+    true_count: float | None = Field(default=None, ge=-40.0, le=40.0)
+    risk_lambdas: list[Annotated[float, Field(ge=0.0, le=4.0)]] | None = Field(
+        default=None, min_length=1, max_length=MAX_LAMBDA_GRID
+    )
+    utility: Literal["sqrt", "log", "crra", "cara"] = "sqrt"
+    utility_param: float | None = Field(default=None, description="CRRA gamma or CARA alpha")
+    bankroll_grid: list[Annotated[int, Field(ge=0)]] | None = Field(
+        default=None, min_length=1, max_length=MAX_BANKROLL_GRID
+    )
 
 
-@router.post("/strategy/blackjack")
-def blackjack_strategy(payload: StrategyRequest) -> dict:
-    try:
-        if payload.player_cards is not None and len(payload.player_cards) > 0:
-            player_state: object = {"cards": payload.player_cards}
-        elif payload.player_total is not None:
-            player_state = (payload.player_total, payload.player_soft_aces)
-        else:
-            raise HTTPException(
-                status_code=422,
-                detail="Provide either player_cards or player_total",
-            )
-
-        return analyze_decision_state(
+class BetRequest(BaseModel):
+    bankroll: int = Field(ge=0)
+    table_id: str | None = Field(default=None, description="Table whose limits and rules apply")
+    true_count: float | None = Field(default=None, ge=-40.0, le=40.0)
+    kelly_multiplier: float = Field(default=1.0, ge=0.0, le=2.0)
+    min_bet: int | None = Field(default=None, gt=0)
+    max_bet: int | None = Field(default=None, gt=0)
+    dealer_soft_17_mode: Literal["S17", "H17", "RANDOM_PER_ROUND"] | None = None
+    blackjack_payout: float | None = Field(default=None, gt=0.0)
+
+
+def _player_state(payload: StrategyRequest) -> object:
+    if payload.player_cards is not None and len(payload.player_cards) > 0:
+        return {"cards": payload.player_cards}
+    if payload.player_total is not None:
+        return (payload.player_total, payload.player_soft_aces)
+    raise ValueError("Provide either player_cards or player_total")
+
+
+def _normalized_key(payload: StrategyRequest, player_state: object) -> Hashable:
+    # Requests that differ only in card order or rank spelling resolve to the same analysis.
+    total, soft_aces = _coerce_player_state(player_state)  # type: ignore[arg-type]
+    card_count = len(payload.player_cards) if isinstance(player_state, dict) else None
+    return (
+        total,
+        soft_aces,
+        card_count,
+        _parse_card_token(payload.dealer_upcard),
+        payload.bet,
+        payload.bankroll,
+        payload.rule,
+        payload.can_double,
+        payload.infer_can_double,
+        payload.risk_lambda,
+        payload.hit_mode,
+        payload.include_utility,
+        payload.outcome_format,
+        _split_pair_card(player_state, payload.bet, payload.bankroll, payload.can_split),  # type: ignore[arg-type]
+        payload.max_split_hands,
+        payload.double_after_split,
+        frozenset(payload.extra_actions),
+        payload.true_count,
+        tuple(payload.risk_lambdas) if payload.risk_lambdas is not None else None,
+        payload.utility,
+        payload.utility_param,
+        frozenset(payload.bankroll_grid) if payload.bankroll_grid is not None else None,
+    )
+
+
+def _evaluate(payload: StrategyRequest, player_state: object) -> dict:
+    result = _analyze(payload, player_state)
+    if payload.risk_lambdas is None:
+        return result
+    # Cached analyses are shared, so the sweep goes on a shallow copy.
+    return {**result, "security_sweep": security_sweep(result["actions"], payload.risk_lambdas)}
+
+
+def _needs_full_analysis(payload: StrategyRequest) -> bool:
+    return (
+        payload.include_utility
+        or payload.utility != "sqrt"
+        or payload.utility_param is not None
+        or payload.bankroll_grid is not None
+        or payload.hit_mode != "optimal"
+        or bool(payload.extra_actions)
+        or payload.true_count is not None
+    )
+
+
+def _analyze(payload: StrategyRequest, player_state: object) -> dict:
+    if not _needs_full_analysis(payload):
+        cached = lookup_decision_state(
             player_state=player_state,  # type: ignore[arg-type]
             dealer_upcard=payload.dealer_upcard,
             bet=payload.bet,
@@ -45,8 +141,107 @@ def blackjack_strategy(payload: StrategyRequest) -> dict:
             can_double=payload.can_double,
             infer_can_double=payload.infer_can_double,
             risk_lambda=payload.risk_lambda,
+            outcome_format=payload.outcome_format,
+            can_split=payload.can_split,
+            max_split_hands=payload.max_split_hands,
+            double_after_split=payload.double_after_split,
+        )
+        if cached is not None:
+            return cached
+
+    return analyze_decision_state(
+        player_state=player_state,  # type: ignore[arg-type]
+        dealer_upcard=payload.dealer_upcard,
+        bet=payload.bet,
+        bankroll=payload.bankroll,
+        rule=payload.rule,
+        can_double=payload.can_double,
+        infer_can_double=payload.infer_can_double,
+        risk_lambda=payload.risk_lambda,
+        hit_mode=payload.hit_mode,
+        outcome_format=payload.outcome_format,
+        can_split=payload.can_split,
+        max_split_hands=payload.max_split_hands,
+        double_after_split=payload.double_after_split,
+        extra_actions=payload.extra_actions,
+        true_count=payload.true_count,
+        utility=payload.utility,
+        utility_param=payload.utility_param,
+        bankroll_grid=payload.bankroll_grid,
+    )
+
+
+def _evaluate_single(payload: StrategyRequest) -> dict:
+    return _evaluate(payload, _player_state(payload))
+
+
+def _evaluate_batch(items: list[dict[str, Any]]) -> dict:
+    results: list[dict[str, Any]] = []
+    computed: dict[Hashable, dict[str, Any]] = {}
+    for item in items:
+        try:
+            payload = StrategyRequest.model_validate(item)
+            player_state = _player_state(payload)
+            key = _normalized_key(payload, player_state)
+            entry = computed.get(key)
+            if entry is None:
+                entry = {"ok": True, "result": _evaluate(payload, player_state)}
+                computed[key] = entry
+        except ValidationError as exc:
+            entry = {"ok": False, "status": 422, "detail": exc.errors(include_url=False, include_context=False)}
+        except ValueError as exc:
+            entry = {"ok": False, "status": 422, "detail": str(exc)}
+        results.append(entry)
+    return {"results": results, "unique": len(computed)}
+
+
+async def _run(fn: Any, *args: Any) -> dict:
+    try:
+        return await get_strategy_executor().run(fn, *args)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except StrategyUnavailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except asyncio.TimeoutError as exc:
+        raise HTTPException(status_code=504, detail="Strategy computation timed out") from exc
+
+
+@router.post("/strategy/blackjack")
+async def blackjack_strategy(payload: StrategyRequest) -> dict:
+    return await _run(_evaluate_single, payload)
+
+
+@router.post("/strategy/bet")
+def blackjack_bet(payload: BetRequest) -> dict:
+    # Round moments are cached per (rules, payout, count), so this stays cheap per seat.
+    # Explicit fields win, then the table's ADMIN_CONFIG meta, then the global settings.
+    meta = repo.get_meta(get_redis(), payload.table_id) if payload.table_id else {}
+    try:
+        return kelly_bet(
+            bankroll=payload.bankroll,
+            min_bet=payload.min_bet or _meta_int(meta, "min_bet", settings.min_bet),
+            max_bet=payload.max_bet or _meta_int(meta, "max_bet", settings.max_bet),
+            dealer_soft_17_mode=(
+                payload.dealer_soft_17_mode or meta.get("dealer_soft_17_mode") or settings.dealer_soft_17_mode
+            ),
+            blackjack_payout=(
+                payload.blackjack_payout or _meta_float(meta, "blackjack_payout", settings.blackjack_payout)
+            ),
+            true_count=payload.true_count,
+            kelly_multiplier=payload.kelly_multiplier,
         )
-    except HTTPException:
-        raise
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.get("/strategy/cache")
+def strategy_cache_stats() -> dict:
+    # Reflects the serving process; in process mode each worker keeps its own cache.
+    return analysis_cache_info()
+
+
+@router.post("/strategy/blackjack/batch")
+async def blackjack_strategy_batch(items: list[dict[str, Any]] = Body(...)) -> dict:
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} requests")
+    return await _run(_evaluate_batch, items)
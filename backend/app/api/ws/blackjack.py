@@ -1,12 +1,16 @@
 import asyncio
 import json
 from collections import defaultdict
+from functools import partial
 from typing import Any, Callable, Dict, List, Tuple
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
 from app.domain.models.messages import (
+    Advice,
+    Advise,
     ErrorMessage,
     Hello,
     JoinTable,
@@ -20,8 +24,12 @@ from app.domain.models.messages import (
     AdminConfig,
     parse_client_message,
 )
+from app.domain.rules.blackjack_rules import card_name, card_names
+from app.domain.rules.counting import public_cards
 from app.infra.redis.client import get_redis
 from app.infra.redis import repo, stream
+from app.services.advice_service import handle_advise
+from app.services.strategy_executor import StrategyUnavailable
 from app.services.table_service import (
     handle_hello,
     handle_join_table,
@@ -163,7 +171,7 @@ def _personalize_snapshot(
         if hand_ids:
             hand_id = hand_ids[0]
             if isinstance(hand_id, str) and hand_id:
-                cards = repo.load_hand_cards(redis, table_id, hand_id)
+                cards = card_names(repo.load_hand_cards(redis, table_id, hand_id))
         player_data["hand_count"] = str(len(cards))
         if reveal_all or (reveal_own and pid == player_id):
             player_data["hand_cards"] = json.dumps(cards)
@@ -194,7 +202,7 @@ def _lookup_hand_card(
         return None
     cards = repo.load_hand_cards(redis, table_id, hand_id)
     if 0 <= card_index < len(cards):
-        return cards[card_index]
+        return card_name(cards[card_index])
     return None
 
 
@@ -267,6 +275,7 @@ async def append_and_broadcast(
     payload: Dict[str, Any],
 ) -> str:
     payload_redacted = _redact_event_payload(event_type, payload)
+    repo.apply_count(redis, table_id, public_cards(event_type, payload))
     event_id = stream.append_event(
         redis, table_id, event_type, session_id, round_id, payload_redacted
     )
@@ -422,11 +431,9 @@ async def blackjack_ws(ws: WebSocket) -> None:
 
             if isinstance(msg, AdminConfig):
                 try:
-                    snapshot = handle_admin_config(
-                        redis,
-                        table_id,
-                        msg.model_dump(exclude={"type"}),
-                        emit=emit,
+                    # A house-edge cache miss is CPU work; keep it off the loop that serves every table.
+                    snapshot = await run_in_threadpool(
+                        partial(handle_admin_config, redis, table_id, msg.model_dump(exclude={"type"}), emit=emit)
                     )
                 except ValueError as exc:
                     err = ErrorMessage(code="ADMIN_DENIED", message=str(exc))
@@ -501,6 +508,24 @@ async def blackjack_ws(ws: WebSocket) -> None:
                 _cleanup_if_session_ended(redis, table_id, snapshot)
                 continue
 
+            if isinstance(msg, Advise):
+                # Read-only: no table lock, no events, and the analysis runs on the strategy executor.
+                try:
+                    result = await handle_advise(redis, table_id, player_id, msg.risk_lambda, msg.use_count)
+                except ValueError as exc:
+                    err = ErrorMessage(code="ADVISE_DENIED", message=str(exc))
+                    if not await _safe_send_json(ws, err.model_dump()):
+                        break
+                    continue
+                except (StrategyUnavailable, asyncio.TimeoutError):
+                    err = ErrorMessage(code="ADVISE_UNAVAILABLE", message="Strategy advisor is busy, try again")
+                    if not await _safe_send_json(ws, err.model_dump()):
+                        break
+                    continue
+                if not await _safe_send_json(ws, Advice(**result).model_dump()):
+                    break
+                continue
+
             if isinstance(msg, Sync):
                 if table_id is None:
                     err = ErrorMessage(code="JOIN_REQUIRED", message="Send JOIN_TABLE before SYNC")
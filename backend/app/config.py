@@ -10,6 +10,8 @@ class Settings:
 
     # Gameplay defaults (MVP)
     shoe_decks: int = int(os.getenv("BJ_SHOE_DECKS", "6"))
+    # Pre-shuffled shoes kept ready per deck count; 0 shuffles on demand.
+    shoe_pool_size: int = int(os.getenv("BJ_SHOE_POOL_SIZE", "2"))
     reshuffle_when_remaining_pct: float = float(
         os.getenv("BJ_RESHUFFLE_WHEN_REMAINING_PCT", "0.25")
     )
@@ -35,5 +37,14 @@ class Settings:
     show_dealer_rule: bool = os.getenv("BJ_SHOW_DEALER_RULE", "true").lower() == "true"
     bust_pause_ms: int = int(os.getenv("BJ_BUST_PAUSE_MS", "1000"))
 
+    # Strategy advisor
+    strategy_cache_size: int = int(os.getenv("BJ_STRATEGY_CACHE_SIZE", "4096"))
+    strategy_executor: str = os.getenv("BJ_STRATEGY_EXECUTOR", "inline")  # inline | process
+    strategy_workers: int = int(os.getenv("BJ_STRATEGY_WORKERS", "2"))
+    strategy_timeout_seconds: float = float(os.getenv("BJ_STRATEGY_TIMEOUT_SECONDS", "5"))
+    strategy_queue_limit: int = int(os.getenv("BJ_STRATEGY_QUEUE_LIMIT", "64"))
+    # Prebuilt table file from scripts/build_strategy_tables.py; empty builds in-process.
+    strategy_table_path: str = os.getenv("BJ_STRATEGY_TABLE_PATH", "")
+
 
 settings = Settings()
@@ -1,6 +1,6 @@
 from typing import Any, Dict, Optional, Type, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.domain.models.types import Action, Vote
 
 
@@ -59,6 +59,12 @@ class AdminConfig(ClientMessage):
     reshuffle_when_remaining_pct: Optional[float] = None
 
 
+class Advise(ClientMessage):
+    type: Literal["ADVISE"]
+    risk_lambda: float = Field(default=1.0, ge=0.0, le=4.0)
+    use_count: bool = False
+
+
 class ServerMessage(BaseModel):
     type: str
 
@@ -90,6 +96,12 @@ class Event(BaseModel):
     payload: Dict[str, Any]
 
 
+class Advice(ServerMessage):
+    type: Literal["ADVICE"] = "ADVICE"
+    hand_id: str
+    advice: Dict[str, Any]
+
+
 class ErrorMessage(ServerMessage):
     type: Literal["ERROR"] = "ERROR"
     code: str
@@ -107,6 +119,7 @@ CLIENT_MESSAGE_MODELS: Dict[str, Type[ClientMessage]] = {
     "VOTE_CONTINUE": VoteContinue,
     "SYNC": Sync,
     "ADMIN_CONFIG": AdminConfig,
+    "ADVISE": Advise,
 }
 
 
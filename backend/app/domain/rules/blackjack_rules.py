@@ -1,16 +1,11 @@
 import random
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Tuple
 
 RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
 SUITS = ["S", "H", "D", "C"]
 
 
-def new_shoe(decks: int) -> List[str]:
-    cards = [f"{rank}{suit}" for rank in RANKS for suit in SUITS] * decks
-    random.shuffle(cards)
-    return cards
-
-
 def card_value(rank: str) -> int:
     if rank in {"J", "Q", "K"}:
         return 10
@@ -19,18 +14,99 @@ def card_value(rank: str) -> int:
     return int(rank)
 
 
+# Card code = rank index * 4 + suit index, so 0..51 follows RANKS x SUITS. Display strings such as
+# "10H" are only produced at the wire boundary.
+CARD_NAMES: Tuple[str, ...] = tuple(f"{rank}{suit}" for rank in RANKS for suit in SUITS)
+CARD_VALUES = bytes(card_value(name[:-1]) for name in CARD_NAMES)
+CARD_SUITS = bytes(code % len(SUITS) for code in range(len(CARD_NAMES)))
+_CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
+
+
+def card_code(card: str) -> int:
+    code = _CARD_CODES.get(str(card).strip().upper())
+    if code is None:
+        raise ValueError(f"Invalid card: {card}")
+    return code
+
+
+def card_name(code: int) -> str:
+    return CARD_NAMES[code]
+
+
+def card_names(codes: Iterable[int]) -> List[str]:
+    return [CARD_NAMES[code] for code in codes]
+
+
+def new_shoe(decks: int, rng: random.Random | None = None) -> List[str]:
+    cards = list(CARD_NAMES) * decks
+    (rng or random).shuffle(cards)
+    return cards
+
+
+def new_shoe_seed() -> int:
+    # 63 bits so the seed round-trips through a Redis integer field.
+    return random.SystemRandom().getrandbits(63)
+
+
+@lru_cache(maxsize=1024)
+def shoe_order(seed: int, decks: int) -> bytes:
+    # Card codes in deal order; (seed, decks, cursor) is enough to replay a table's cards.
+    codes = list(range(len(CARD_NAMES))) * decks
+    random.Random(seed).shuffle(codes)
+    return bytes(codes)
+
+
+class Hand:
+    # Running state of one hand; add() updates it in O(1) so callers never rescan the cards.
+    __slots__ = ("cards", "total", "soft_aces", "is_blackjack")
+
+    def __init__(self, cards: Iterable[int] = ()) -> None:
+        self.cards = bytearray()
+        self.total = 0
+        self.soft_aces = 0
+        self.is_blackjack = False
+        for code in cards:
+            self.add(code)
+
+    @classmethod
+    def restore(cls, cards: bytes | bytearray, total: int, soft_aces: int) -> "Hand":
+        hand = cls.__new__(cls)
+        hand.cards = bytearray(cards)
+        hand.total = total
+        hand.soft_aces = soft_aces
+        hand.is_blackjack = len(hand.cards) == 2 and total == 21
+        return hand
+
+    def add(self, code: int) -> "Hand":
+        self.cards.append(code)
+        value = CARD_VALUES[code]
+        if value == 1:
+            self.total += 11
+            self.soft_aces += 1
+        else:
+            self.total += value
+        while self.total > 21 and self.soft_aces:
+            self.total -= 10
+            self.soft_aces -= 1
+        self.is_blackjack = len(self.cards) == 2 and self.total == 21
+        return self
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    @property
+    def is_soft(self) -> bool:
+        return self.soft_aces > 0
+
+    @property
+    def is_bust(self) -> bool:
+        return self.total > 21
+
+
+def hand_value_codes(codes: Sequence[int]) -> Tuple[int, bool]:
+    hand = Hand(codes)
+    return hand.total, hand.is_soft
+
+
 def hand_value(cards: List[str]) -> Tuple[int, bool]:
-    total = 0
-    aces = 0
-    for card in cards:
-        rank = card[:-1]
-        if rank == "A":
-            aces += 1
-        total += card_value(rank)
-
-    is_soft = False
-    while aces > 0 and total + 10 <= 21:
-        total += 10
-        aces -= 1
-        is_soft = True
-    return total, is_soft
+    return hand_value_codes([card_code(card) for card in cards])
@@ -0,0 +1,52 @@
+from typing import Any, Dict, List
+
+# Rank slots match the strategy engine's shoe_counts order: A, 2..9, ten-valued.
+COUNT_RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10"]
+HI_LO_TAGS = {"A": -1, "2": 1, "3": 1, "4": 1, "5": 1, "6": 1, "7": 0, "8": 0, "9": 0, "10": -1}
+
+
+def count_rank(card: str) -> str:
+    rank = card[:-1]
+    return "10" if rank in {"J", "Q", "K"} else rank
+
+
+def hi_lo(card: str) -> int:
+    return HI_LO_TAGS[count_rank(card)]
+
+
+def full_shoe_histogram(decks: int) -> Dict[str, int]:
+    return {rank: (16 if rank == "10" else 4) * decks for rank in COUNT_RANKS}
+
+
+def public_cards(event_type: str, payload: Dict[str, Any]) -> List[str]:
+    # Cards that become visible to the whole table with this event. Player cards stay
+    # private until HANDS_REVEALED; the dealer hole card is counted when it is turned over.
+    if event_type == "CARD_DEALT":
+        if payload.get("to") == "dealer" and not payload.get("face_down") and payload.get("card"):
+            return [payload["card"]]
+        return []
+    if event_type == "DEALER_REVEAL_HOLE":
+        return [card for card in (payload.get("cards") or [])[1:2] if card]
+    if event_type == "DEALER_ACTION":
+        if payload.get("action") == "draw" and payload.get("card"):
+            return [payload["card"]]
+        return []
+    if event_type == "HANDS_REVEALED":
+        cards: List[str] = []
+        for reveal in payload.get("players") or []:
+            cards.extend(card for card in (reveal.get("cards") or []) if card)
+        return cards
+    return []
+
+
+def count_state(running: int, remaining: int, histogram: Dict[str, int]) -> Dict[str, Any]:
+    decks_remaining = remaining / 52.0
+    true_count = running / decks_remaining if decks_remaining > 0 else 0.0
+    return {
+        "running_count": running,
+        "true_count": round(true_count, 3),
+        "cards_remaining": remaining,
+        "decks_remaining": round(decks_remaining, 3),
+        # Unseen cards per rank in A, 2..9, 10 order (usable as strategy shoe_counts).
+        "remaining_by_rank": [histogram.get(rank, 0) for rank in COUNT_RANKS],
+    }
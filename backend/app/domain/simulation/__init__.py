@@ -0,0 +1,5 @@
+from .bankroll import BettingPolicy, simulate_bankroll_paths
+from .rounds import SimulationConfig, simulate_rounds
+from .stats import RunningStats
+
+__all__ = ["BettingPolicy", "RunningStats", "SimulationConfig", "simulate_bankroll_paths", "simulate_rounds"]
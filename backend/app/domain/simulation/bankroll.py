@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.config import settings
+from app.domain.strategy.round_model import round_outcome_distribution
+
+BETTING_POLICIES = ("flat", "fraction")
+SESSION_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+@dataclass(frozen=True)
+class BettingPolicy:
+    # flat: always bet `unit`; fraction: bet `fraction` of the current bankroll.
+    # Every bet is clamped to [min_bet, max_bet] and to what the player still has.
+    kind: str = "flat"
+    unit: int = settings.min_bet
+    fraction: float = 0.02
+
+    def bets(self, bankroll: np.ndarray, min_bet: int, max_bet: int) -> np.ndarray:
+        if self.kind == "flat":
+            raw = np.full(bankroll.shape, self.unit, dtype=np.int64)
+        elif self.kind == "fraction":
+            raw = np.floor(bankroll * self.fraction).astype(np.int64)
+        else:
+            raise ValueError(f"Invalid betting policy: {self.kind}")
+        return np.minimum(np.clip(raw, min_bet, max_bet), bankroll)
+
+
+def _rule_weights(dealer_soft_17_mode: str) -> tuple[tuple[str, float], ...]:
+    mode = dealer_soft_17_mode.upper()
+    if mode == "RANDOM_PER_ROUND":
+        return (("S17", 0.5), ("H17", 0.5))
+    if mode in {"S17", "H17"}:
+        return ((mode, 1.0),)
+    raise ValueError(f"Invalid dealer_soft_17_mode: {dealer_soft_17_mode}")
+
+
+def _mixed_round_outcomes(dealer_soft_17_mode: str, blackjack_payout: float) -> tuple[np.ndarray, np.ndarray]:
+    mass: dict[float, float] = {}
+    for rule, weight in _rule_weights(dealer_soft_17_mode):
+        deltas, probs = round_outcome_distribution(rule, blackjack_payout)
+        for delta, prob in zip(deltas.tolist(), probs.tolist()):
+            mass[delta] = mass.get(delta, 0.0) + weight * prob
+    deltas = np.array(sorted(mass))
+    return deltas, np.array([mass[delta] for delta in deltas])
+
+
+def _quantiles(values: np.ndarray) -> dict[str, float]:
+    points = np.quantile(values, SESSION_QUANTILES)
+    return {f"p{int(q * 100)}": float(point) for q, point in zip(SESSION_QUANTILES, points)}
+
+
+def simulate_bankroll_paths(
+    paths: int,
+    max_rounds: int,
+    starting_bankroll: int = settings.starting_bankroll,
+    min_bet: int = settings.min_bet,
+    max_bet: int = settings.max_bet,
+    policy: BettingPolicy | None = None,
+    dealer_soft_17_mode: str = settings.dealer_soft_17_mode,
+    blackjack_payout: float = settings.blackjack_payout,
+    stop_at_bankroll: int | None = None,
+    seed: int = 0,
+) -> dict[str, Any]:
+    # All paths advance in lockstep: one round per step for every path still in its session.
+    # A session ends at max_rounds, on ruin (bankroll below min_bet, the game's eligibility
+    # rule) or when the bankroll reaches stop_at_bankroll. Round outcomes come from the
+    # strategy engine's per-round distribution, which assumes doubles can always be afforded.
+    if paths <= 0 or max_rounds <= 0:
+        raise ValueError("paths and max_rounds must be positive")
+    if min_bet <= 0 or max_bet < min_bet:
+        raise ValueError("Require 0 < min_bet <= max_bet")
+    policy = policy or BettingPolicy(unit=min_bet)
+    deltas, probs = _mixed_round_outcomes(dealer_soft_17_mode, blackjack_payout)
+    cumulative = np.cumsum(probs)
+    cumulative[-1] = 1.0
+    rng = np.random.default_rng(seed)
+
+    bankroll = np.full(paths, int(starting_bankroll), dtype=np.int64)
+    rounds_played = np.zeros(paths, dtype=np.int64)
+    active = bankroll >= min_bet
+    if stop_at_bankroll is not None:
+        active &= bankroll < stop_at_bankroll
+    peak = bankroll.copy()
+
+    for _ in range(int(max_rounds)):
+        live = np.flatnonzero(active)
+        if len(live) == 0:
+            break
+        bets = policy.bets(bankroll[live], min_bet, max_bet)
+        outcome = np.searchsorted(cumulative, rng.random(len(live)), side="right")
+        # Round each settlement to whole chips, as the game does for blackjack payouts.
+        bankroll[live] += np.rint(bets * deltas[outcome]).astype(np.int64)
+        np.maximum(bankroll, 0, out=bankroll)
+        rounds_played[live] += 1
+        peak[live] = np.maximum(peak[live], bankroll[live])
+        still = bankroll[live] >= min_bet
+        if stop_at_bankroll is not None:
+            still &= bankroll[live] < stop_at_bankroll
+        active[live] = still
+
+    ruined = bankroll < min_bet
+    return {
+        "paths": int(paths),
+        "max_rounds": int(max_rounds),
+        "policy": {"kind": policy.kind, "unit": policy.unit, "fraction": policy.fraction},
+        "ruin_probability": float(ruined.mean()),
+        "reached_target_probability": (
+            float((bankroll >= stop_at_bankroll).mean()) if stop_at_bankroll is not None else None
+        ),
+        "session_length": {"mean": float(rounds_played.mean()), **_quantiles(rounds_played)},
+        "final_bankroll": {
+            "mean": float(bankroll.mean()),
+            "stdev": float(bankroll.std()),
+            **_quantiles(bankroll),
+        },
+        "peak_bankroll": {"mean": float(peak.mean()), **_quantiles(peak)},
+    }
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+from app.config import settings
+from app.domain.rules.blackjack_rules import hand_value, new_shoe
+from app.domain.simulation.stats import RunningStats
+
+DEALER_SOFT_17_MODES = ("S17", "H17", "RANDOM_PER_ROUND")
+DEFAULT_CHUNK_ROUNDS = 50_000
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    shoe_decks: int = settings.shoe_decks
+    reshuffle_when_remaining_pct: float = settings.reshuffle_when_remaining_pct
+    dealer_soft_17_mode: str = settings.dealer_soft_17_mode
+    blackjack_payout: float = settings.blackjack_payout
+    bet: int = settings.min_bet
+
+    def validate(self) -> "SimulationConfig":
+        if self.shoe_decks < 1:
+            raise ValueError("shoe_decks must be >= 1")
+        if not 0.0 <= self.reshuffle_when_remaining_pct < 1.0:
+            raise ValueError("reshuffle_when_remaining_pct must be in [0, 1)")
+        if self.dealer_soft_17_mode.upper() not in DEALER_SOFT_17_MODES:
+            raise ValueError(f"Invalid dealer_soft_17_mode: {self.dealer_soft_17_mode}")
+        if self.bet <= 0:
+            raise ValueError("bet must be positive")
+        return self
+
+
+def _rank_token(card: str) -> str | int:
+    rank = card[:-1]
+    if rank == "A":
+        return "A"
+    if rank in {"J", "Q", "K"}:
+        return 10
+    return int(rank)
+
+
+class _RoundSimulator:
+    # Plays single-seat rounds the way round_service does: deal P, D-up, P, D-hole, the dealer
+    # always plays out, dealer blackjack is settled at the end. Player decisions come from the
+    # advisor's EV table.
+
+    def __init__(self, config: SimulationConfig, seed: int) -> None:
+        from app.domain.strategy.tables import get_strategy_table
+
+        self.config = config
+        self.rng = random.Random(seed)
+        self.table = get_strategy_table()
+        self.mode = config.dealer_soft_17_mode.upper()
+        self.blackjack_win = int(round(config.bet * config.blackjack_payout))
+        self.shoe: list[str] = []
+        self.cut_index = 0
+        self._reshuffle()
+
+    def _reshuffle(self) -> None:
+        self.shoe = new_shoe(self.config.shoe_decks, self.rng)
+        self.cut_index = int(len(self.shoe) * self.config.reshuffle_when_remaining_pct)
+
+    def _draw(self) -> str:
+        if not self.shoe:
+            self._reshuffle()
+        return self.shoe.pop()
+
+    def play_round(self) -> float:
+        if len(self.shoe) <= self.cut_index:
+            self._reshuffle()
+        rule = self.mode if self.mode != "RANDOM_PER_ROUND" else self.rng.choice(("S17", "H17"))
+        bet = self.config.bet
+
+        player = [self._draw()]
+        dealer = [self._draw()]
+        player.append(self._draw())
+        dealer.append(self._draw())
+        upcard = _rank_token(dealer[0])
+
+        total, is_soft = hand_value(player)
+        player_blackjack = total == 21
+        while total < 21:
+            soft = 1 if is_soft else 0
+            action = self.table.best_action(total, soft, upcard, rule, len(player) == 2)  # type: ignore[arg-type]
+            if action == "stand":
+                break
+            player.append(self._draw())
+            total, is_soft = hand_value(player)
+            if action == "double":
+                bet *= 2
+                break
+
+        dealer_total, dealer_soft = hand_value(dealer)
+        while dealer_total < 17 or (dealer_total == 17 and dealer_soft and rule == "H17"):
+            dealer.append(self._draw())
+            dealer_total, dealer_soft = hand_value(dealer)
+        dealer_blackjack = dealer_total == 21 and len(dealer) == 2
+
+        if player_blackjack and not dealer_blackjack:
+            delta = self.blackjack_win
+        elif dealer_blackjack and not player_blackjack:
+            delta = -bet
+        elif total > 21:
+            delta = -bet
+        elif dealer_total > 21 or total > dealer_total:
+            delta = bet
+        elif total < dealer_total:
+            delta = -bet
+        else:
+            delta = 0
+        # Normalised to the initial wager so configs with different bets compare directly.
+        return delta / self.config.bet
+
+
+def _simulate_chunk(config: SimulationConfig, rounds: int, seed: int) -> RunningStats:
+    simulator = _RoundSimulator(config, seed)
+    stats = RunningStats()
+    for _ in range(rounds):
+        stats.push(simulator.play_round())
+    return stats
+
+
+def _chunk_sizes(rounds: int, chunk_rounds: int) -> list[int]:
+    full, rest = divmod(rounds, chunk_rounds)
+    return [chunk_rounds] * full + ([rest] if rest else [])
+
+
+def simulate_rounds(
+    config: SimulationConfig,
+    rounds: int,
+    workers: int = 1,
+    seed: int = 0,
+    chunk_rounds: int = DEFAULT_CHUNK_ROUNDS,
+    progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    config.validate()
+    if rounds <= 0:
+        raise ValueError("rounds must be positive")
+    sizes = _chunk_sizes(int(rounds), max(1, int(chunk_rounds)))
+    # Independent per-shard streams; the result depends on (seed, chunk_rounds), not on workers.
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(sizes))]
+
+    total = RunningStats()
+    done = 0
+    if workers <= 1:
+        for size, chunk_seed in zip(sizes, seeds):
+            total.merge(_simulate_chunk(config, size, chunk_seed))
+            done += size
+            if progress is not None:
+                progress(done, rounds)
+    else:
+        shards: dict[int, RunningStats] = {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {
+                pool.submit(_simulate_chunk, config, size, chunk_seed): idx
+                for idx, (size, chunk_seed) in enumerate(zip(sizes, seeds))
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                shards[idx] = future.result()
+                done += sizes[idx]
+                if progress is not None:
+                    progress(done, rounds)
+        # Merge in shard order so the floating-point result is reproducible.
+        for idx in range(len(sizes)):
+            total.merge(shards[idx])
+
+    summary = total.to_dict()
+    return {
+        "config": asdict(config),
+        "rounds": total.count,
+        "seed": seed,
+        "house_edge": -summary["mean"],
+        "per_round": summary,
+    }
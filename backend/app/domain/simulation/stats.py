@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from math import sqrt
+from typing import Any, Iterable
+
+
+class RunningStats:
+    # Welford accumulator; shards are combined with the parallel (Chan et al.) update.
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.push(value)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stderr(self) -> float:
+        return sqrt(self.variance / self.count) if self.count > 0 else 0.0
+
+    def confidence_interval(self, z: float = 1.96) -> tuple[float, float]:
+        half_width = z * self.stderr
+        return self.mean - half_width, self.mean + half_width
+
+    def to_dict(self, z: float = 1.96) -> dict[str, Any]:
+        low, high = self.confidence_interval(z)
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "stdev": sqrt(self.variance),
+            "stderr": self.stderr,
+            "ci_low": low,
+            "ci_high": high,
+            "min": self.minimum if self.count else None,
+            "max": self.maximum if self.count else None,
+        }
@@ -1,21 +1,65 @@
 from .gt_blackjack import (
     CARD_PROBS,
     add_card_to_total,
+    analysis_cache_info,
     analyze_decision_state,
     best_total,
+    clear_analysis_cache,
+    configure_analysis_cache,
     dealer_distribution,
     ev_double,
+    ev_hit,
     ev_hit_one_step,
+    ev_split,
     ev_stand,
+    insurance_delta_distribution,
+    risk_averse_curve,
+    security_sweep,
+    shoe_counts_from_cards,
+    split_delta_distribution,
+    surrender_delta_distribution,
 )
+from .bet_sizing import kelly_bet
+from .composition import clear_composition_cache, full_shoe_counts
+from .count_tables import COUNT_BUCKETS, build_count_tables, count_card_probs, get_count_tables
+from .house_edge import table_strategy_house_edge
+from .round_model import round_house_edge, round_outcome_distribution
+from .tables import build_strategy_table, get_strategy_table, lookup_decision_state
+from .utility import UTILITIES, utility_function
 
 __all__ = [
     "CARD_PROBS",
+    "COUNT_BUCKETS",
+    "UTILITIES",
     "add_card_to_total",
+    "analysis_cache_info",
     "analyze_decision_state",
     "best_total",
+    "build_count_tables",
+    "build_strategy_table",
+    "clear_analysis_cache",
+    "clear_composition_cache",
+    "configure_analysis_cache",
+    "count_card_probs",
     "dealer_distribution",
     "ev_double",
+    "ev_hit",
     "ev_hit_one_step",
+    "ev_split",
     "ev_stand",
+    "full_shoe_counts",
+    "get_count_tables",
+    "get_strategy_table",
+    "insurance_delta_distribution",
+    "kelly_bet",
+    "lookup_decision_state",
+    "risk_averse_curve",
+    "round_house_edge",
+    "round_outcome_distribution",
+    "security_sweep",
+    "shoe_counts_from_cards",
+    "split_delta_distribution",
+    "surrender_delta_distribution",
+    "table_strategy_house_edge",
+    "utility_function",
 ]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from .round_model import round_outcome_distribution
+
+BET_RULE_MODES = ("S17", "H17", "RANDOM_PER_ROUND")
+
+
+def _rules(dealer_soft_17_mode: str) -> tuple[str, ...]:
+    mode = str(dealer_soft_17_mode).strip().upper()
+    if mode not in BET_RULE_MODES:
+        raise ValueError(f"Invalid dealer_soft_17_mode: {dealer_soft_17_mode}")
+    return ("S17", "H17") if mode == "RANDOM_PER_ROUND" else (mode,)
+
+
+@lru_cache(maxsize=1024)
+def round_moments(
+    dealer_soft_17_mode: str, blackjack_payout: float, true_count: float | None = None
+) -> tuple[float, float]:
+    # (edge, variance) of one round per unit bet; RANDOM_PER_ROUND mixes S17 and H17 evenly.
+    rules = _rules(dealer_soft_17_mode)
+    mean = second = 0.0
+    for rule in rules:
+        deltas, probs = round_outcome_distribution(rule, blackjack_payout, true_count)
+        mean += float(deltas @ probs) / len(rules)
+        second += float((deltas * deltas) @ probs) / len(rules)
+    return mean, second - mean * mean
+
+
+def kelly_bet(
+    bankroll: int,
+    min_bet: int,
+    max_bet: int,
+    dealer_soft_17_mode: str,
+    blackjack_payout: float,
+    true_count: float | None = None,
+    kelly_multiplier: float = 1.0,
+) -> dict[str, Any]:
+    # Growth-optimal fraction for a small edge is edge / variance; a non-positive edge means
+    # the best bet is the table minimum. kelly_multiplier < 1 gives fractional Kelly.
+    if min_bet <= 0 or max_bet < min_bet:
+        raise ValueError("Require 0 < min_bet <= max_bet")
+    if bankroll < 0:
+        raise ValueError("bankroll must be non-negative")
+    if kelly_multiplier < 0:
+        raise ValueError("kelly_multiplier must be non-negative")
+    if true_count is not None:
+        true_count = round(float(true_count), 3)
+    edge, variance = round_moments(str(dealer_soft_17_mode).upper(), float(blackjack_payout), true_count)
+    fraction = max(0.0, edge / variance) * float(kelly_multiplier) if variance > 0 else 0.0
+    optimal = int(bankroll * fraction)
+    eligible = bankroll >= min_bet
+    bet = min(max(optimal, min_bet), max_bet, bankroll) if eligible else 0
+    return {
+        "bet": bet,
+        "eligible": eligible,
+        "optimal_bet": optimal,
+        "clamped": eligible and bet != optimal,
+        "kelly_fraction": fraction,
+        "edge": edge,
+        "variance": variance,
+        "inputs": {
+            "bankroll": int(bankroll),
+            "min_bet": int(min_bet),
+            "max_bet": int(max_bet),
+            "dealer_soft_17_mode": str(dealer_soft_17_mode).upper(),
+            "blackjack_payout": float(blackjack_payout),
+            "true_count": true_count,
+            "kelly_multiplier": float(kelly_multiplier),
+        },
+    }
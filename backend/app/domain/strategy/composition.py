@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from .cache import LRUCache
+
+# Rank slots follow DRAW_OUTCOMES: A, 2..9, ten-valued.
+RANK_SLOTS = 10
+RANK_VALUES: tuple[int, ...] = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+COMPOSITION_CACHE_SIZE = 200_000
+
+# Each rank count occupies a 12-bit field of the composition key, so drawing or
+# returning a card is a single integer add instead of re-hashing the count vector.
+_KEY_BITS = 12
+_MAX_RANK_COUNT = (1 << _KEY_BITS) - 1
+_KEY_WEIGHTS: tuple[int, ...] = tuple(1 << (_KEY_BITS * idx) for idx in range(RANK_SLOTS))
+
+DealerProbs = tuple[float, float, float, float, float, float]
+_BUST: DealerProbs = (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+_finish_cache: LRUCache[DealerProbs] = LRUCache(COMPOSITION_CACHE_SIZE)
+
+
+def full_shoe_counts(decks: int) -> tuple[int, ...]:
+    if decks < 1:
+        raise ValueError("decks must be >= 1")
+    per_rank = 4 * int(decks)
+    return (per_rank,) * 9 + (per_rank * 4,)
+
+
+def composition_key(counts: Sequence[int]) -> int:
+    key = 0
+    for idx, count in enumerate(counts):
+        key += int(count) * _KEY_WEIGHTS[idx]
+    return key
+
+
+def _validate_counts(counts: Sequence[int]) -> list[int]:
+    if len(counts) != RANK_SLOTS:
+        raise ValueError(f"shoe_counts must have {RANK_SLOTS} rank slots")
+    values = [int(count) for count in counts]
+    for count in values:
+        if count < 0 or count > _MAX_RANK_COUNT:
+            raise ValueError("shoe_counts entries must be between 0 and 4095")
+    if sum(values) <= 0:
+        raise ValueError("shoe_counts must contain at least one card")
+    return values
+
+
+class _FiniteShoeDealer:
+    __slots__ = ("counts", "remaining", "key", "rule")
+
+    def __init__(self, counts: list[int], rule: str) -> None:
+        self.counts = counts
+        self.remaining = sum(counts)
+        self.key = composition_key(counts)
+        self.rule = rule
+
+    def finish(self, total: int, soft_aces: int) -> DealerProbs:
+        while total > 21 and soft_aces > 0:
+            total -= 10
+            soft_aces -= 1
+        if total > 21:
+            return _BUST
+        is_soft = soft_aces > 0
+        if total > 17 or (total == 17 and not (is_soft and self.rule == "H17")):
+            buckets = [0.0] * 6
+            buckets[total - 17] = 1.0
+            return tuple(buckets)  # type: ignore[return-value]
+
+        memo_key = (self.key, total, 1 if is_soft else 0, self.rule)
+        cached = _finish_cache.get(memo_key)
+        if cached is not None:
+            return cached
+
+        counts = self.counts
+        remaining = self.remaining
+        if remaining <= 0:
+            raise ValueError("shoe_counts ran out before the dealer finished drawing")
+        totals = [0.0] * 6
+        for idx in range(RANK_SLOTS):
+            count = counts[idx]
+            if count == 0:
+                continue
+            prob = count / remaining
+            counts[idx] = count - 1
+            self.remaining = remaining - 1
+            self.key -= _KEY_WEIGHTS[idx]
+            value = RANK_VALUES[idx]
+            child = self.finish(total + value, soft_aces + (1 if idx == 0 else 0))
+            self.key += _KEY_WEIGHTS[idx]
+            self.remaining = remaining
+            counts[idx] = count
+            for bucket, child_prob in enumerate(child):
+                totals[bucket] += prob * child_prob
+        result: DealerProbs = tuple(totals)  # type: ignore[assignment]
+        _finish_cache.put(memo_key, result)
+        return result
+
+
+def finite_shoe_dealer_probs(upcard_slot: int, rule: str, counts: Sequence[int]) -> DealerProbs:
+    # counts describe the unseen cards (upcard already removed); the hole card is drawn from them.
+    solver = _FiniteShoeDealer(_validate_counts(counts), rule)
+    value = RANK_VALUES[upcard_slot]
+    return solver.finish(value, 1 if upcard_slot == 0 else 0)
+
+
+def clear_composition_cache() -> None:
+    _finish_cache.clear()
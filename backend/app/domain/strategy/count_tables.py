@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from math import floor
+
+import numpy as np
+
+from .composition import RANK_SLOTS, RANK_VALUES
+from .dealer_markov import DEFAULT_CARD_PROBS, RULES, dealer_table
+
+# Hi-Lo true-count buckets. A bucket's shoe keeps 12 neutral cards per deck and shifts
+# t/2 cards per deck from the low ranks (2-6) to the high ranks (ten, ace), which is the
+# average composition behind a true count of t.
+MIN_TRUE_COUNT = -10
+MAX_TRUE_COUNT = 10
+COUNT_BUCKETS: tuple[int, ...] = tuple(range(MIN_TRUE_COUNT, MAX_TRUE_COUNT + 1))
+COUNT_ACTIONS: tuple[str, ...] = ("stand", "hit", "double")
+MIN_COUNT_TOTAL = 4
+MAX_COUNT_TOTAL = 21
+
+_LOW_SLOTS = (1, 2, 3, 4, 5)
+_HIGH_SLOTS = (0, 9)
+_TOTALS = MAX_COUNT_TOTAL - MIN_COUNT_TOTAL + 1
+
+
+def count_card_probs(true_count: float) -> np.ndarray:
+    base = np.asarray(DEFAULT_CARD_PROBS) * 52.0
+    shift = float(true_count) / 40.0
+    weights = base.copy()
+    weights[list(_LOW_SLOTS)] *= 1.0 - shift
+    weights[list(_HIGH_SLOTS)] *= 1.0 + shift
+    if (weights < 0).any():
+        raise ValueError("true_count is outside the representable range")
+    return weights / weights.sum()
+
+
+def _stand_outcomes(dealer: np.ndarray) -> np.ndarray:
+    # (player total 0..22, upcards, 3): (lose, push, win) of standing; index 22 is bust.
+    result = np.zeros((23, dealer.shape[0], 3))
+    for total in range(23):
+        if total > 21:
+            result[total, :, 0] = 1.0
+            continue
+        for bucket in range(6):
+            if bucket == 5 or total > 17 + bucket:
+                result[total, :, 2] += dealer[:, bucket]
+            elif total < 17 + bucket:
+                result[total, :, 0] += dealer[:, bucket]
+            else:
+                result[total, :, 1] += dealer[:, bucket]
+    return result
+
+
+def _add(total: int, soft: int, slot: int) -> tuple[int, int]:
+    total += RANK_VALUES[slot]
+    if slot == 0:
+        soft += 1
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return min(total, 22), min(soft, 1)
+
+
+def solve_unit_outcomes(card_probs: np.ndarray, rule: str) -> tuple[np.ndarray, np.ndarray]:
+    # Returns (outcomes, dealer): outcomes[upcard, soft, total - 4, action] = (lose, push, win)
+    # for stand/hit/double with optimal hit-or-stand continuation; dealer[upcard] = 17..21, bust.
+    dealer = dealer_table(card_probs)[RULES.index(rule)]
+    stand = _stand_outcomes(dealer)
+    upcards = dealer.shape[0]
+    best: dict[tuple[int, int], np.ndarray] = {}
+    hit: dict[tuple[int, int], np.ndarray] = {}
+
+    def resolved(total: int, soft: int) -> np.ndarray:
+        if total > 21:
+            return stand[22]
+        return best[(total, soft)]
+
+    def solve(total: int, soft: int) -> None:
+        drawn = np.zeros((upcards, 3))
+        for slot in range(RANK_SLOTS):
+            drawn += card_probs[slot] * resolved(*_add(total, soft, slot))
+        hit[(total, soft)] = drawn
+        if total == 21:
+            best[(total, soft)] = stand[21]
+            return
+        prefer_hit = (drawn[:, 2] - drawn[:, 0]) > (stand[total, :, 2] - stand[total, :, 0])
+        best[(total, soft)] = np.where(prefer_hit[:, None], drawn, stand[total])
+
+    # Hard 11+ only reach harder totals; soft hands reach higher soft or hard 12+;
+    # hard 4..10 may turn soft, so they go last.
+    for total in range(21, 10, -1):
+        solve(total, 0)
+    for total in range(21, 11, -1):
+        solve(total, 1)
+    for total in range(10, MIN_COUNT_TOTAL - 1, -1):
+        solve(total, 0)
+
+    outcomes = np.zeros((upcards, 2, _TOTALS, len(COUNT_ACTIONS), 3))
+    for (total, soft), drawn in hit.items():
+        double = np.zeros((upcards, 3))
+        for slot in range(RANK_SLOTS):
+            double += card_probs[slot] * stand[_add(total, soft, slot)[0]]
+        idx = total - MIN_COUNT_TOTAL
+        outcomes[:, soft, idx, 0] = stand[total]
+        outcomes[:, soft, idx, 1] = drawn
+        outcomes[:, soft, idx, 2] = double
+    return outcomes, dealer
+
+
+class CountTables:
+    # Dense per-bucket arrays; a query interpolates linearly between neighbouring buckets.
+
+    def __init__(self) -> None:
+        shape = (len(RULES), len(COUNT_BUCKETS), RANK_SLOTS)
+        self.outcomes = np.zeros(shape + (2, _TOTALS, len(COUNT_ACTIONS), 3))
+        self.dealer = np.zeros(shape + (6,))
+        self.card_probs = np.zeros((len(COUNT_BUCKETS), RANK_SLOTS))
+
+    @classmethod
+    def from_arrays(cls, outcomes: np.ndarray, dealer: np.ndarray, card_probs: np.ndarray) -> "CountTables":
+        tables = cls.__new__(cls)
+        tables.outcomes, tables.dealer, tables.card_probs = outcomes, dealer, card_probs
+        return tables
+
+    def build(self) -> "CountTables":
+        for bucket_idx, true_count in enumerate(COUNT_BUCKETS):
+            probs = count_card_probs(true_count)
+            self.card_probs[bucket_idx] = probs
+            for rule_idx, rule in enumerate(RULES):
+                outcomes, dealer = solve_unit_outcomes(probs, rule)
+                self.outcomes[rule_idx, bucket_idx] = outcomes
+                self.dealer[rule_idx, bucket_idx] = dealer
+        for array in (self.outcomes, self.dealer, self.card_probs):
+            array.setflags(write=False)
+        return self
+
+    @staticmethod
+    def covers(total: int, soft: int) -> bool:
+        if soft:
+            return 12 <= total <= MAX_COUNT_TOTAL
+        return MIN_COUNT_TOTAL <= total <= MAX_COUNT_TOTAL
+
+    @staticmethod
+    def _weights(true_count: float) -> tuple[int, int, float]:
+        clamped = min(max(float(true_count), MIN_TRUE_COUNT), MAX_TRUE_COUNT)
+        lower = min(int(floor(clamped)), MAX_TRUE_COUNT - 1)
+        return lower - MIN_TRUE_COUNT, lower - MIN_TRUE_COUNT + 1, clamped - lower
+
+    def unit_outcomes(self, rule: str, true_count: float, upcard_slot: int, total: int, soft: int) -> np.ndarray:
+        # (actions, 3) interpolated (lose, push, win) rows for stand, hit, double.
+        low, high, frac = self._weights(true_count)
+        cells = self.outcomes[RULES.index(rule), :, upcard_slot, soft, total - MIN_COUNT_TOTAL]
+        return (1.0 - frac) * cells[low] + frac * cells[high]
+
+    def dealer_probs(self, rule: str, true_count: float, upcard_slot: int) -> np.ndarray:
+        low, high, frac = self._weights(true_count)
+        cells = self.dealer[RULES.index(rule), :, upcard_slot]
+        return (1.0 - frac) * cells[low] + frac * cells[high]
+
+    def card_probs_at(self, true_count: float) -> np.ndarray:
+        low, high, frac = self._weights(true_count)
+        return (1.0 - frac) * self.card_probs[low] + frac * self.card_probs[high]
+
+
+_COUNT_TABLES: CountTables | None = None
+
+
+def build_count_tables() -> CountTables:
+    global _COUNT_TABLES
+    _COUNT_TABLES = CountTables().build()
+    return _COUNT_TABLES
+
+
+def install_count_tables(tables: CountTables) -> None:
+    global _COUNT_TABLES
+    _COUNT_TABLES = tables
+
+
+def get_count_tables() -> CountTables:
+    if _COUNT_TABLES is None:
+        return build_count_tables()
+    return _COUNT_TABLES
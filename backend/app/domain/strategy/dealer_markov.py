@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+# Dealer hands are Markov states (best_total, soft). Hard totals 2..21 and soft
+# totals 11..21 cover every single-card start and every hand the dealer can hold.
+RULES: tuple[str, ...] = ("S17", "H17")
+CARD_VALUES: tuple[int, ...] = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+OUTCOMES = 6  # 17, 18, 19, 20, 21, bust
+BUST_COLUMN = 5
+
+STATES: tuple[tuple[int, int], ...] = tuple((total, 0) for total in range(2, 22)) + tuple(
+    (total, 1) for total in range(11, 22)
+)
+STATE_INDEX: dict[tuple[int, int], int] = {state: idx for idx, state in enumerate(STATES)}
+UPCARD_STATES: tuple[int, ...] = tuple(
+    STATE_INDEX[(value, 1 if value == 11 else 0)] for value in CARD_VALUES
+)
+DEFAULT_CARD_PROBS: tuple[float, ...] = (1.0 / 13.0,) * 9 + (4.0 / 13.0,)
+
+
+def _step(total: int, soft: int, value: int) -> tuple[int, int] | None:
+    total += value
+    soft += 1 if value == 11 else 0
+    while total > 21 and soft > 0:
+        total -= 10
+        soft -= 1
+    if total > 21:
+        return None
+    return total, 1 if soft else 0
+
+
+def _is_final(total: int, soft: int, rule: str) -> bool:
+    return total > 17 or (total == 17 and not (soft and rule == "H17"))
+
+
+def _build_structure() -> tuple[np.ndarray, np.ndarray]:
+    # draws[r, s, c, j]: 1 when drawing card c from draw-state s leads to column j
+    # (a state index, or N + outcome for busts). finals[r, s, j]: absorbing one-hots.
+    n = len(STATES)
+    draws = np.zeros((len(RULES), n, len(CARD_VALUES), n + OUTCOMES))
+    finals = np.zeros((len(RULES), n, n + OUTCOMES))
+    for r, rule in enumerate(RULES):
+        for s, (total, soft) in enumerate(STATES):
+            if _is_final(total, soft, rule):
+                finals[r, s, n + total - 17] = 1.0
+                continue
+            for c, value in enumerate(CARD_VALUES):
+                nxt = _step(total, soft, value)
+                column = n + BUST_COLUMN if nxt is None else STATE_INDEX[nxt]
+                draws[r, s, c, column] = 1.0
+    return draws, finals
+
+
+_DRAWS, _FINALS = _build_structure()
+_IDENTITY = np.eye(len(STATES))
+
+
+def solve_dealer_states(card_probs: Sequence[float] | None = None) -> np.ndarray:
+    # (rules, states, 6): probability of finishing on 17..21 or busting from every state.
+    probs = np.asarray(DEFAULT_CARD_PROBS if card_probs is None else card_probs, dtype=float)
+    if probs.shape != (len(CARD_VALUES),):
+        raise ValueError("card_probs must have 10 entries (A, 2..9, 10)")
+    total = probs.sum()
+    if total <= 0:
+        raise ValueError("card_probs must have positive mass")
+    probs = probs / total
+
+    n = len(STATES)
+    transitions = np.einsum("rscj,c->rsj", _DRAWS, probs) + _FINALS
+    q = transitions[:, :, :n]
+    r = transitions[:, :, n:]
+    return np.linalg.solve(_IDENTITY - q, r)
+
+
+def dealer_table(card_probs: Sequence[float] | None = None) -> np.ndarray:
+    # (rules, upcards, 6) for S17/H17 and upcards A, 2..10.
+    if card_probs is None:
+        return _default_dealer_table()
+    return solve_dealer_states(card_probs)[:, UPCARD_STATES, :]
+
+
+# Prebuilt read-only default tables (see table_store); consulted before solving.
+_INSTALLED: dict[str, np.ndarray] = {}
+
+
+def install_default_tables(dealer: np.ndarray, blackjack: np.ndarray) -> None:
+    _INSTALLED["dealer"] = dealer
+    _INSTALLED["blackjack"] = blackjack
+    _default_dealer_table.cache_clear()
+    _default_blackjack_probs.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _default_dealer_table() -> np.ndarray:
+    if "dealer" in _INSTALLED:
+        return _INSTALLED["dealer"]
+    table = solve_dealer_states()[:, UPCARD_STATES, :]
+    table.setflags(write=False)
+    return table
+
+
+def dealer_blackjack_probs(card_probs: Sequence[float] | None = None) -> np.ndarray:
+    # (upcards,): chance that the hole card completes a two-card 21, read off the
+    # one-draw transitions from each upcard state into soft 21.
+    if card_probs is None:
+        return _default_blackjack_probs()
+    probs = np.asarray(card_probs, dtype=float)
+    if probs.shape != (len(CARD_VALUES),) or probs.sum() <= 0:
+        raise ValueError("card_probs must have 10 entries with positive mass")
+    one_draw = _DRAWS[0][list(UPCARD_STATES), :, STATE_INDEX[(21, 1)]]
+    return one_draw @ (probs / probs.sum())
+
+
+@lru_cache(maxsize=1)
+def _default_blackjack_probs() -> np.ndarray:
+    if "blackjack" in _INSTALLED:
+        return _INSTALLED["blackjack"]
+    table = dealer_blackjack_probs(DEFAULT_CARD_PROBS)
+    table.setflags(write=False)
+    return table
+
+
+def card_probs_from_counts(counts: Sequence[int]) -> tuple[float, ...]:
+    values = [float(count) for count in counts]
+    total = sum(values)
+    if len(values) != len(CARD_VALUES) or total <= 0:
+        raise ValueError("counts must list 10 ranks with at least one card")
+    return tuple(value / total for value in values)
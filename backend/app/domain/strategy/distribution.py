@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+# Grid step as a fraction of the stake. Half-stake resolution keeps every blackjack
+# settlement we model (push, even money, doubled bets, half-bet forfeits) on the grid.
+GRID_UNIT = 0.5
+
+
+class OutcomeDistribution:
+    # probs[i] is the probability that the bankroll changes by (low + i) * GRID_UNIT * stake.
+    __slots__ = ("stake", "low", "probs")
+
+    def __init__(self, stake: float, low: int, probs: np.ndarray) -> None:
+        self.stake = float(stake)
+        self.low = int(low)
+        self.probs = probs
+
+    @classmethod
+    def zeros(cls, stake: float, low: int, high: int) -> "OutcomeDistribution":
+        return cls(stake, low, np.zeros(high - low + 1))
+
+    @classmethod
+    def point(cls, stake: float, units: int) -> "OutcomeDistribution":
+        return cls(stake, units, np.ones(1))
+
+    @classmethod
+    def from_lose_push_win(
+        cls, stake: float, lose: float, push: float, win: float, multiplier: int = 1
+    ) -> "OutcomeDistribution":
+        # Even-money settlement of `multiplier` stakes: -m, 0 or +m.
+        span = 2 * int(multiplier)
+        probs = np.zeros(2 * span + 1)
+        probs[0] = lose
+        probs[span] = push
+        probs[-1] = win
+        return cls(stake, -span, probs)
+
+    @property
+    def high(self) -> int:
+        return self.low + len(self.probs) - 1
+
+    def deltas(self) -> np.ndarray:
+        return (np.arange(self.low, self.high + 1) * (GRID_UNIT * self.stake)).astype(float)
+
+    def _widen(self, low: int, high: int) -> None:
+        if low >= self.low and high <= self.high:
+            return
+        new_low = min(low, self.low)
+        new_high = max(high, self.high)
+        probs = np.zeros(new_high - new_low + 1)
+        probs[self.low - new_low : self.low - new_low + len(self.probs)] = self.probs
+        self.low = new_low
+        self.probs = probs
+
+    def mix(self, other: "OutcomeDistribution", weight: float = 1.0) -> "OutcomeDistribution":
+        # In place: self += weight * other.
+        if other.stake != self.stake:
+            raise ValueError("Cannot mix distributions with different stakes")
+        self._widen(other.low, other.high)
+        start = other.low - self.low
+        self.probs[start : start + len(other.probs)] += weight * other.probs
+        return self
+
+    def convolve(self, other: "OutcomeDistribution") -> "OutcomeDistribution":
+        # Distribution of the summed bankroll change of two independent outcomes.
+        if other.stake != self.stake:
+            raise ValueError("Cannot convolve distributions with different stakes")
+        return OutcomeDistribution(self.stake, self.low + other.low, np.convolve(self.probs, other.probs))
+
+    def scaled(self, stake: float) -> "OutcomeDistribution":
+        return OutcomeDistribution(stake, self.low, self.probs)
+
+    def total(self) -> float:
+        return float(self.probs.sum())
+
+    def moments(self) -> tuple[float, float]:
+        deltas = self.deltas()
+        weighted = self.probs * deltas
+        mean = float(weighted.sum())
+        second = float(weighted @ deltas)
+        return mean, max(second - mean * mean, 0.0)
+
+    def expected_utility(self, bankroll: float, utility: Callable[[np.ndarray], np.ndarray] = np.sqrt) -> float:
+        wealth = np.maximum(float(bankroll) + self.deltas(), 0.0)
+        return float(self.probs @ utility(wealth))
+
+    def expected_utility_grid(
+        self, bankrolls: np.ndarray, utility: Callable[[np.ndarray], np.ndarray] = np.sqrt
+    ) -> np.ndarray:
+        # One (bankrolls x outcomes) wealth matrix; no per-bankroll Python loop.
+        wealth = np.maximum(np.asarray(bankrolls, dtype=float)[:, None] + self.deltas()[None, :], 0.0)
+        return utility(wealth) @ self.probs
+
+    def __iter__(self) -> Iterator[tuple[float, float]]:
+        if self.stake == 0:
+            yield (0.0, self.total())
+            return
+        step = GRID_UNIT * self.stake
+        for idx in np.flatnonzero(self.probs > 0):
+            yield (float((self.low + int(idx)) * step), float(self.probs[idx]))
+
+    def to_entries(self) -> list[dict[str, float]]:
+        return [{"delta": delta, "prob": prob} for delta, prob in self]
+
+    def to_wire(self) -> dict[str, Any]:
+        # Compact form: delta_i = (low + i) * step, trailing/leading zeros trimmed.
+        nonzero = np.flatnonzero(self.probs > 0)
+        if len(nonzero) == 0:
+            return {"step": GRID_UNIT * self.stake, "low": 0, "probs": []}
+        first, last = int(nonzero[0]), int(nonzero[-1])
+        return {
+            "step": GRID_UNIT * self.stake,
+            "low": self.low + first,
+            "probs": self.probs[first : last + 1].tolist(),
+        }
+
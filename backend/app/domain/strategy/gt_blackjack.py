@@ -2,13 +2,27 @@ from __future__ import annotations
 
 from collections.abc import Sized
 from functools import lru_cache
-from math import sqrt
-from typing import Any, Iterable, Literal, Mapping
+from math import isfinite, sqrt
+from typing import Any, Iterable, Literal, Mapping, Sequence
+
+import numpy as np
+
+from .cache import LRUCache
+from .composition import RANK_SLOTS, finite_shoe_dealer_probs
+from .count_tables import get_count_tables
+from .distribution import OutcomeDistribution
+from .dealer_markov import RULES as DEALER_RULES
+from .dealer_markov import dealer_blackjack_probs, dealer_table
+from .utility import UtilityFn, parse_utility, utility_function
 
 CardDraw = Literal["A", 2, 3, 4, 5, 6, 7, 8, 9, 10]
 DealerRule = Literal["S17", "H17"]
+HitMode = Literal["optimal", "one_step"]
+OutcomeFormat = Literal["entries", "compact"]
+ExtraAction = Literal["surrender", "insurance"]
 CardInput = str | int
 PlayerStateInput = tuple[int, int] | Mapping[str, Any] | Iterable[CardInput]
+ShoeCountsInput = Sequence[int] | Mapping[CardInput, int]
 
 CARD_PROBS: dict[CardDraw, float] = {
     "A": 1.0 / 13.0,
@@ -24,8 +38,18 @@ CARD_PROBS: dict[CardDraw, float] = {
 }
 DRAW_OUTCOMES: tuple[tuple[CardDraw, float], ...] = tuple(CARD_PROBS.items())
 DEALER_KEYS: tuple[int | str, ...] = (17, 18, 19, 20, 21, "bust")
+RANK_ORDER: tuple[CardDraw, ...] = tuple(card for card, _ in DRAW_OUTCOMES)
 RANK_SET = {"A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "T"}
 SUIT_SET = {"S", "H", "D", "C"}
+# Bound for the per-state memo tables (dealer rows, stand/hit outcomes per player state).
+STATE_MEMO_SIZE = 4096
+ANALYSIS_CACHE_SIZE = 4096
+DEFAULT_MAX_SPLIT_HANDS = 4
+EXTRA_ACTIONS: tuple[ExtraAction, ...] = ("surrender", "insurance")
+RECOMMENDABLE_ACTIONS: tuple[str, ...] = ("stand", "hit", "double", "split", "surrender")
+
+# Results are shared between callers; treat cached analyses as read-only.
+_analysis_cache: LRUCache[dict[str, Any]] = LRUCache(ANALYSIS_CACHE_SIZE)
 
 
 def _parse_rule(rule: str) -> DealerRule:
@@ -35,6 +59,38 @@ def _parse_rule(rule: str) -> DealerRule:
     return upper  # type: ignore[return-value]
 
 
+def _parse_hit_mode(mode: str) -> HitMode:
+    lower = str(mode).strip().lower()
+    if lower not in {"optimal", "one_step"}:
+        raise ValueError(f"Invalid hit mode: {mode}")
+    return lower  # type: ignore[return-value]
+
+
+def _parse_outcome_format(outcome_format: str) -> OutcomeFormat:
+    lower = str(outcome_format).strip().lower()
+    if lower not in {"entries", "compact"}:
+        raise ValueError(f"Invalid outcome format: {outcome_format}")
+    return lower  # type: ignore[return-value]
+
+
+def _parse_extra_actions(extra_actions: Iterable[str]) -> tuple[ExtraAction, ...]:
+    requested = {str(action).strip().lower() for action in extra_actions}
+    unknown = requested.difference(EXTRA_ACTIONS)
+    if unknown:
+        raise ValueError(f"Invalid extra action: {sorted(unknown)[0]}")
+    return tuple(action for action in EXTRA_ACTIONS if action in requested)
+
+
+def _parse_true_count(true_count: float | None) -> float | None:
+    if true_count is None:
+        return None
+    value = float(true_count)
+    if not isfinite(value):
+        raise ValueError("true_count must be finite")
+    # Buckets are whole counts; three decimals is already finer than any live estimate.
+    return round(value, 3)
+
+
 def _parse_card_token(card: CardInput) -> CardDraw:
     if isinstance(card, int):
         if card == 1:
@@ -132,138 +188,436 @@ def _to_prob_dict(prob_tuple: tuple[float, float, float, float, float, float]) -
     }
 
 
-@lru_cache(maxsize=None)
-def _dealer_finish_probs(total: int, soft_aces: int, rule: DealerRule) -> tuple[float, float, float, float, float, float]:
-    dealer_total, dealer_soft_aces = _normalize_total(total, soft_aces)
-    if dealer_total > 21:
-        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _dealer_final_probs(upcard: CardDraw, rule: DealerRule) -> tuple[float, float, float, float, float, float]:
+    row = dealer_table()[DEALER_RULES.index(rule), RANK_ORDER.index(upcard)]
+    return tuple(float(value) for value in row)  # type: ignore[return-value]
 
-    is_soft = dealer_total <= 21 and dealer_soft_aces > 0
-    should_draw = dealer_total < 17 or (dealer_total == 17 and is_soft and rule == "H17")
-    if not should_draw:
-        if 17 <= dealer_total <= 21:
-            buckets = [0.0] * 6
-            buckets[dealer_total - 17] = 1.0
-            return tuple(buckets)  # type: ignore[return-value]
-        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
 
-    totals = [0.0] * 6
-    for draw_card, prob in DRAW_OUTCOMES:
-        next_total, next_soft = add_card_to_total(dealer_total, dealer_soft_aces, draw_card)
-        child = _dealer_finish_probs(next_total, next_soft, rule)
-        for idx, value in enumerate(child):
-            totals[idx] += prob * value
-    return tuple(totals)  # type: ignore[return-value]
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _dealer_blackjack_prob(upcard: CardDraw, true_count: float | None = None) -> float:
+    if true_count is not None:
+        # Hole card completes blackjack: a ten under an ace, an ace under a ten.
+        probs = get_count_tables().card_probs_at(true_count)
+        return float(probs[-1] if upcard == "A" else probs[0] if upcard == 10 else 0.0)
+    return float(dealer_blackjack_probs()[RANK_ORDER.index(upcard)])
 
 
-def dealer_distribution(upcard: CardInput, rule: DealerRule | str) -> dict[int | str, float]:
+def shoe_counts_from_cards(cards: Iterable[CardInput]) -> tuple[int, ...]:
+    counts = [0] * RANK_SLOTS
+    for card in cards:
+        counts[RANK_ORDER.index(_parse_card_token(card))] += 1
+    return tuple(counts)
+
+
+def _coerce_shoe_counts(shoe_counts: ShoeCountsInput) -> tuple[int, ...]:
+    if isinstance(shoe_counts, Mapping):
+        counts = [0] * RANK_SLOTS
+        for card, count in shoe_counts.items():
+            counts[RANK_ORDER.index(_parse_card_token(card))] += int(count)
+        return tuple(counts)
+    counts_seq = tuple(int(count) for count in shoe_counts)
+    if len(counts_seq) != RANK_SLOTS:
+        raise ValueError(f"shoe_counts must list {RANK_SLOTS} ranks (A, 2..9, 10)")
+    return counts_seq
+
+
+def dealer_distribution(
+    upcard: CardInput, rule: DealerRule | str, shoe_counts: ShoeCountsInput | None = None
+) -> dict[int | str, float]:
+    # shoe_counts are the unseen cards (upcard excluded); None means an infinite deck.
     parsed_rule = _parse_rule(rule)
     parsed_upcard = _parse_card_token(upcard)
-    base_total, base_soft_aces = add_card_to_total(0, 0, parsed_upcard)
-
-    totals = [0.0] * 6
-    for hidden_card, prob in DRAW_OUTCOMES:
-        next_total, next_soft = add_card_to_total(base_total, base_soft_aces, hidden_card)
-        child = _dealer_finish_probs(next_total, next_soft, parsed_rule)
-        for idx, value in enumerate(child):
-            totals[idx] += prob * value
+    if shoe_counts is not None:
+        return _to_prob_dict(
+            finite_shoe_dealer_probs(
+                RANK_ORDER.index(parsed_upcard), parsed_rule, _coerce_shoe_counts(shoe_counts)
+            )
+        )
+    return _to_prob_dict(_dealer_final_probs(parsed_upcard, parsed_rule))
 
-    return _to_prob_dict(tuple(totals))  # type: ignore[arg-type]
 
-
-def _aggregate_outcomes(entries: Iterable[tuple[float, float]]) -> list[tuple[float, float]]:
-    buckets: dict[float, float] = {}
-    for delta, prob in entries:
-        if prob <= 0:
-            continue
-        buckets[float(delta)] = buckets.get(float(delta), 0.0) + float(prob)
-    return sorted(buckets.items(), key=lambda item: item[0])
+def _stake(bet: int | float) -> float:
+    stake = float(bet)
+    if stake < 0:
+        raise ValueError("bet must be non-negative")
+    return stake
 
 
 def stand_delta_distribution(
     player_total: int, dealer_upcard: CardInput, bet: int | float, rule: DealerRule | str
-) -> list[tuple[float, float]]:
-    stake = float(bet)
-    if stake < 0:
-        raise ValueError("bet must be non-negative")
+) -> OutcomeDistribution:
+    stake = _stake(bet)
     if player_total > 21:
-        return [(-stake, 1.0)]
-
-    dealer_dist = dealer_distribution(dealer_upcard, rule)
-    outcomes: list[tuple[float, float]] = []
-    for dealer_outcome, prob in dealer_dist.items():
-        if dealer_outcome == "bust":
-            outcomes.append((stake, prob))
-            continue
-        dealer_total = int(dealer_outcome)
-        if player_total > dealer_total:
-            outcomes.append((stake, prob))
-        elif player_total < dealer_total:
-            outcomes.append((-stake, prob))
-        else:
-            outcomes.append((0.0, prob))
-    return _aggregate_outcomes(outcomes)
+        return OutcomeDistribution.from_lose_push_win(stake, 1.0, 0.0, 0.0)
+    lose, push, win = _stand_unit_outcome(int(player_total), _parse_card_token(dealer_upcard), _parse_rule(rule))
+    return OutcomeDistribution.from_lose_push_win(stake, lose, push, win)
 
 
 def ev_stand(player_total: int, dealer_upcard: CardInput, bet: int, rule: DealerRule | str) -> float:
-    return sum(delta * prob for delta, prob in stand_delta_distribution(player_total, dealer_upcard, bet, rule))
+    return stand_delta_distribution(player_total, dealer_upcard, bet, rule).moments()[0]
+
+
+def _draw_then_stand_unit_outcome(
+    total: int, soft_aces: int, upcard: CardDraw, rule: DealerRule
+) -> tuple[float, float, float]:
+    lose = push = win = 0.0
+    for draw_card, draw_prob in DRAW_OUTCOMES:
+        next_total, _ = add_card_to_total(total, soft_aces, draw_card)
+        child = _stand_unit_outcome(next_total, upcard, rule)
+        lose += draw_prob * child[0]
+        push += draw_prob * child[1]
+        win += draw_prob * child[2]
+    return (lose, push, win)
 
 
 def hit_one_step_delta_distribution(
     player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int | float, rule: DealerRule | str
-) -> list[tuple[float, float]]:
+) -> OutcomeDistribution:
     total, soft_aces = _coerce_player_state(player_state)
-    stake = float(bet)
-    outcomes: list[tuple[float, float]] = []
+    lose, push, win = _draw_then_stand_unit_outcome(
+        total, soft_aces, _parse_card_token(dealer_upcard), _parse_rule(rule)
+    )
+    return OutcomeDistribution.from_lose_push_win(_stake(bet), lose, push, win)
+
+
+def ev_hit_one_step(player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int, rule: DealerRule | str) -> float:
+    return hit_one_step_delta_distribution(player_state, dealer_upcard, bet, rule).moments()[0]
 
+
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _stand_unit_outcome(player_total: int, upcard: CardDraw, rule: DealerRule) -> tuple[float, float, float]:
+    # (lose, push, win) probabilities for a one-unit stake.
+    if player_total > 21:
+        return (1.0, 0.0, 0.0)
+    lose = push = win = 0.0
+    for idx, prob in enumerate(_dealer_final_probs(upcard, rule)):
+        if idx == 5 or player_total > 17 + idx:
+            win += prob
+        elif player_total < 17 + idx:
+            lose += prob
+        else:
+            push += prob
+    return (lose, push, win)
+
+
+def _prefers_hit(total: int, soft_aces: int, upcard: CardDraw, rule: DealerRule) -> bool:
+    if total >= 21:
+        return False
+    stand = _stand_unit_outcome(total, upcard, rule)
+    hit = _hit_unit_outcome(total, soft_aces, upcard, rule)
+    return hit[2] - hit[0] > stand[2] - stand[0]
+
+
+def _optimal_unit_outcome(
+    total: int, soft_aces: int, upcard: CardDraw, rule: DealerRule
+) -> tuple[float, float, float]:
+    if _prefers_hit(total, soft_aces, upcard, rule):
+        return _hit_unit_outcome(total, soft_aces, upcard, rule)
+    return _stand_unit_outcome(total, upcard, rule)
+
+
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _hit_unit_outcome(
+    total: int, soft_aces: int, upcard: CardDraw, rule: DealerRule
+) -> tuple[float, float, float]:
+    # Draw one card, then keep choosing the better of hit-again and stand at every node.
+    lose = push = win = 0.0
     for draw_card, draw_prob in DRAW_OUTCOMES:
         next_total, next_soft = add_card_to_total(total, soft_aces, draw_card)
         if next_total > 21:
-            outcomes.append((-stake, draw_prob))
+            lose += draw_prob
             continue
-        stand_outcomes = stand_delta_distribution(next_total, dealer_upcard, stake, rule)
-        for delta, prob in stand_outcomes:
-            outcomes.append((delta, draw_prob * prob))
-    return _aggregate_outcomes(outcomes)
+        child = _optimal_unit_outcome(next_total, min(next_soft, 1), upcard, rule)
+        lose += draw_prob * child[0]
+        push += draw_prob * child[1]
+        win += draw_prob * child[2]
+    return (lose, push, win)
 
 
-def ev_hit_one_step(player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int, rule: DealerRule | str) -> float:
-    return sum(delta * prob for delta, prob in hit_one_step_delta_distribution(player_state, dealer_upcard, bet, rule))
+def hit_delta_distribution(
+    player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int | float, rule: DealerRule | str
+) -> OutcomeDistribution:
+    total, soft_aces = _coerce_player_state(player_state)
+    stake = _stake(bet)
+    if total > 21:
+        return OutcomeDistribution.from_lose_push_win(stake, 1.0, 0.0, 0.0)
+    lose, push, win = _hit_unit_outcome(
+        total, min(soft_aces, 1), _parse_card_token(dealer_upcard), _parse_rule(rule)
+    )
+    return OutcomeDistribution.from_lose_push_win(stake, lose, push, win)
+
+
+def ev_hit(player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int, rule: DealerRule | str) -> float:
+    return hit_delta_distribution(player_state, dealer_upcard, bet, rule).moments()[0]
 
 
 def double_delta_distribution(
     player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int | float, rule: DealerRule | str
-) -> list[tuple[float, float]]:
+) -> OutcomeDistribution:
     total, soft_aces = _coerce_player_state(player_state)
-    stake = float(bet) * 2.0
-    outcomes: list[tuple[float, float]] = []
+    lose, push, win = _draw_then_stand_unit_outcome(
+        total, soft_aces, _parse_card_token(dealer_upcard), _parse_rule(rule)
+    )
+    return OutcomeDistribution.from_lose_push_win(_stake(bet), lose, push, win, multiplier=2)
 
+
+def ev_double(player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int, rule: DealerRule | str) -> float:
+    return double_delta_distribution(player_state, dealer_upcard, bet, rule).moments()[0]
+
+
+# Split model. Given the dealer's final bucket (17..21, bust) the post-split hands are
+# independent, so each hand is reduced to a per-bucket unit-stake OutcomeDistribution and
+# the hands are combined by convolution within each bucket.
+_BUST_INDEX = 22
+SplitBuckets = tuple[OutcomeDistribution, ...]
+
+
+def _build_showdown() -> np.ndarray:
+    # [player final total (22 = bust), dealer bucket] -> one-hot (lose, push, win).
+    showdown = np.zeros((_BUST_INDEX + 1, len(DEALER_KEYS), 3))
+    for total in range(_BUST_INDEX + 1):
+        for bucket in range(len(DEALER_KEYS)):
+            if total == _BUST_INDEX:
+                showdown[total, bucket, 0] = 1.0
+            elif bucket == 5 or total > 17 + bucket:
+                showdown[total, bucket, 2] = 1.0
+            elif total < 17 + bucket:
+                showdown[total, bucket, 0] = 1.0
+            else:
+                showdown[total, bucket, 1] = 1.0
+    return showdown
+
+
+_SHOWDOWN = _build_showdown()
+
+
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _played_final_totals(total: int, soft_aces: int, upcard: CardDraw, rule: DealerRule) -> tuple[float, ...]:
+    # Final-total distribution when the hand keeps following the EV-optimal hit/stand policy.
+    finals = [0.0] * (_BUST_INDEX + 1)
+    if total > 21:
+        finals[_BUST_INDEX] = 1.0
+        return tuple(finals)
+    if not _prefers_hit(total, soft_aces, upcard, rule):
+        finals[total] = 1.0
+        return tuple(finals)
     for draw_card, draw_prob in DRAW_OUTCOMES:
         next_total, next_soft = add_card_to_total(total, soft_aces, draw_card)
-        if next_total > 21:
-            outcomes.append((-stake, draw_prob))
-            continue
-        stand_outcomes = stand_delta_distribution(next_total, dealer_upcard, stake, rule)
-        for delta, prob in stand_outcomes:
-            outcomes.append((delta, draw_prob * prob))
-    return _aggregate_outcomes(outcomes)
+        child = _played_final_totals(next_total, min(next_soft, 1), upcard, rule)
+        for idx, child_prob in enumerate(child):
+            finals[idx] += draw_prob * child_prob
+    return tuple(finals)
 
 
-def ev_double(player_state: PlayerStateInput, dealer_upcard: CardInput, bet: int, rule: DealerRule | str) -> float:
-    return sum(delta * prob for delta, prob in double_delta_distribution(player_state, dealer_upcard, bet, rule))
+def _one_draw_final_totals(total: int, soft_aces: int) -> tuple[float, ...]:
+    finals = [0.0] * (_BUST_INDEX + 1)
+    for draw_card, draw_prob in DRAW_OUTCOMES:
+        next_total, _ = add_card_to_total(total, soft_aces, draw_card)
+        finals[min(next_total, _BUST_INDEX)] += draw_prob
+    return tuple(finals)
+
+
+def _frozen(distribution: OutcomeDistribution) -> OutcomeDistribution:
+    # Memoized distributions are shared between callers.
+    distribution.probs.setflags(write=False)
+    return distribution
+
+
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _split_hand_conditional(
+    pair_card: CardDraw, draw_card: CardDraw, upcard: CardDraw, rule: DealerRule, double_after_split: bool
+) -> SplitBuckets:
+    # Per dealer bucket: unit-stake result of one post-split hand that received draw_card.
+    total, soft_aces = add_card_to_total(*add_card_to_total(0, 0, pair_card), draw_card)
+    soft = min(soft_aces, 1)
+    stake = 1
+    if pair_card == "A":
+        # Split aces take one card each.
+        finals: tuple[float, ...] = tuple(1.0 if idx == total else 0.0 for idx in range(_BUST_INDEX + 1))
+    else:
+        finals = _played_final_totals(total, soft, upcard, rule)
+        if double_after_split:
+            play = _optimal_unit_outcome(total, soft, upcard, rule)
+            double = _draw_then_stand_unit_outcome(total, soft, upcard, rule)
+            if 2 * (double[2] - double[0]) > play[2] - play[0]:
+                finals = _one_draw_final_totals(total, soft)
+                stake = 2
+    lose_push_win = np.einsum("t,tdk->dk", np.asarray(finals), _SHOWDOWN)
+    return tuple(
+        _frozen(OutcomeDistribution.from_lose_push_win(1.0, *row, multiplier=stake)) for row in lose_push_win
+    )
+
+
+@lru_cache(maxsize=STATE_MEMO_SIZE)
+def _split_tail(
+    pair_card: CardDraw,
+    upcard: CardDraw,
+    rule: DealerRule,
+    double_after_split: bool,
+    max_hands: int,
+    pending: int,
+    hands: int,
+) -> SplitBuckets:
+    # Per dealer bucket: unit-stake summed result of the `pending` unplayed hands.
+    if pending == 0:
+        return tuple(_frozen(OutcomeDistribution.point(1.0, 0)) for _ in DEALER_KEYS)
+    rest = _split_tail(pair_card, upcard, rule, double_after_split, max_hands, pending - 1, hands)
+    result = [OutcomeDistribution.zeros(1.0, 0, 0) for _ in DEALER_KEYS]
+    for draw_card, draw_prob in DRAW_OUTCOMES:
+        if draw_card == pair_card and pair_card != "A" and hands < max_hands:
+            # Resplit: the drawn card starts another pending hand.
+            branch = _split_tail(pair_card, upcard, rule, double_after_split, max_hands, pending + 1, hands + 1)
+        else:
+            hand = _split_hand_conditional(pair_card, draw_card, upcard, rule, double_after_split)
+            branch = tuple(played.convolve(unplayed) for played, unplayed in zip(hand, rest))
+        for combined, part in zip(result, branch):
+            combined.mix(part, draw_prob)
+    return tuple(_frozen(combined) for combined in result)
+
+
+def split_delta_distribution(
+    pair_card: CardInput,
+    dealer_upcard: CardInput,
+    bet: int | float,
+    rule: DealerRule | str,
+    max_hands: int = DEFAULT_MAX_SPLIT_HANDS,
+    double_after_split: bool = True,
+) -> OutcomeDistribution:
+    if int(max_hands) < 2:
+        raise ValueError("max_hands must be >= 2")
+    parsed_upcard = _parse_card_token(dealer_upcard)
+    parsed_rule = _parse_rule(rule)
+    tail = _split_tail(
+        _parse_card_token(pair_card), parsed_upcard, parsed_rule, bool(double_after_split), int(max_hands), 2, 2
+    )
+    result = OutcomeDistribution.zeros(1.0, 0, 0)
+    for bucket_prob, bucket in zip(_dealer_final_probs(parsed_upcard, parsed_rule), tail):
+        result.mix(bucket, bucket_prob)
+    return result.scaled(_stake(bet))
 
 
-def expected_utility(bankroll: int | float, outcomes: Iterable[tuple[float, float]]) -> float:
-    base = float(bankroll)
-    return sum(prob * sqrt(max(base + delta, 0.0)) for delta, prob in outcomes)
+def ev_split(
+    pair_card: CardInput,
+    dealer_upcard: CardInput,
+    bet: int,
+    rule: DealerRule | str,
+    max_hands: int = DEFAULT_MAX_SPLIT_HANDS,
+    double_after_split: bool = True,
+) -> float:
+    return split_delta_distribution(pair_card, dealer_upcard, bet, rule, max_hands, double_after_split).moments()[0]
+
+
+def _pair_from_cards(cards: Iterable[CardInput]) -> CardDraw | None:
+    parsed = [_parse_card_token(card) for card in cards]
+    if len(parsed) == 2 and parsed[0] == parsed[1]:
+        return parsed[0]
+    return None
+
+
+def _pair_from_total(total: int, soft_aces: int) -> CardDraw | None:
+    if soft_aces > 0:
+        return "A" if total == 12 else None
+    if total % 2 == 0 and 4 <= total <= 20:
+        return total // 2  # type: ignore[return-value]
+    return None
+
+
+def _can_afford_extra_stake(bet: int | float, bankroll: int | float) -> bool:
+    # Split and double both add one more stake; the placed bet is already off the bankroll.
+    return float(bet) > 0 and float(bankroll) >= float(bet)
+
+
+def _split_pair_card(
+    player_state: PlayerStateInput,
+    bet: int | float,
+    bankroll: int | float,
+    can_split: bool | None,
+    infer_can_double: bool = False,
+) -> CardDraw | None:
+    # The pair rank when splitting is allowed, otherwise None.
+    if can_split is False:
+        return None
+    cards: Any = None
+    if isinstance(player_state, Mapping):
+        cards = player_state.get("cards")
+    elif not isinstance(player_state, tuple) and isinstance(player_state, Iterable):
+        cards = list(player_state)  # type: ignore[arg-type]
+    if cards is not None and not isinstance(cards, (str, bytes)):
+        pair = _pair_from_cards(cards)
+    elif can_split:
+        pair = _pair_from_total(*_coerce_player_state(player_state))
+    else:
+        pair = None
+
+    if can_split and pair is None:
+        raise ValueError("can_split requires a two-card pair")
+    if can_split is None and infer_can_double and not _can_afford_extra_stake(bet, bankroll):
+        return None
+    return pair
+
+
+def surrender_delta_distribution(
+    dealer_upcard: CardInput, bet: int | float, true_count: float | None = None
+) -> OutcomeDistribution:
+    # Late surrender: half the bet comes back unless the dealer turns out to hold blackjack.
+    blackjack = _dealer_blackjack_prob(_parse_card_token(dealer_upcard), _parse_true_count(true_count))
+    return OutcomeDistribution(_stake(bet), -2, np.array([blackjack, 1.0 - blackjack]))
+
+
+def insurance_delta_distribution(
+    dealer_upcard: CardInput, bet: int | float, true_count: float | None = None
+) -> OutcomeDistribution:
+    # Side bet of half the main bet paying 2:1 on dealer blackjack; only offered against an ace.
+    parsed_upcard = _parse_card_token(dealer_upcard)
+    if parsed_upcard != "A":
+        raise ValueError("Insurance is only offered against a dealer ace")
+    blackjack = _dealer_blackjack_prob(parsed_upcard, _parse_true_count(true_count))
+    return OutcomeDistribution(_stake(bet), -1, np.array([1.0 - blackjack, 0.0, 0.0, blackjack]))
+
+
+def _can_surrender(player_state: PlayerStateInput) -> bool:
+    # Surrender is a first-decision option; card lists tell us whether this is still the first decision.
+    cards: Any = None
+    if isinstance(player_state, Mapping):
+        cards = player_state.get("cards")
+    elif not isinstance(player_state, tuple) and isinstance(player_state, Sized):
+        cards = player_state
+    if isinstance(cards, Sized) and not isinstance(cards, (str, bytes)):
+        return len(cards) == 2
+    return True
+
+
+def expected_utility(
+    bankroll: int | float,
+    outcomes: OutcomeDistribution | Iterable[tuple[float, float]],
+    utility: str = "sqrt",
+    utility_param: float | None = None,
+) -> float:
+    return _expected_utility(bankroll, outcomes, utility_function(utility, utility_param))
+
+
+def _expected_utility(
+    bankroll: int | float, outcomes: OutcomeDistribution | Iterable[tuple[float, float]], utility: UtilityFn
+) -> float:
+    if isinstance(outcomes, OutcomeDistribution):
+        return outcomes.expected_utility(bankroll, utility)
+    entries = list(outcomes)
+    if not entries:
+        return 0.0
+    deltas, probs = (np.array(column, dtype=float) for column in zip(*entries))
+    return float(probs @ utility(np.maximum(float(bankroll) + deltas, 0.0)))
 
 
 def security_level(
-    outcomes: Iterable[tuple[float, float]], risk_lambda: float = 1.0
+    outcomes: OutcomeDistribution | Iterable[tuple[float, float]], risk_lambda: float = 1.0
 ) -> tuple[float, float, float]:
-    entries = list(outcomes)
-    mu = sum(delta * prob for delta, prob in entries)
-    variance = sum(prob * ((delta - mu) ** 2) for delta, prob in entries)
+    if isinstance(outcomes, OutcomeDistribution):
+        mu, variance = outcomes.moments()
+    else:
+        entries = list(outcomes)
+        mu = sum(delta * prob for delta, prob in entries)
+        variance = sum(prob * ((delta - mu) ** 2) for delta, prob in entries)
     score = mu - float(risk_lambda) * sqrt(max(variance, 0.0))
     return score, mu, variance
 
@@ -279,7 +633,7 @@ def _infer_can_double(
     if not infer_can_double:
         return True
 
-    if float(bet) <= 0 or float(bankroll) < float(bet):
+    if not _can_afford_extra_stake(bet, bankroll):
         return False
 
     if isinstance(player_state, Mapping):
@@ -300,7 +654,7 @@ def _infer_can_double(
 def _recommend(actions: dict[str, dict[str, Any]], metric_key: str) -> str | None:
     best_name: str | None = None
     best_score = float("-inf")
-    for action_name in ("stand", "hit", "double"):
+    for action_name in RECOMMENDABLE_ACTIONS:
         info = actions.get(action_name)
         if not info or not info.get("allowed", False):
             continue
@@ -314,7 +668,90 @@ def _recommend(actions: dict[str, dict[str, Any]], metric_key: str) -> str | Non
     return best_name
 
 
-def _serialize_outcomes(outcomes: list[tuple[float, float]]) -> list[dict[str, float]]:
+def security_sweep(actions: Mapping[str, Mapping[str, Any]], risk_lambdas: Iterable[float]) -> dict[str, Any]:
+    # Score every allowed action for every lambda from one (ev, sd) pair each. Scores are lines
+    # in lambda, so crossovers are solved exactly on the upper envelope rather than read off the grid.
+    lambdas = np.asarray([float(value) for value in risk_lambdas], dtype=float)
+    if lambdas.size == 0:
+        raise ValueError("risk_lambdas must not be empty")
+    if (lambdas < 0).any():
+        raise ValueError("risk_lambdas must be non-negative")
+    names = [
+        name
+        for name in RECOMMENDABLE_ACTIONS
+        if actions.get(name, {}).get("allowed") and actions[name].get("ev") is not None
+    ]
+    if not names:
+        return {"risk_lambdas": lambdas.tolist(), "recommended": [None] * lambdas.size, "crossovers": []}
+    mu = np.array([float(actions[name]["ev"]) for name in names])
+    sd = np.sqrt(np.maximum([float(actions[name]["variance"]) for name in names], 0.0))
+    scores = mu[None, :] - lambdas[:, None] * sd[None, :]
+    # argmax keeps the first maximum, the same tie-break as _recommend.
+    recommended = [names[idx] for idx in np.argmax(scores, axis=1)]
+
+    crossovers: list[dict[str, Any]] = []
+    low, high = float(lambdas.min()), float(lambdas.max())
+    current = low
+    best = int(np.argmax(mu - low * sd))
+    while True:
+        overtakes = sd < sd[best]
+        if not overtakes.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            at = np.where(overtakes, (mu[best] - mu) / (sd[best] - sd), np.inf)
+        at = np.maximum(at, current)
+        point = float(at.min())
+        if point > high:
+            break
+        # Among lines crossing at the same point, the flattest one leads afterwards.
+        tied = np.flatnonzero(at <= point + 1e-12)
+        successor = int(tied[np.argmin(sd[tied])])
+        crossovers.append({"risk_lambda": point, "from": names[best], "to": names[successor]})
+        best, current = successor, point
+    return {"risk_lambdas": lambdas.tolist(), "recommended": recommended, "crossovers": crossovers}
+
+
+def risk_averse_curve(
+    outcomes: Mapping[str, OutcomeDistribution | None], bankrolls: Iterable[int | float], utility: UtilityFn = np.sqrt
+) -> dict[str, Any]:
+    # Risk-averse pick per bankroll: one utility matrix per action over the whole grid, then a
+    # column-wise argmax. Thresholds are the grid bankrolls where the pick changes.
+    grid = np.unique(np.asarray([float(value) for value in bankrolls], dtype=float))
+    if grid.size == 0:
+        raise ValueError("bankroll_grid must not be empty")
+    if grid[0] < 0:
+        raise ValueError("bankroll_grid must be non-negative")
+    names = [name for name in RECOMMENDABLE_ACTIONS if outcomes.get(name) is not None]
+    if not names:
+        return {"bankrolls": grid.tolist(), "recommended": [None] * grid.size, "thresholds": []}
+    scores = np.vstack(
+        [outcomes[name].expected_utility_grid(grid, utility) for name in names]  # type: ignore[union-attr]
+    )
+    picks = np.argmax(scores, axis=0)
+    changes = np.flatnonzero(picks[1:] != picks[:-1]) + 1
+    return {
+        "bankrolls": grid.tolist(),
+        "recommended": [names[idx] for idx in picks],
+        "thresholds": [
+            {"bankroll": float(grid[idx]), "from": names[picks[idx - 1]], "to": names[picks[idx]]} for idx in changes
+        ],
+    }
+
+
+def _recommend_insurance(
+    insurance: dict[str, Any], bankroll: int | float, utility: UtilityFn = np.sqrt
+) -> dict[str, str]:
+    # Declining leaves the bankroll unchanged: zero EV, zero security penalty, utility of the bankroll.
+    declined = {"ev": 0.0, "utility_score": _expected_utility(bankroll, [(0.0, 1.0)], utility), "security_score": 0.0}
+    metrics = (("ev_maximizer", "ev"), ("risk_averse", "utility_score"), ("security_level", "security_score"))
+    return {name: "take" if float(insurance[metric]) > declined[metric] else "decline" for name, metric in metrics}
+
+
+def _serialize_outcomes(
+    outcomes: OutcomeDistribution | Iterable[tuple[float, float]], outcome_format: OutcomeFormat = "entries"
+) -> list[dict[str, float]] | dict[str, Any]:
+    if isinstance(outcomes, OutcomeDistribution):
+        return outcomes.to_wire() if outcome_format == "compact" else outcomes.to_entries()
     return [{"delta": float(delta), "prob": float(prob)} for delta, prob in outcomes]
 
 
@@ -327,8 +764,25 @@ def analyze_decision_state(
     can_double: bool | None = None,
     infer_can_double: bool = False,
     risk_lambda: float = 1.0,
+    hit_mode: HitMode | str = "optimal",
+    outcome_format: OutcomeFormat | str = "entries",
+    can_split: bool | None = None,
+    max_split_hands: int = DEFAULT_MAX_SPLIT_HANDS,
+    double_after_split: bool = True,
+    extra_actions: Iterable[ExtraAction | str] = (),
+    true_count: float | None = None,
+    utility: str = "sqrt",
+    utility_param: float | None = None,
+    bankroll_grid: Iterable[int | float] | None = None,
 ) -> dict[str, Any]:
     parsed_rule = _parse_rule(rule)
+    parsed_hit_mode = _parse_hit_mode(hit_mode)
+    parsed_outcome_format = _parse_outcome_format(outcome_format)
+    parsed_true_count = _parse_true_count(true_count)
+    if parsed_true_count is not None and parsed_hit_mode != "optimal":
+        raise ValueError("true_count requires hit_mode 'optimal'")
+    utility_spec = parse_utility(utility, utility_param)
+    grid = tuple(sorted({float(value) for value in bankroll_grid})) if bankroll_grid is not None else ()
     player_total, player_soft_aces = _coerce_player_state(player_state)
     parsed_upcard = _parse_card_token(dealer_upcard)
 
@@ -336,44 +790,143 @@ def analyze_decision_state(
         allow_double = _infer_can_double(player_state, bet, bankroll, infer_can_double)
     else:
         allow_double = bool(can_double)
-
-    stand_outcomes = stand_delta_distribution(player_total, dealer_upcard, bet, parsed_rule)
-    hit_outcomes = hit_one_step_delta_distribution(player_state, dealer_upcard, bet, parsed_rule)
-    double_outcomes = (
-        double_delta_distribution(player_state, dealer_upcard, bet, parsed_rule) if allow_double else []
+    split_card = _split_pair_card(player_state, bet, bankroll, can_split, infer_can_double)
+    split_rules = (split_card, int(max_split_hands), bool(double_after_split))
+    extras = _parse_extra_actions(extra_actions)
+    if "surrender" in extras and not _can_surrender(player_state):
+        extras = tuple(action for action in extras if action != "surrender")
+
+    key = (
+        player_total,
+        player_soft_aces,
+        parsed_upcard,
+        bet,
+        bankroll,
+        parsed_rule,
+        allow_double,
+        float(risk_lambda),
+        parsed_hit_mode,
+        parsed_outcome_format,
+        split_rules,
+        extras,
+        parsed_true_count,
+        utility_spec,
+        grid,
+    )
+    cached = _analysis_cache.get(key)
+    if cached is not None:
+        return cached
+    result = _analyze_normalized(
+        player_total,
+        player_soft_aces,
+        parsed_upcard,
+        bet,
+        bankroll,
+        parsed_rule,
+        allow_double,
+        float(risk_lambda),
+        parsed_hit_mode,
+        parsed_outcome_format,
+        split_rules,
+        extras,
+        parsed_true_count,
+        utility_spec,
+        grid,
     )
+    _analysis_cache.put(key, result)
+    return result
 
-    stand_security, stand_mu, stand_var = security_level(stand_outcomes, risk_lambda)
-    hit_security, hit_mu, hit_var = security_level(hit_outcomes, risk_lambda)
-    double_security, double_mu, double_var = (
-        security_level(double_outcomes, risk_lambda) if allow_double else (None, None, None)
+
+def _action_metrics(
+    outcomes: OutcomeDistribution | None,
+    bankroll: int,
+    risk_lambda: float,
+    outcome_format: OutcomeFormat,
+    utility: UtilityFn = np.sqrt,
+) -> dict[str, Any]:
+    if outcomes is None:
+        return {
+            "allowed": False,
+            "ev": None,
+            "utility_score": None,
+            "security_score": None,
+            "variance": None,
+            "outcomes": _serialize_outcomes([], outcome_format),
+        }
+    security, mu, variance = security_level(outcomes, risk_lambda)
+    return {
+        "allowed": True,
+        "ev": mu,
+        "utility_score": _expected_utility(bankroll, outcomes, utility),
+        "security_score": security,
+        "variance": variance,
+        "outcomes": _serialize_outcomes(outcomes, outcome_format),
+    }
+
+
+def _analyze_normalized(
+    player_total: int,
+    player_soft_aces: int,
+    parsed_upcard: CardDraw,
+    bet: int,
+    bankroll: int,
+    parsed_rule: DealerRule,
+    allow_double: bool,
+    risk_lambda: float,
+    parsed_hit_mode: HitMode,
+    outcome_format: OutcomeFormat,
+    split_rules: tuple[CardDraw | None, int, bool],
+    extras: tuple[ExtraAction, ...] = (),
+    true_count: float | None = None,
+    utility: tuple[str, float] = ("sqrt", 0.0),
+    bankroll_grid: tuple[float, ...] = (),
+) -> dict[str, Any]:
+    player_state = (player_total, player_soft_aces)
+    soft = 1 if player_soft_aces > 0 else 0
+    count_tables = get_count_tables() if true_count is not None else None
+    if count_tables is not None and count_tables.covers(player_total, soft):
+        # Count-aware stand/hit/double come from the per-bucket tables; splits stay on the
+        # neutral-shoe model.
+        upcard_slot = RANK_ORDER.index(parsed_upcard)
+        rows = count_tables.unit_outcomes(parsed_rule, true_count, upcard_slot, player_total, soft)
+        stake = _stake(bet)
+        stand_outcomes = OutcomeDistribution.from_lose_push_win(stake, *rows[0])
+        hit_outcomes = OutcomeDistribution.from_lose_push_win(stake, *rows[1])
+        double_outcomes = (
+            OutcomeDistribution.from_lose_push_win(stake, *rows[2], multiplier=2) if allow_double else None
+        )
+        dealer_row = count_tables.dealer_probs(parsed_rule, true_count, upcard_slot)
+        dealer_probs = _to_prob_dict(tuple(float(value) for value in dealer_row))  # type: ignore[arg-type]
+    else:
+        stand_outcomes = stand_delta_distribution(player_total, parsed_upcard, bet, parsed_rule)
+        if parsed_hit_mode == "optimal":
+            hit_outcomes = hit_delta_distribution(player_state, parsed_upcard, bet, parsed_rule)
+        else:
+            hit_outcomes = hit_one_step_delta_distribution(player_state, parsed_upcard, bet, parsed_rule)
+        double_outcomes = (
+            double_delta_distribution(player_state, parsed_upcard, bet, parsed_rule) if allow_double else None
+        )
+        dealer_probs = dealer_distribution(parsed_upcard, parsed_rule)
+    split_card, max_split_hands, double_after_split = split_rules
+    split_outcomes = (
+        split_delta_distribution(split_card, parsed_upcard, bet, parsed_rule, max_split_hands, double_after_split)
+        if split_card is not None
+        else None
     )
 
+    distributions: dict[str, OutcomeDistribution | None] = {
+        "stand": stand_outcomes,
+        "hit": hit_outcomes,
+        "double": double_outcomes,
+        "split": split_outcomes,
+    }
+    # Extra actions are only evaluated when requested.
+    if "surrender" in extras:
+        distributions["surrender"] = surrender_delta_distribution(parsed_upcard, bet, true_count)
+    utility_fn = utility_function(*utility)
     actions: dict[str, dict[str, Any]] = {
-        "stand": {
-            "allowed": True,
-            "ev": stand_mu,
-            "utility_score": expected_utility(bankroll, stand_outcomes),
-            "security_score": stand_security,
-            "variance": stand_var,
-            "outcomes": _serialize_outcomes(stand_outcomes),
-        },
-        "hit": {
-            "allowed": True,
-            "ev": hit_mu,
-            "utility_score": expected_utility(bankroll, hit_outcomes),
-            "security_score": hit_security,
-            "variance": hit_var,
-            "outcomes": _serialize_outcomes(hit_outcomes),
-        },
-        "double": {
-            "allowed": allow_double,
-            "ev": double_mu if allow_double else None,
-            "utility_score": expected_utility(bankroll, double_outcomes) if allow_double else None,
-            "security_score": double_security if allow_double else None,
-            "variance": double_var if allow_double else None,
-            "outcomes": _serialize_outcomes(double_outcomes) if allow_double else [],
-        },
+        name: _action_metrics(outcomes, bankroll, risk_lambda, outcome_format, utility_fn)
+        for name, outcomes in distributions.items()
     }
 
     recommendations = {
@@ -381,8 +934,18 @@ def analyze_decision_state(
         "risk_averse": _recommend(actions, "utility_score"),
         "security_level": _recommend(actions, "security_score"),
     }
-
-    return {
+    side_bets: dict[str, dict[str, Any]] = {}
+    if "insurance" in extras and parsed_upcard == "A":
+        side_bets["insurance"] = _action_metrics(
+            insurance_delta_distribution(parsed_upcard, bet, true_count),
+            bankroll,
+            risk_lambda,
+            outcome_format,
+            utility_fn,
+        )
+        recommendations["insurance"] = _recommend_insurance(side_bets["insurance"], bankroll, utility_fn)
+
+    result: dict[str, Any] = {
         "inputs": {
             "player_total": player_total,
             "player_soft_aces": player_soft_aces,
@@ -392,8 +955,34 @@ def analyze_decision_state(
             "rule": parsed_rule,
             "can_double": allow_double,
             "risk_lambda": float(risk_lambda),
+            "hit_mode": parsed_hit_mode,
+            "outcome_format": outcome_format,
+            "can_split": split_card is not None,
+            "max_split_hands": max_split_hands,
+            "double_after_split": double_after_split,
+            "extra_actions": list(extras),
+            "true_count": true_count,
+            "utility": utility[0],
+            "utility_param": utility[1],
         },
-        "dealer_distribution": dealer_distribution(dealer_upcard, parsed_rule),
+        "dealer_distribution": dealer_probs,
         "actions": actions,
         "recommendations": recommendations,
     }
+    if side_bets:
+        result["side_bets"] = side_bets
+    if bankroll_grid:
+        result["risk_averse_curve"] = risk_averse_curve(distributions, bankroll_grid, utility_fn)
+    return result
+
+
+def analysis_cache_info() -> dict[str, Any]:
+    return _analysis_cache.info()
+
+
+def configure_analysis_cache(maxsize: int) -> None:
+    _analysis_cache.resize(maxsize)
+
+
+def clear_analysis_cache() -> None:
+    _analysis_cache.clear()
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from .composition import (
+    RANK_SLOTS,
+    RANK_VALUES,
+    DealerProbs,
+    composition_key,
+    finite_shoe_dealer_probs,
+    full_shoe_counts,
+)
+from .tables import get_strategy_table
+
+# Expectation for a seat following the advisor's strategy table, the policy simulate_rounds
+# also plays. The initial deal (player, player, upcard, hole) is enumerated without replacement
+# from a fresh shoe and player draws come off the shoe left after it. The dealer's finish is
+# solved once per deal on that post-deal shoe, so cards the player hits are not removed from the
+# dealer's shoe; that keeps the enumeration cheap and is off by a few hundredths of a percent on
+# a single deck, less on shoes. The game never peeks, so a dealer blackjack also takes doubled
+# stakes.
+DEALER_SOFT_17_MODES = ("S17", "H17", "RANDOM_PER_ROUND")
+_ACE, _TEN = 0, 9
+
+
+def _add(total: int, soft: int, slot: int) -> tuple[int, int]:
+    total += RANK_VALUES[slot]
+    soft += 1 if slot == _ACE else 0
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return total, soft
+
+
+def _upcard_token(slot: int) -> str | int:
+    return "A" if slot == _ACE else RANK_VALUES[slot]
+
+
+def _blackjack_hole(upcard_slot: int) -> int | None:
+    return _TEN if upcard_slot == _ACE else _ACE if upcard_slot == _TEN else None
+
+
+class _FiniteShoeHand:
+    # Plays one seat against a fixed upcard; counts are adjusted in place while walking the
+    # draw tree and restored on the way back, like _FiniteShoeDealer.
+    __slots__ = ("counts", "remaining", "rule", "upcard", "token", "table", "dealer", "_hits")
+
+    def __init__(self, counts: list[int], rule: str, upcard_slot: int) -> None:
+        self.counts = counts
+        self.remaining = sum(counts)
+        self.rule = rule
+        self.upcard = upcard_slot
+        self.token = _upcard_token(upcard_slot)
+        self.table = get_strategy_table()
+        self.dealer: DealerProbs = (0.0,) * 6  # type: ignore[assignment]
+        self._hits: dict[tuple[int, int, int], float] = {}
+
+    def deal(self) -> None:
+        # Called once the initial cards are out of counts; the dealer finish is conditioned on no blackjack.
+        self.remaining = sum(self.counts)
+        probs = list(finite_shoe_dealer_probs(self.upcard, self.rule, self.counts))
+        hole = _blackjack_hole(self.upcard)
+        if hole is not None:
+            blackjack = self.counts[hole] / self.remaining
+            probs[4] -= blackjack
+            probs = [prob / (1.0 - blackjack) for prob in probs]
+        self.dealer = tuple(probs)
+        self._hits.clear()
+
+    def stand(self, total: int) -> float:
+        if total > 21:
+            return -1.0
+        dealer = self.dealer
+        ev = dealer[5]
+        for bucket in range(5):
+            final = 17 + bucket
+            ev += dealer[bucket] * (1.0 if total > final else -1.0 if total < final else 0.0)
+        return ev
+
+    def _draws(self, total: int, soft: int, after: Any) -> float:
+        # Expected after(next_total, next_soft) over one card drawn from the shoe.
+        counts = self.counts
+        remaining = self.remaining
+        ev = 0.0
+        for slot in range(RANK_SLOTS):
+            count = counts[slot]
+            if count == 0:
+                continue
+            counts[slot] = count - 1
+            self.remaining = remaining - 1
+            ev += count / remaining * after(*_add(total, soft, slot))
+            counts[slot] = count
+            self.remaining = remaining
+        return ev
+
+    def action(self, total: int, soft: int, can_double: bool) -> str:
+        if total >= 21:
+            return "stand"
+        soft_flag = 1 if soft else 0
+        return self.table.best_action(total, soft_flag, self.token, self.rule, can_double)  # type: ignore[arg-type]
+
+    def play(self, total: int, soft: int, can_double: bool) -> float:
+        # EV per initial stake against a dealer without blackjack.
+        action = self.action(total, soft, can_double)
+        if action == "stand":
+            return self.stand(total)
+        if action == "double":
+            return 2.0 * self._draws(total, soft, lambda next_total, _: self.stand(next_total))
+        key = (composition_key(self.counts), total, 1 if soft else 0)
+        cached = self._hits.get(key)
+        if cached is None:
+            cached = self._draws(total, soft, self._after_hit)
+            self._hits[key] = cached
+        return cached
+
+    def _after_hit(self, total: int, soft: int) -> float:
+        return -1.0 if total > 21 else self.play(total, soft, False)
+
+
+@lru_cache(maxsize=64)
+def _rule_house_edge(shoe_decks: int, rule: str) -> dict[str, float]:
+    # Blackjack wins are kept apart from the rest of the EV, so the payout is applied without replaying the deal.
+    counts = list(full_shoe_counts(shoe_decks))
+    remaining = sum(counts)
+    hands = [_FiniteShoeHand(counts, rule, upcard) for upcard in range(RANK_SLOTS)]
+    ev = blackjack_win = player_blackjack = dealer_blackjack = 0.0
+    for first in range(RANK_SLOTS):
+        p_first = counts[first] / remaining
+        counts[first] -= 1
+        for second in range(first, RANK_SLOTS):
+            # Either card order gives the same hand and the same shoe.
+            p_second = p_first * counts[second] / (remaining - 1) * (1 if second == first else 2)
+            counts[second] -= 1
+            total, soft = _add(*_add(0, 0, first), second)
+            for upcard, hand in enumerate(hands):
+                prob = p_second * counts[upcard] / (remaining - 2)
+                if prob == 0.0:
+                    continue
+                counts[upcard] -= 1
+                hand.deal()
+                hole_slot = _blackjack_hole(upcard)
+                p_bj = counts[hole_slot] / (remaining - 3) if hole_slot is not None else 0.0
+                dealer_blackjack += prob * p_bj
+                if total == 21:
+                    player_blackjack += prob
+                    blackjack_win += prob * (1.0 - p_bj)
+                else:
+                    stake = 2.0 if hand.action(total, soft, True) == "double" else 1.0
+                    ev += prob * ((1.0 - p_bj) * hand.play(total, soft, True) - p_bj * stake)
+                counts[upcard] += 1
+            counts[second] += 1
+        counts[first] += 1
+    return {
+        "ev": ev,
+        "blackjack_win": blackjack_win,
+        "player_blackjack": player_blackjack,
+        "dealer_blackjack": dealer_blackjack,
+    }
+
+
+@lru_cache(maxsize=256)
+def _house_edge(shoe_decks: int, dealer_soft_17_mode: str, blackjack_payout: float) -> tuple[tuple[str, float], ...]:
+    rules = ("S17", "H17") if dealer_soft_17_mode == "RANDOM_PER_ROUND" else (dealer_soft_17_mode,)
+    per_rule = []
+    for rule in rules:
+        part = _rule_house_edge(shoe_decks, rule)
+        per_rule.append(
+            {
+                "player_ev": part["ev"] + part["blackjack_win"] * blackjack_payout,
+                "player_blackjack": part["player_blackjack"],
+                "dealer_blackjack": part["dealer_blackjack"],
+            }
+        )
+    merged = {key: float(sum(part[key] for part in per_rule)) / len(per_rule) for key in per_rule[0]}
+    return tuple(merged.items())
+
+
+def table_strategy_house_edge(shoe_decks: int, dealer_soft_17_mode: str, blackjack_payout: float) -> dict[str, Any]:
+    mode = str(dealer_soft_17_mode).upper()
+    if mode not in DEALER_SOFT_17_MODES:
+        raise ValueError(f"Invalid dealer_soft_17_mode: {dealer_soft_17_mode}")
+    if int(shoe_decks) < 1:
+        raise ValueError("Shoe decks must be >= 1")
+    if blackjack_payout <= 0:
+        raise ValueError("blackjack_payout must be positive")
+    result = dict(_house_edge(int(shoe_decks), mode, float(blackjack_payout)))
+    return {
+        "shoe_decks": int(shoe_decks),
+        "dealer_soft_17_mode": mode,
+        "blackjack_payout": float(blackjack_payout),
+        "house_edge": -result["player_ev"],
+        "player_blackjack_prob": result["player_blackjack"],
+        "dealer_blackjack_prob": result["dealer_blackjack"],
+    }
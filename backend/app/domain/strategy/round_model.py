@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from math import floor
+from typing import Callable
+
+import numpy as np
+
+from .count_tables import COUNT_BUCKETS, MAX_TRUE_COUNT, MIN_COUNT_TOTAL, MIN_TRUE_COUNT, get_count_tables
+from .dealer_markov import RULES as DEALER_RULES
+from .gt_blackjack import (
+    DRAW_OUTCOMES,
+    RANK_ORDER,
+    DealerRule,
+    _dealer_blackjack_prob,
+    _parse_rule,
+    add_card_to_total,
+)
+from .tables import _ACTION_STAKES, TABLE_ACTIONS, get_strategy_table
+
+_STAKES = np.array(_ACTION_STAKES)
+
+
+def _round_mass(
+    card_probs: np.ndarray,
+    dealer_blackjack: np.ndarray,
+    cell: Callable[[int, int, int], np.ndarray],
+    blackjack_payout: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    # cell(upcard_slot, total, soft) -> (actions, 3) (lose, push, win) rows for stand/hit/double.
+    mass: dict[float, float] = {}
+
+    def add(delta: float, prob: float) -> None:
+        if prob > 0:
+            mass[delta] = mass.get(delta, 0.0) + prob
+
+    for upcard_slot, upcard_prob in enumerate(card_probs):
+        for first, first_prob in enumerate(card_probs):
+            for second, second_prob in enumerate(card_probs):
+                prob = float(upcard_prob * first_prob * second_prob)
+                total, soft_aces = add_card_to_total(*add_card_to_total(0, 0, RANK_ORDER[first]), RANK_ORDER[second])
+                if total == 21:
+                    add(blackjack_payout, prob * (1.0 - dealer_blackjack[upcard_slot]))
+                    add(0.0, prob * dealer_blackjack[upcard_slot])
+                    continue
+                rows = cell(upcard_slot, total, 1 if soft_aces > 0 else 0)
+                # First maximum wins ties, matching StrategyTable.best_action.
+                action = int(np.argmax((rows[:, 2] - rows[:, 0]) * _STAKES))
+                lose, push, win = rows[action]
+                stake = float(_STAKES[action])
+                add(-stake, prob * lose)
+                add(0.0, prob * push)
+                add(stake, prob * win)
+
+    deltas = np.array(sorted(mass))
+    probs = np.array([mass[delta] for delta in deltas])
+    probs /= probs.sum()
+    deltas.setflags(write=False)
+    probs.setflags(write=False)
+    return deltas, probs
+
+
+@lru_cache(maxsize=64)
+def _round_outcomes(rule: DealerRule, blackjack_payout: float) -> tuple[np.ndarray, np.ndarray]:
+    table = get_strategy_table()
+
+    def cell(upcard_slot: int, total: int, soft: int) -> np.ndarray:
+        upcard = RANK_ORDER[upcard_slot]
+        return np.array([table.unit_outcome(total, soft, upcard, rule, action) for action in TABLE_ACTIONS])
+
+    card_probs = np.array([prob for _, prob in DRAW_OUTCOMES])
+    dealer_blackjack = np.array([_dealer_blackjack_prob(upcard) for upcard in RANK_ORDER])
+    return _round_mass(card_probs, dealer_blackjack, cell, blackjack_payout)
+
+
+@lru_cache(maxsize=4 * len(COUNT_BUCKETS))
+def _count_round_outcomes(rule: DealerRule, blackjack_payout: float, bucket: int) -> tuple[np.ndarray, np.ndarray]:
+    tables = get_count_tables()
+    outcomes = tables.outcomes[DEALER_RULES.index(rule), COUNT_BUCKETS.index(bucket)]
+    card_probs = tables.card_probs[COUNT_BUCKETS.index(bucket)]
+
+    def cell(upcard_slot: int, total: int, soft: int) -> np.ndarray:
+        return outcomes[upcard_slot, soft, total - MIN_COUNT_TOTAL]
+
+    dealer_blackjack = np.array([_dealer_blackjack_prob(upcard, float(bucket)) for upcard in RANK_ORDER])
+    return _round_mass(card_probs, dealer_blackjack, cell, blackjack_payout)
+
+
+def round_outcome_distribution(
+    rule: DealerRule | str, blackjack_payout: float = 1.5, true_count: float | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    # Net result of one round per unit of initial bet when every hand follows the EV table
+    # (double on any first decision). Returns sorted deltas and their probabilities.
+    # With a true count the round is a blend of the two neighbouring count buckets.
+    if blackjack_payout <= 0:
+        raise ValueError("blackjack_payout must be positive")
+    parsed_rule = _parse_rule(rule)
+    payout = float(blackjack_payout)
+    if true_count is None:
+        return _round_outcomes(parsed_rule, payout)
+    clamped = min(max(float(true_count), MIN_TRUE_COUNT), MAX_TRUE_COUNT)
+    lower = min(int(floor(clamped)), MAX_TRUE_COUNT - 1)
+    frac = clamped - lower
+    mass: dict[float, float] = {}
+    for bucket, weight in ((lower, 1.0 - frac), (lower + 1, frac)):
+        deltas, probs = _count_round_outcomes(parsed_rule, payout, bucket)
+        for delta, prob in zip(deltas.tolist(), probs.tolist()):
+            mass[delta] = mass.get(delta, 0.0) + weight * prob
+    deltas = np.array(sorted(mass))
+    return deltas, np.array([mass[delta] for delta in deltas])
+
+
+def round_house_edge(rule: DealerRule | str, blackjack_payout: float = 1.5) -> float:
+    deltas, probs = round_outcome_distribution(rule, blackjack_payout)
+    return -float(deltas @ probs)
+
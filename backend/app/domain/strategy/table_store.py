@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from . import composition, count_tables, dealer_markov, distribution, gt_blackjack, tables
+
+# File layout: MAGIC, then a little-endian u32 header length, a JSON header (format version,
+# rules, config hash, section directory) and the raw arrays, each aligned to ALIGNMENT bytes.
+# Workers map the file read-only, so every process shares the same physical pages.
+MAGIC = b"BJTABLE\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_LENGTH = struct.Struct("<I")
+# The code the tabulated numbers come from; a solver change must not be served from an old file.
+_SOLVER_MODULES = (composition, count_tables, dealer_markov, distribution, gt_blackjack, tables)
+
+
+@lru_cache(maxsize=1)
+def _solver_digest() -> str:
+    digest = hashlib.sha256()
+    for module in _SOLVER_MODULES:
+        with open(module.__file__, "rb") as handle:  # type: ignore[arg-type]
+            digest.update(handle.read())
+    return digest.hexdigest()
+
+
+def config_hash() -> str:
+    # Everything the tables are a function of; a file built under other inputs is ignored.
+    config = {
+        "format_version": FORMAT_VERSION,
+        "rules": list(dealer_markov.RULES),
+        "card_probs": [float(prob) for prob in dealer_markov.DEFAULT_CARD_PROBS],
+        "table_actions": list(tables.TABLE_ACTIONS),
+        "table_totals": [tables.MIN_TABLE_TOTAL, tables.MAX_TABLE_TOTAL],
+        "count_buckets": list(count_tables.COUNT_BUCKETS),
+        "count_actions": list(count_tables.COUNT_ACTIONS),
+        "solver": _solver_digest(),
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def _sections() -> dict[str, np.ndarray]:
+    strategy = tables.build_strategy_table()
+    counted = count_tables.build_count_tables()
+    return {
+        "strategy_probs": np.frombuffer(strategy.probs, dtype="<f8"),
+        "strategy_best": np.frombuffer(bytes(strategy.best), dtype=np.uint8),
+        "dealer": np.ascontiguousarray(dealer_markov.dealer_table(), dtype="<f8"),
+        "dealer_blackjack": np.ascontiguousarray(dealer_markov.dealer_blackjack_probs(), dtype="<f8"),
+        "count_outcomes": np.ascontiguousarray(counted.outcomes, dtype="<f8"),
+        "count_dealer": np.ascontiguousarray(counted.dealer, dtype="<f8"),
+        "count_card_probs": np.ascontiguousarray(counted.card_probs, dtype="<f8"),
+    }
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_table_file(path: str) -> dict[str, Any]:
+    arrays = _sections()
+    directory: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        directory[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = {"format_version": FORMAT_VERSION, "rules": list(dealer_markov.RULES), "config_hash": config_hash()}
+    # Offsets in the directory are relative to the data start, so the header length does not feed back.
+    blob = json.dumps({**header, "sections": directory}, sort_keys=True).encode()
+    data_start = _align(len(MAGIC) + _LENGTH.size + len(blob))
+
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp_path, "wb") as handle:
+        handle.write(MAGIC + _LENGTH.pack(len(blob)) + blob)
+        for name, array in arrays.items():
+            handle.seek(data_start + directory[name]["offset"])
+            handle.write(array.tobytes())
+        handle.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    return {**header, "path": path, "bytes": data_start + offset}
+
+
+def map_table_file(path: str) -> dict[str, np.ndarray] | None:
+    # Read-only views over the mapped file, or None if it is missing, foreign or stale.
+    try:
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    prefix = len(MAGIC) + _LENGTH.size
+    if len(mapped) < prefix or mapped[: len(MAGIC)] != MAGIC:
+        return None
+    (length,) = _LENGTH.unpack_from(mapped, len(MAGIC))
+    try:
+        header = json.loads(mapped[prefix : prefix + length])
+    except ValueError:
+        return None
+    if header.get("format_version") != FORMAT_VERSION or header.get("config_hash") != config_hash():
+        return None
+    data_start = _align(prefix + length)
+    views: dict[str, np.ndarray] = {}
+    for name, spec in header["sections"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        views[name] = np.frombuffer(
+            mapped, dtype=dtype, count=count, offset=data_start + spec["offset"]
+        ).reshape(spec["shape"])
+    return views
+
+
+def load_strategy_tables(path: str | None) -> bool:
+    # Install mapped tables if `path` holds a current file; otherwise build them in-process.
+    views = map_table_file(path) if path else None
+    if views is None:
+        tables.build_strategy_table()
+        count_tables.build_count_tables()
+        return False
+    dealer_markov.install_default_tables(views["dealer"], views["dealer_blackjack"])
+    tables.install_strategy_table(tables.StrategyTable.from_buffers(views["strategy_probs"], views["strategy_best"]))
+    count_tables.install_count_tables(
+        count_tables.CountTables.from_arrays(views["count_outcomes"], views["count_dealer"], views["count_card_probs"])
+    )
+    return True
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from .gt_blackjack import (
+    DEFAULT_MAX_SPLIT_HANDS,
+    DRAW_OUTCOMES,
+    CardDraw,
+    CardInput,
+    DealerRule,
+    OutcomeFormat,
+    PlayerStateInput,
+    _action_metrics,
+    _coerce_player_state,
+    _draw_then_stand_unit_outcome,
+    _hit_unit_outcome,
+    _infer_can_double,
+    _parse_card_token,
+    _parse_outcome_format,
+    _parse_rule,
+    _recommend,
+    _split_pair_card,
+    _stand_unit_outcome,
+    dealer_distribution,
+)
+from .distribution import OutcomeDistribution
+from .utility import parse_utility
+
+TABLE_ACTIONS: tuple[str, ...] = ("stand", "hit", "double")
+TABLE_RULES: tuple[DealerRule, ...] = ("S17", "H17")
+TABLE_UPCARDS: tuple[CardDraw, ...] = tuple(card for card, _ in DRAW_OUTCOMES)
+MIN_TABLE_TOTAL = 4
+MAX_TABLE_TOTAL = 21
+
+_TOTAL_SPAN = MAX_TABLE_TOTAL - MIN_TABLE_TOTAL + 1
+_UPCARD_INDEX: dict[CardDraw, int] = {card: idx for idx, card in enumerate(TABLE_UPCARDS)}
+_RULE_INDEX: dict[DealerRule, int] = {rule: idx for idx, rule in enumerate(TABLE_RULES)}
+# (lose, push, win) for each table action, in units of the original bet.
+_CELL_WIDTH = len(TABLE_ACTIONS) * 3
+_ACTION_STAKES: tuple[float, ...] = (1.0, 1.0, 2.0)
+
+
+def _cell_index(total: int, soft: int, upcard: CardDraw, rule: DealerRule) -> int:
+    return (((_RULE_INDEX[rule] * len(TABLE_UPCARDS) + _UPCARD_INDEX[upcard]) * 2 + soft) * _TOTAL_SPAN) + (
+        total - MIN_TABLE_TOTAL
+    )
+
+
+class StrategyTable:
+    # Flat (lose, push, win) probabilities per (rule, upcard, soft, total) cell plus the
+    # EV-best action with and without double, so lookups never compare EVs per request.
+
+    def __init__(self) -> None:
+        cells = len(TABLE_RULES) * len(TABLE_UPCARDS) * 2 * _TOTAL_SPAN
+        self.probs: Any = array("d", bytes(8 * cells * _CELL_WIDTH))
+        self.best: Any = bytearray(cells * 2)
+
+    @classmethod
+    def from_buffers(cls, probs: Any, best: Any) -> "StrategyTable":
+        # Wrap prebuilt (e.g. memory-mapped) buffers; memoryviews index to plain floats/ints.
+        table = cls.__new__(cls)
+        table.probs = memoryview(probs)
+        table.best = memoryview(best)
+        if len(table.probs) != len(TABLE_RULES) * len(TABLE_UPCARDS) * 2 * _TOTAL_SPAN * _CELL_WIDTH:
+            raise ValueError("Strategy table buffer has the wrong size")
+        return table
+
+    def build(self) -> "StrategyTable":
+        for rule in TABLE_RULES:
+            for upcard in TABLE_UPCARDS:
+                for soft in (0, 1):
+                    first_total = 12 if soft else MIN_TABLE_TOTAL
+                    for total in range(first_total, MAX_TABLE_TOTAL + 1):
+                        self._fill(total, soft, upcard, rule)
+        return self
+
+    def _fill(self, total: int, soft: int, upcard: CardDraw, rule: DealerRule) -> None:
+        idx = _cell_index(total, soft, upcard, rule)
+        per_action = (
+            _stand_unit_outcome(total, upcard, rule),
+            _hit_unit_outcome(total, soft, upcard, rule),
+            _draw_then_stand_unit_outcome(total, soft, upcard, rule),
+        )
+        base = idx * _CELL_WIDTH
+        evs: list[float] = []
+        for action_idx, (lose, push, win) in enumerate(per_action):
+            offset = base + action_idx * 3
+            self.probs[offset] = lose
+            self.probs[offset + 1] = push
+            self.probs[offset + 2] = win
+            evs.append((win - lose) * _ACTION_STAKES[action_idx])
+        self.best[idx * 2] = 0 if evs[0] >= evs[1] else 1
+        self.best[idx * 2 + 1] = max(range(len(evs)), key=lambda i: (evs[i], -i))
+
+    def covers(self, total: int, soft: int) -> bool:
+        if soft:
+            return 12 <= total <= MAX_TABLE_TOTAL
+        return MIN_TABLE_TOTAL <= total <= MAX_TABLE_TOTAL
+
+    def unit_outcome(
+        self, total: int, soft: int, upcard: CardDraw, rule: DealerRule, action: str
+    ) -> tuple[float, float, float]:
+        offset = _cell_index(total, soft, upcard, rule) * _CELL_WIDTH + TABLE_ACTIONS.index(action) * 3
+        return (self.probs[offset], self.probs[offset + 1], self.probs[offset + 2])
+
+    def best_action(self, total: int, soft: int, upcard: CardDraw, rule: DealerRule, can_double: bool) -> str:
+        idx = _cell_index(total, soft, upcard, rule)
+        return TABLE_ACTIONS[self.best[idx * 2 + (1 if can_double else 0)]]
+
+
+_TABLE: StrategyTable | None = None
+
+
+def build_strategy_table() -> StrategyTable:
+    global _TABLE
+    _TABLE = StrategyTable().build()
+    return _TABLE
+
+
+def install_strategy_table(table: StrategyTable) -> None:
+    global _TABLE
+    _TABLE = table
+
+
+def get_strategy_table() -> StrategyTable:
+    if _TABLE is None:
+        return build_strategy_table()
+    return _TABLE
+
+
+def lookup_decision_state(
+    player_state: PlayerStateInput,
+    dealer_upcard: CardInput,
+    bet: int,
+    bankroll: int,
+    rule: DealerRule | str,
+    can_double: bool | None = None,
+    infer_can_double: bool = False,
+    risk_lambda: float = 1.0,
+    outcome_format: OutcomeFormat | str = "entries",
+    can_split: bool | None = None,
+    max_split_hands: int = DEFAULT_MAX_SPLIT_HANDS,
+    double_after_split: bool = True,
+) -> dict[str, Any] | None:
+    # Same response as analyze_decision_state with the default sqrt utility; None means the
+    # caller should use the full analysis.
+    parsed_rule = _parse_rule(rule)
+    parsed_outcome_format = _parse_outcome_format(outcome_format)
+    player_total, player_soft_aces = _coerce_player_state(player_state)
+    parsed_upcard = _parse_card_token(dealer_upcard)
+    soft = 1 if player_soft_aces > 0 else 0
+    utility_name, utility_param = parse_utility("sqrt")
+    table = get_strategy_table()
+    if bet <= 0 or not table.covers(player_total, soft):
+        return None
+    # Split EVs are not tabulated.
+    if _split_pair_card(player_state, bet, bankroll, can_split, infer_can_double) is not None:
+        return None
+
+    if can_double is None:
+        allow_double = _infer_can_double(player_state, bet, bankroll, infer_can_double)
+    else:
+        allow_double = bool(can_double)
+
+    actions: dict[str, dict[str, Any]] = {}
+    for action_name, stake_units in zip(TABLE_ACTIONS, _ACTION_STAKES):
+        outcomes: OutcomeDistribution | None = None
+        if action_name != "double" or allow_double:
+            lose, push, win = table.unit_outcome(player_total, soft, parsed_upcard, parsed_rule, action_name)
+            outcomes = OutcomeDistribution.from_lose_push_win(bet, lose, push, win, multiplier=int(stake_units))
+        actions[action_name] = _action_metrics(outcomes, bankroll, risk_lambda, parsed_outcome_format)
+    actions["split"] = _action_metrics(None, bankroll, risk_lambda, parsed_outcome_format)
+
+    recommendations = {
+        "ev_maximizer": table.best_action(player_total, soft, parsed_upcard, parsed_rule, allow_double),
+        "risk_averse": _recommend(actions, "utility_score"),
+        "security_level": _recommend(actions, "security_score"),
+    }
+
+    return {
+        "inputs": {
+            "player_total": player_total,
+            "player_soft_aces": player_soft_aces,
+            "dealer_upcard": "A" if parsed_upcard == "A" else int(parsed_upcard),
+            "bet": int(bet),
+            "bankroll": int(bankroll),
+            "rule": parsed_rule,
+            "can_double": allow_double,
+            "risk_lambda": float(risk_lambda),
+            "hit_mode": "optimal",
+            "outcome_format": parsed_outcome_format,
+            "can_split": False,
+            "max_split_hands": int(max_split_hands),
+            "double_after_split": bool(double_after_split),
+            "extra_actions": [],
+            "true_count": None,
+            "utility": utility_name,
+            "utility_param": utility_param,
+        },
+        "dealer_distribution": dealer_distribution(parsed_upcard, parsed_rule),
+        "actions": actions,
+        "recommendations": recommendations,
+    }
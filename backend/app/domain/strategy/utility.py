@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Callable, Literal
+
+import numpy as np
+
+UtilityName = Literal["sqrt", "log", "crra", "cara"]
+UtilityFn = Callable[[np.ndarray], np.ndarray]
+
+# Log and CRRA (gamma >= 1) diverge at zero wealth; a busted bankroll counts as one chip.
+WEALTH_FLOOR = 1.0
+
+
+def _sqrt(_param: float) -> UtilityFn:
+    return np.sqrt
+
+
+def _log(_param: float) -> UtilityFn:
+    return lambda wealth: np.log(np.maximum(wealth, WEALTH_FLOOR))
+
+
+def _crra(gamma: float) -> UtilityFn:
+    if gamma < 0:
+        raise ValueError("CRRA gamma must be non-negative")
+    if gamma == 1.0:
+        return _log(gamma)
+    power = 1.0 - gamma
+    return lambda wealth: (np.maximum(wealth, WEALTH_FLOOR) ** power - 1.0) / power
+
+
+def _cara(alpha: float) -> UtilityFn:
+    # -exp(-alpha * w) rather than 1 - exp(...): no saturation at 1.0 for large bankrolls.
+    if alpha <= 0:
+        raise ValueError("CARA alpha must be positive")
+    return lambda wealth: -np.exp(-alpha * wealth)
+
+
+# name -> (default parameter, builder). The parameter is gamma for CRRA and alpha for CARA.
+UTILITIES: dict[str, tuple[float, Callable[[float], UtilityFn]]] = {
+    "sqrt": (0.0, _sqrt),
+    "log": (0.0, _log),
+    "crra": (2.0, _crra),
+    "cara": (0.01, _cara),
+}
+
+
+def parse_utility(name: str, param: float | None = None) -> tuple[UtilityName, float]:
+    lower = str(name).strip().lower()
+    if lower not in UTILITIES:
+        raise ValueError(f"Invalid utility: {name}")
+    default, builder = UTILITIES[lower]
+    value = default if param is None or lower in {"sqrt", "log"} else float(param)
+    builder(value)  # validates the parameter
+    return lower, value  # type: ignore[return-value]
+
+
+def utility_function(name: str, param: float | None = None) -> UtilityFn:
+    parsed, value = parse_utility(name, param)
+    return UTILITIES[parsed][1](value)
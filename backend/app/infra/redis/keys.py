@@ -33,6 +33,10 @@ def table_shoe_meta(tid: str) -> str:
     return f"bj:table:{tid}:shoe:meta"
 
 
+def table_count(tid: str) -> str:
+    return f"bj:table:{tid}:count"
+
+
 def table_vote(tid: str, round_id: int) -> str:
     return f"bj:table:{tid}:vote:{round_id}"
 
@@ -2,8 +2,11 @@ import json
 from typing import Any, Dict, Optional
 
 from redis import Redis
+from redis.exceptions import ResponseError
 
 from app.config import settings
+from app.domain.rules.blackjack_rules import Hand, card_code, card_names, shoe_order
+from app.domain.rules.counting import COUNT_RANKS, count_rank, count_state, full_shoe_histogram, hi_lo
 from app.infra.redis import keys
 from app.utils.ids import new_id
 from app.utils.time import utc_ms
@@ -236,24 +239,25 @@ def get_snapshot(redis: Redis, tid: str) -> Dict[str, Any]:
             "VOTE_CONTINUE",
             "SESSION_ENDED",
         } and not can_reveal_dealer:
-            raw = dealer_hand.get("cards")
-            try:
-                cards = json.loads(raw) if raw else []
-            except Exception:
-                cards = []
-            public_cards = cards[:1]
+            public_cards = _unpack_cards(dealer_hand.get("cards"))[:1]
             dealer_hand = {
-                "cards": json.dumps(public_cards),
+                "cards": json.dumps(card_names(public_cards)),
                 "total": "",
                 "is_soft": "",
                 "face_down": 1,
             }
+        elif dealer_hand:
+            dealer_hand = {**dealer_hand, "cards": json.dumps(card_names(_unpack_cards(dealer_hand.get("cards"))))}
+    public_round_state: Dict[str, Any] = {}
+    count = get_count(redis, tid)
+    if count is not None:
+        public_round_state["count"] = count
     return {
         "meta": meta,
         "seats": seats,
         "players": players,
         "dealer_hand": dealer_hand,
-        "public_round_state": {},
+        "public_round_state": public_round_state,
     }
 
 
@@ -314,15 +318,61 @@ def clear_bets(redis: Redis, tid: str) -> None:
         )
 
 
-def save_shoe(redis: Redis, tid: str, cards: list[str]) -> None:
-    redis.set(keys.table_shoe(tid), json.dumps(cards))
+def save_shoe(redis: Redis, tid: str, seed: int, decks: int) -> None:
+    # The shoe is a seed into a deterministic shuffle plus a cursor; cards are derived on draw.
+    key = keys.table_shoe(tid)
+    pipe = redis.pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping={"seed": seed, "decks": decks, "cursor": 0})
+    pipe.execute()
 
 
-def load_shoe(redis: Redis, tid: str) -> list[str]:
-    raw = redis.get(keys.table_shoe(tid))
-    if not raw:
+def _shoe_fields(redis: Redis, tid: str) -> Optional[tuple[int, int, int]]:
+    try:
+        seed, decks, cursor = redis.hmget(keys.table_shoe(tid), "seed", "decks", "cursor")
+    except ResponseError:
+        # Shoe saved as a card list before the seeded layout; drop it so a fresh one is dealt.
+        redis.delete(keys.table_shoe(tid))
+        return None
+    if seed is None or not decks:
+        return None
+    return int(seed), int(decks), int(cursor or 0)
+
+
+def load_shoe(redis: Redis, tid: str) -> list[int]:
+    fields = _shoe_fields(redis, tid)
+    if fields is None:
         return []
-    return json.loads(raw)
+    seed, decks, cursor = fields
+    return list(shoe_order(seed, decks)[cursor:])
+
+
+def shoe_remaining(redis: Redis, tid: str) -> int:
+    fields = _shoe_fields(redis, tid)
+    if fields is None:
+        return 0
+    _, decks, cursor = fields
+    return max(0, 52 * decks - cursor)
+
+
+def draw_cards(redis: Redis, tid: str, count: int) -> list[int]:
+    # Advances the cursor atomically in one round trip; returns fewer than `count` cards if the shoe runs out.
+    if count <= 0:
+        return []
+    key = keys.table_shoe(tid)
+    pipe = redis.pipeline()
+    pipe.hincrby(key, "cursor", count)
+    pipe.hmget(key, "seed", "decks")
+    try:
+        end, (seed, decks) = pipe.execute()
+    except ResponseError:
+        redis.delete(key)
+        return []
+    if seed is None or not decks:
+        return []
+    cards = list(shoe_order(int(seed), int(decks))[end - count : end])
+    note_drawn(redis, tid, card_names(cards))
+    return cards
 
 
 def set_shoe_meta(redis: Redis, tid: str, updates: Dict[str, Any]) -> None:
@@ -335,22 +385,101 @@ def get_shoe_meta(redis: Redis, tid: str) -> Dict[str, Any]:
     return redis.hgetall(keys.table_shoe_meta(tid))
 
 
-def save_hand(redis: Redis, tid: str, hand_id: str, cards: list[str], total: int, is_soft: bool) -> None:
+# p:<rank> holds cards drawn from the current shoe that are not public yet. A card is only
+# counted against one of them, so cards dealt from a shoe that was replaced mid-round never
+# reach the new shoe's count.
+_APPLY_COUNT_SCRIPT = """
+if redis.call("exists", KEYS[1]) == 0 then
+    return 0
+end
+local applied = 0
+for i = 1, #ARGV, 2 do
+    local rank = ARGV[i]
+    if tonumber(redis.call("hget", KEYS[1], "p:" .. rank) or "0") > 0 then
+        redis.call("hincrby", KEYS[1], "p:" .. rank, -1)
+        redis.call("hincrby", KEYS[1], "r:" .. rank, -1)
+        redis.call("hincrby", KEYS[1], "remaining", -1)
+        redis.call("hincrby", KEYS[1], "running", ARGV[i + 1])
+        applied = applied + 1
+    end
+end
+return applied
+"""
+
+
+def reset_count(redis: Redis, tid: str, decks: int) -> None:
+    mapping: Dict[str, Any] = {"running": 0, "remaining": 52 * decks}
+    mapping.update({f"r:{rank}": count for rank, count in full_shoe_histogram(decks).items()})
+    mapping.update({f"p:{rank}": 0 for rank in COUNT_RANKS})
+    redis.hset(keys.table_count(tid), mapping=mapping)
+
+
+def note_drawn(redis: Redis, tid: str, cards: list[str]) -> None:
+    if not cards:
+        return
+    key = keys.table_count(tid)
+    if not redis.exists(key):
+        return
+    pipe = redis.pipeline()
+    for card in cards:
+        pipe.hincrby(key, f"p:{count_rank(card)}", 1)
+    pipe.execute()
+
+
+def apply_count(redis: Redis, tid: str, cards: list[str]) -> int:
+    # Incremental update from newly visible cards; never rescans the shoe or the stream.
+    if not cards:
+        return 0
+    args: list[Any] = []
+    for card in cards:
+        args.extend((count_rank(card), hi_lo(card)))
+    return int(redis.eval(_APPLY_COUNT_SCRIPT, 1, keys.table_count(tid), *args))
+
+
+def get_count(redis: Redis, tid: str) -> Dict[str, Any] | None:
+    raw = redis.hgetall(keys.table_count(tid))
+    if not raw:
+        return None
+    histogram = {rank: int(raw.get(f"r:{rank}", 0) or 0) for rank in COUNT_RANKS}
+    return count_state(int(raw.get("running", 0) or 0), int(raw.get("remaining", 0) or 0), histogram)
+
+
+def _unpack_cards(raw: Optional[str | bytes]) -> list[int]:
+    if not raw:
+        return []
+    if isinstance(raw, bytes):
+        return list(raw)
+    if raw.startswith("["):
+        # Hand saved as a JSON list of display strings before cards were packed.
+        return [card_code(card) for card in json.loads(raw)]
+    # Codes are all below 0x80, so the packed bytes survive decode_responses unchanged.
+    return list(raw.encode("ascii"))
+
+
+def save_hand(redis: Redis, tid: str, hand_id: str, hand: Hand) -> None:
     redis.hset(
         keys.table_hand(tid, hand_id),
         mapping={
-            "cards": json.dumps(cards),
-            "total": total,
-            "is_soft": int(is_soft),
+            "cards": bytes(hand.cards),
+            "total": hand.total,
+            "is_soft": int(hand.is_soft),
+            "soft_aces": hand.soft_aces,
+            "is_blackjack": int(hand.is_blackjack),
         },
     )
 
 
-def load_hand_cards(redis: Redis, tid: str, hand_id: str) -> list[str]:
-    raw = redis.hget(keys.table_hand(tid, hand_id), "cards")
-    if not raw:
-        return []
-    return json.loads(raw)
+def load_hand(redis: Redis, tid: str, hand_id: str) -> Hand:
+    raw, total, soft_aces = redis.hmget(keys.table_hand(tid, hand_id), "cards", "total", "soft_aces")
+    cards = _unpack_cards(raw)
+    if soft_aces is None or total is None:
+        # Hashes written before the running state was stored; rebuild once from the cards.
+        return Hand(cards)
+    return Hand.restore(bytes(cards), int(total), int(soft_aces))
+
+
+def load_hand_cards(redis: Redis, tid: str, hand_id: str) -> list[int]:
+    return _unpack_cards(redis.hget(keys.table_hand(tid, hand_id), "cards"))
 
 
 def cast_vote(redis: Redis, tid: str, round_id: int, pid: str, vote: str) -> None:
@@ -394,6 +523,7 @@ def clear_table(redis: Redis, tid: str) -> None:
         keys.table_ready(tid),
         keys.table_shoe(tid),
         keys.table_shoe_meta(tid),
+        keys.table_count(tid),
         keys.table_events(tid),
         keys.table_vote(tid, round_id),
     )
@@ -30,6 +30,14 @@ async def lifespan(app: FastAPI):
         advance_turn_start,
     )
     from app.api.ws import blackjack as ws_module
+    from app.domain.strategy.table_store import load_strategy_tables
+    from app.services.shoe_pool import get_shoe_pool, shutdown_shoe_pool
+    from app.services.strategy_executor import get_strategy_executor, shutdown_strategy_executor
+
+    if not load_strategy_tables(settings.strategy_table_path) and settings.strategy_table_path:
+        logger.warning("strategy table file %s missing or stale; built tables in-process", settings.strategy_table_path)
+    get_strategy_executor().start()
+    get_shoe_pool().start([settings.shoe_decks])
 
     async def _loop() -> None:
         redis = get_redis()
@@ -101,6 +109,8 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         task.cancel()
+        shutdown_strategy_executor()
+        shutdown_shoe_pool()
 
 
 app = FastAPI(title="Distributed Blackjack", lifespan=lifespan)
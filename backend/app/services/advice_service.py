@@ -0,0 +1,102 @@
+import json
+from typing import Any, Dict, Hashable
+
+from redis import Redis
+from starlette.concurrency import run_in_threadpool
+
+from app.domain.rules.blackjack_rules import card_name
+from app.domain.strategy.cache import LRUCache
+from app.domain.strategy.gt_blackjack import _parse_card_token, analyze_decision_state
+from app.infra.redis import repo
+from app.services.strategy_executor import get_strategy_executor
+
+ADVICE_CACHE_SIZE = 2048
+
+# Keyed by the normalized hand state, so repeated ADVISE during one turn skips the executor.
+_advice_cache: LRUCache[Dict[str, Any]] = LRUCache(ADVICE_CACHE_SIZE)
+
+
+def load_advice_request(
+    redis: Redis, tid: str, pid: str, risk_lambda: float = 1.0, use_count: bool = False
+) -> Dict[str, Any]:
+    # Plain reads without the table lock: advice is a read-only view of the current turn.
+    meta = repo.get_meta(redis, tid)
+    if meta.get("phase") != "PLAYER_TURNS":
+        raise ValueError("Advice is only available during player turns")
+    rule = str(meta.get("dealer_soft_17_rule") or "")
+    if rule not in {"S17", "H17"}:
+        raise ValueError("Dealer rule not set for this round")
+    player = repo.get_player(redis, tid, pid)
+    hand_ids = json.loads(player.get("hand_ids") or "[]")
+    if not hand_ids:
+        raise ValueError("No active hand")
+    hand = repo.load_hand(redis, tid, hand_ids[0])
+    dealer_hand_id = meta.get("dealer_hand_id")
+    dealer_cards = repo.load_hand_cards(redis, tid, dealer_hand_id) if dealer_hand_id else []
+    if len(hand) < 2 or not dealer_cards:
+        raise ValueError("Hand not dealt yet")
+
+    bet = int(player.get("bet", "0") or 0)
+    bankroll = int(player.get("bankroll", "0") or 0)
+    count = repo.get_count(redis, tid) if use_count else None
+    return {
+        "hand_id": hand_ids[0],
+        "total": hand.total,
+        "soft_aces": hand.soft_aces,
+        "card_count": len(hand),
+        "dealer_upcard": card_name(dealer_cards[0]),
+        "rule": rule,
+        "bet": bet,
+        "bankroll": bankroll,
+        # Mirrors handle_action: the placed bet is already off the bankroll.
+        "can_double": len(hand) == 2 and 0 < bet <= bankroll,
+        "risk_lambda": float(risk_lambda),
+        "true_count": count["true_count"] if count else None,
+    }
+
+
+def advice_key(request: Dict[str, Any]) -> Hashable:
+    return (
+        request["total"],
+        request["soft_aces"],
+        request["card_count"],
+        _parse_card_token(request["dealer_upcard"]),
+        request["rule"],
+        request["bet"],
+        request["bankroll"],
+        request["can_double"],
+        request["risk_lambda"],
+        request["true_count"],
+    )
+
+
+def compute_advice(request: Dict[str, Any]) -> Dict[str, Any]:
+    # The game has no split or surrender, so advice is limited to the actions a player can send.
+    # The stored hand state goes straight to the engine, so the cards are not parsed again.
+    return analyze_decision_state(
+        player_state={key: request[key] for key in ("total", "soft_aces", "card_count")},
+        dealer_upcard=request["dealer_upcard"],
+        bet=request["bet"],
+        bankroll=request["bankroll"],
+        rule=request["rule"],
+        can_double=request["can_double"],
+        risk_lambda=request["risk_lambda"],
+        can_split=False,
+        true_count=request["true_count"],
+    )
+
+
+async def handle_advise(
+    redis: Redis, tid: str, pid: str, risk_lambda: float = 1.0, use_count: bool = False
+) -> Dict[str, Any]:
+    request = await run_in_threadpool(load_advice_request, redis, tid, pid, risk_lambda, use_count)
+    key = advice_key(request)
+    advice = _advice_cache.get(key)
+    if advice is None:
+        advice = await get_strategy_executor().run(compute_advice, request)
+        _advice_cache.put(key, advice)
+    return {"hand_id": request["hand_id"], "advice": advice}
+
+
+def advice_cache_info() -> Dict[str, Any]:
+    return _advice_cache.info()
@@ -5,9 +5,10 @@ from typing import Any, Callable, Dict, List, Tuple
 from redis import Redis
 
 from app.config import settings
-from app.domain.rules.blackjack_rules import hand_value, new_shoe
+from app.domain.rules.blackjack_rules import Hand, card_name, card_names
 from app.infra.redis import repo
 from app.infra.redis.locks import table_lock
+from app.services.shoe_pool import get_shoe_pool
 from app.utils.ids import new_id
 from app.utils.time import utc_ms
 
@@ -144,50 +145,35 @@ def _ensure_shoe(redis: Redis, tid: str) -> None:
     reshuffle_pct = _meta_float(
         meta, "reshuffle_when_remaining_pct", settings.reshuffle_when_remaining_pct
     )
-    shoe = repo.load_shoe(redis, tid)
-    if not shoe:
-        shoe = new_shoe(shoe_decks)
-        repo.save_shoe(redis, tid, shoe)
-        repo.set_shoe_meta(
-            redis,
-            tid,
-            {
-                "decks": shoe_decks,
-                "cut_index": int(len(shoe) * reshuffle_pct),
-                "needs_shuffle": 0,
-            },
-        )
-        return
-
-    meta = repo.get_shoe_meta(redis, tid)
-    cut_index = int(meta.get("cut_index", 0) or 0)
-    if len(shoe) <= cut_index:
-        shoe = new_shoe(shoe_decks)
-        repo.save_shoe(redis, tid, shoe)
-        repo.set_shoe_meta(
-            redis,
-            tid,
-            {
-                "decks": shoe_decks,
-                "cut_index": int(len(shoe) * reshuffle_pct),
-                "needs_shuffle": 0,
-            },
-        )
+    remaining = repo.shoe_remaining(redis, tid)
+    if remaining:
+        cut_index = int(repo.get_shoe_meta(redis, tid).get("cut_index", 0) or 0)
+        if remaining > cut_index:
+            return
+
+    repo.save_shoe(redis, tid, get_shoe_pool().take(shoe_decks), shoe_decks)
+    repo.reset_count(redis, tid, shoe_decks)
+    repo.set_shoe_meta(
+        redis,
+        tid,
+        {
+            "decks": shoe_decks,
+            "cut_index": int(52 * shoe_decks * reshuffle_pct),
+            "needs_shuffle": 0,
+        },
+    )
 
 
-def _draw_card(redis: Redis, tid: str) -> str:
-    shoe = repo.load_shoe(redis, tid)
-    if not shoe:
+def _draw_cards(redis: Redis, tid: str, count: int) -> List[int]:
+    cards = repo.draw_cards(redis, tid, count)
+    if len(cards) < count:
         _ensure_shoe(redis, tid)
-        shoe = repo.load_shoe(redis, tid)
-    card = shoe.pop()
-    repo.save_shoe(redis, tid, shoe)
-    return card
+        cards += repo.draw_cards(redis, tid, count - len(cards))
+    return cards
 
 
-def _set_hand(redis: Redis, tid: str, hand_id: str, cards: List[str]) -> None:
-    total, is_soft = hand_value(cards)
-    repo.save_hand(redis, tid, hand_id, cards, total, is_soft)
+def _draw_card(redis: Redis, tid: str) -> int:
+    return _draw_cards(redis, tid, 1)[0]
 
 
 def _emit(emit: Callable[[str, Dict], None] | None, event_type: str, payload: Dict) -> None:
@@ -443,12 +429,14 @@ def deal_initial(
     _emit(emit, "DEAL_STARTED", {"deal_started_ts": deal_started_ts})
     seat_order = [seat for seat, _ in betting_seats]
     seat_rank = {seat: idx for idx, seat in enumerate(seat_order)}
+    # The whole deal comes off the shoe in one round trip, handed out in the order above.
+    dealt = iter(_draw_cards(redis, tid, 2 * len(betting_seats) + 2))
     for seat, pid in betting_seats:
         hand_id = new_id()
         seat = seat or repo.get_seat_for_player(redis, tid, pid)
-        card1 = _draw_card(redis, tid)
-        hands[pid] = {"hand_id": hand_id, "seat": seat, "cards": [card1]}
-        _set_hand(redis, tid, hand_id, [card1])
+        card1 = next(dealt)
+        hands[pid] = {"hand_id": hand_id, "seat": seat, "hand": Hand([card1])}
+        repo.save_hand(redis, tid, hand_id, hands[pid]["hand"])
         repo.set_player_hand_ids(redis, tid, pid, [hand_id])
         seq = seat_rank.get(seat, 0)
         _emit(
@@ -459,7 +447,7 @@ def deal_initial(
                 "seat": seat,
                 "hand_id": hand_id,
                 "card_index": 0,
-                "card": card1,
+                "card": card_name(card1),
                 "face_down": False,
                 "deal_started_ts": deal_started_ts,
                 "deal_seq": seq,
@@ -468,8 +456,9 @@ def deal_initial(
         )
 
     dealer_hand_id = new_id()
-    dealer_up = _draw_card(redis, tid)
-    _set_hand(redis, tid, dealer_hand_id, [dealer_up])
+    dealer_up = next(dealt)
+    dealer = Hand([dealer_up])
+    repo.save_hand(redis, tid, dealer_hand_id, dealer)
     repo.set_meta(
         redis,
         tid,
@@ -482,7 +471,7 @@ def deal_initial(
         "CARD_DEALT",
         {
             "to": "dealer",
-            "card": dealer_up,
+            "card": card_name(dealer_up),
             "face_down": False,
             "deal_started_ts": deal_started_ts,
             "deal_seq": len(betting_seats),
@@ -496,11 +485,8 @@ def deal_initial(
             continue
         hand_id = hand["hand_id"]
         seat = hand["seat"]
-        cards = list(hand["cards"])
-        card2 = _draw_card(redis, tid)
-        cards.append(card2)
-        hand["cards"] = cards
-        _set_hand(redis, tid, hand_id, cards)
+        card2 = next(dealt)
+        repo.save_hand(redis, tid, hand_id, hand["hand"].add(card2))
         seq = len(betting_seats) + 1 + seat_rank.get(seat, 0)
         _emit(
             emit,
@@ -510,7 +496,7 @@ def deal_initial(
                 "seat": seat,
                 "hand_id": hand_id,
                 "card_index": 1,
-                "card": card2,
+                "card": card_name(card2),
                 "face_down": False,
                 "deal_started_ts": deal_started_ts,
                 "deal_seq": seq,
@@ -518,8 +504,8 @@ def deal_initial(
             },
         )
 
-    dealer_hole = _draw_card(redis, tid)
-    _set_hand(redis, tid, dealer_hand_id, [dealer_up, dealer_hole])
+    dealer_hole = next(dealt)
+    repo.save_hand(redis, tid, dealer_hand_id, dealer.add(dealer_hole))
     _emit(
         emit,
         "CARD_DEALT",
@@ -619,13 +605,12 @@ def handle_action(
         if not hand_id:
             raise ValueError("No active hand")
 
-        cards = repo.load_hand_cards(redis, tid, hand_id)
+        hand = repo.load_hand(redis, tid, hand_id)
         seat = repo.get_seat_for_player(redis, tid, pid)
         _emit(emit, "PLAYER_ACTION", {"player_id": pid, "seat": seat, "action": action})
         if action == "hit":
             new_card = _draw_card(redis, tid)
-            cards.append(new_card)
-            _set_hand(redis, tid, hand_id, cards)
+            repo.save_hand(redis, tid, hand_id, hand.add(new_card))
             _emit(
                 emit,
                 "CARD_DEALT",
@@ -633,16 +618,15 @@ def handle_action(
                     "to": "player",
                     "seat": seat,
                     "hand_id": hand_id,
-                    "card_index": len(cards) - 1,
-                    "card": new_card,
+                    "card_index": len(hand) - 1,
+                    "card": card_name(new_card),
                     "face_down": False,
                     "deal_started_ts": utc_ms() + DEAL_GAP_MS,
                     "deal_seq": 0,
                     "deal_gap_ms": DEAL_GAP_MS,
                 },
             )
-            total, _ = hand_value(cards)
-            if total > 21:
+            if hand.is_bust:
                 bust_due_ts = utc_ms() + BUST_REVEAL_DELAY_MS
                 repo.set_meta(
                     redis,
@@ -669,7 +653,7 @@ def handle_action(
         if action == "stand":
             return _advance_turn(redis, tid, seat, emit)
         if action == "double":
-            if len(cards) != 2:
+            if len(hand) != 2:
                 raise ValueError("Double down only allowed on first decision")
             bet = int(player.get("bet", "0") or 0)
             if bet <= 0:
@@ -856,8 +840,8 @@ def advance_double_pending(
             )
             return repo.get_snapshot(redis, tid)
 
-        cards = repo.load_hand_cards(redis, tid, hand_id)
-        if not cards:
+        hand = repo.load_hand(redis, tid, hand_id)
+        if not hand:
             repo.set_meta(
                 redis,
                 tid,
@@ -874,8 +858,7 @@ def advance_double_pending(
             return _advance_turn(redis, tid, seat, emit)
 
         new_card = _draw_card(redis, tid)
-        cards.append(new_card)
-        _set_hand(redis, tid, hand_id, cards)
+        repo.save_hand(redis, tid, hand_id, hand.add(new_card))
         _emit(
             emit,
             "CARD_DEALT",
@@ -883,8 +866,8 @@ def advance_double_pending(
                 "to": "player",
                 "seat": seat,
                 "hand_id": hand_id,
-                "card_index": len(cards) - 1,
-                "card": new_card,
+                "card_index": len(hand) - 1,
+                "card": card_name(new_card),
                 "face_down": False,
                 "deal_started_ts": utc_ms() + DEAL_GAP_MS,
                 "deal_seq": 0,
@@ -905,8 +888,7 @@ def advance_double_pending(
             },
         )
 
-        total, _ = hand_value(cards)
-        if total > 21:
+        if hand.is_bust:
             bust_due_ts = utc_ms() + BUST_REVEAL_DELAY_MS
             repo.set_meta(
                 redis,
@@ -1036,7 +1018,7 @@ def advance_dealer(
         if not dealer_hand_id:
             dealer_hand_id = new_id()
             repo.set_meta(redis, tid, {"dealer_hand_id": dealer_hand_id})
-        dealer_cards = repo.load_hand_cards(redis, tid, dealer_hand_id) or []
+        dealer = repo.load_hand(redis, tid, dealer_hand_id)
 
         timeline = {"deal_started_ts": now + DEALER_ANIM_DELAY_MS, "deal_seq": 0, "deal_gap_ms": DEALER_GAP_MS}
 
@@ -1054,8 +1036,8 @@ def advance_dealer(
             return repo.get_snapshot(redis, tid)
 
         if step == "REVEAL_WAIT":
-            if dealer_cards:
-                _emit(emit, "DEALER_REVEAL_HOLE", {"cards": dealer_cards, **timeline})
+            if dealer:
+                _emit(emit, "DEALER_REVEAL_HOLE", {"cards": card_names(dealer.cards), **timeline})
             repo.set_meta(
                 redis,
                 tid,
@@ -1068,20 +1050,19 @@ def advance_dealer(
             )
             return repo.get_snapshot(redis, tid)
 
-        total, is_soft = hand_value(dealer_cards)
-        if total > 21:
+        total = dealer.total
+        if dealer.is_bust:
             _emit(emit, "DEALER_ACTION", {"action": "bust", "total": total, **timeline})
-            return _settle_after_dealer(redis, tid, dealer_cards, emit)
+            return _settle_after_dealer(redis, tid, dealer, emit)
 
-        should_draw = total < 17 or (total == 17 and is_soft and dealer_rule == "H17")
+        should_draw = total < 17 or (total == 17 and dealer.is_soft and dealer_rule == "H17")
         if should_draw:
             new_card = _draw_card(redis, tid)
-            dealer_cards.append(new_card)
-            _set_hand(redis, tid, dealer_hand_id, dealer_cards)
+            repo.save_hand(redis, tid, dealer_hand_id, dealer.add(new_card))
             _emit(
                 emit,
                 "DEALER_ACTION",
-                {"action": "draw", "card": new_card, "total": hand_value(dealer_cards)[0], **timeline},
+                {"action": "draw", "card": card_name(new_card), "total": dealer.total, **timeline},
             )
             repo.set_meta(
                 redis,
@@ -1095,15 +1076,15 @@ def advance_dealer(
             return repo.get_snapshot(redis, tid)
 
         _emit(emit, "DEALER_ACTION", {"action": "stand", "total": total, **timeline})
-        return _settle_after_dealer(redis, tid, dealer_cards, emit)
+        return _settle_after_dealer(redis, tid, dealer, emit)
 
 
 def _settle_after_dealer(
-    redis: Redis, tid: str, dealer_cards: list[str], emit: Callable[[str, Dict], None] | None = None
+    redis: Redis, tid: str, dealer: Hand, emit: Callable[[str, Dict], None] | None = None
 ) -> Dict:
     dealer_hand_id = repo.get_meta(redis, tid).get("dealer_hand_id")
     if dealer_hand_id:
-        _set_hand(redis, tid, dealer_hand_id, dealer_cards)
+        repo.save_hand(redis, tid, dealer_hand_id, dealer)
 
     repo.set_meta(
         redis,
@@ -1128,8 +1109,8 @@ def _settle_after_dealer(
         },
     )
     _emit(emit, "PHASE_CHANGED", {"phase": "SETTLE"})
-    dealer_total, _ = hand_value(dealer_cards)
-    dealer_blackjack = dealer_total == 21 and len(dealer_cards) == 2
+    dealer_total = dealer.total
+    dealer_blackjack = dealer.is_blackjack
 
     players = repo.get_all_players(redis, tid)
     for pid, pdata in players.items():
@@ -1143,9 +1124,9 @@ def _settle_after_dealer(
         if not hand_ids:
             continue
         hand_id = hand_ids[0]
-        player_cards = repo.load_hand_cards(redis, tid, hand_id)
-        player_total, _ = hand_value(player_cards)
-        player_blackjack = player_total == 21 and len(player_cards) == 2
+        player_hand = repo.load_hand(redis, tid, hand_id)
+        player_total = player_hand.total
+        player_blackjack = player_hand.is_blackjack
 
         payout = 0
         reason = "LOSE"
@@ -1221,9 +1202,9 @@ def advance_settle(
             hand_id = hand_ids[0]
             player_cards = repo.load_hand_cards(redis, tid, hand_id)
             seat = repo.get_seat_for_player(redis, tid, pid)
-            reveals.append({"seat": seat, "cards": player_cards})
+            reveals.append({"seat": seat, "cards": card_names(player_cards)})
 
-        _emit(emit, "HANDS_REVEALED", {"dealer": dealer_cards, "players": reveals})
+        _emit(emit, "HANDS_REVEALED", {"dealer": card_names(dealer_cards), "players": reveals})
 
         repo.clear_hands(redis, tid)
         repo.clear_bets(redis, tid)
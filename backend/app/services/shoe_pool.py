@@ -0,0 +1,94 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable
+
+from app.config import settings
+from app.domain.rules.blackjack_rules import new_shoe_seed, shoe_order
+
+logger = logging.getLogger(__name__)
+
+
+class ShoePool:
+    # Seeds whose shuffled order is already in the shoe_order cache, kept per deck count. A
+    # reshuffle takes one, so the shuffle itself never runs under the table lock.
+
+    def __init__(self, size: int = 2) -> None:
+        self.size = max(0, int(size))
+        self.hits = 0
+        self.misses = 0
+        self._ready: Dict[int, Deque[int]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def take(self, decks: int) -> int:
+        with self._lock:
+            ready = self._ready.setdefault(int(decks), deque())
+            seed = ready.popleft() if ready else None
+            if seed is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self._wake.set()
+        # A miss still works: the order is shuffled on the first draw instead.
+        return new_shoe_seed() if seed is None else seed
+
+    def fill(self) -> None:
+        # Tops up every deck count requested so far; the shuffle runs outside the pool lock.
+        with self._lock:
+            deck_counts = list(self._ready)
+        for decks in deck_counts:
+            while True:
+                with self._lock:
+                    if len(self._ready[decks]) >= self.size:
+                        break
+                seed = new_shoe_seed()
+                shoe_order(seed, decks)
+                with self._lock:
+                    self._ready[decks].append(seed)
+
+    def start(self, deck_counts: Iterable[int] = ()) -> None:
+        with self._lock:
+            for decks in deck_counts:
+                self._ready.setdefault(int(decks), deque())
+        if self.size == 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="shoe-pool", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            ready = {decks: len(seeds) for decks, seeds in self._ready.items()}
+        return {"size": self.size, "ready": ready, "hits": self.hits, "misses": self.misses}
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.fill()
+            except Exception:
+                logger.exception("Shoe pool refill failed")
+            self._wake.wait()
+            self._wake.clear()
+
+
+_pool: ShoePool | None = None
+
+
+def get_shoe_pool() -> ShoePool:
+    global _pool
+    if _pool is None:
+        _pool = ShoePool(settings.shoe_pool_size)
+    return _pool
+
+
+def shutdown_shoe_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
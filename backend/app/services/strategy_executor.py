@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("inline", "process")
+
+
+# Raised when the pool is saturated or restarting; the HTTP layer maps it to 503.
+class StrategyUnavailable(RuntimeError):
+    pass
+
+
+def _warm_worker(cache_size: int) -> None:
+    from app.domain.strategy.gt_blackjack import configure_analysis_cache
+    from app.domain.strategy.table_store import load_strategy_tables
+
+    configure_analysis_cache(cache_size)
+    load_strategy_tables(settings.strategy_table_path)
+
+
+def _ping() -> bool:
+    return True
+
+
+class StrategyExecutor:
+    # "inline" keeps strategy work on the threadpool of the serving process; "process" moves it
+    # into a warm worker pool so solver CPU time never holds the GIL of the WebSocket event loop.
+
+    def __init__(
+        self,
+        mode: str = "inline",
+        workers: int = 2,
+        timeout_seconds: float = 5.0,
+        queue_limit: int = 64,
+        cache_size: int = 4096,
+    ) -> None:
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Invalid strategy executor mode: {mode}")
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.timeout_seconds = float(timeout_seconds)
+        self.queue_limit = max(1, int(queue_limit))
+        self.cache_size = int(cache_size)
+        self._pool: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def start(self) -> None:
+        if self.mode != "process":
+            return
+        pool = self._ensure_pool()
+        # Spawn every worker up front so the first requests do not pay for table builds.
+        for future in [pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                    initargs=(self.cache_size,),
+                )
+            return self._pool
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        pool = self._ensure_pool()
+        with self._lock:
+            # Jobs that timed out keep their slot until the worker actually finishes them.
+            if self._in_flight >= self.queue_limit:
+                raise StrategyUnavailable("Strategy workers are saturated")
+            self._in_flight += 1
+        try:
+            future = pool.submit(fn, *args)
+        except BrokenProcessPool as exc:
+            with self._lock:
+                self._in_flight -= 1
+            self.shutdown()
+            raise StrategyUnavailable("Strategy workers are restarting") from exc
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.mode == "inline":
+            return await run_in_threadpool(partial(fn, *args))
+        future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+        except BrokenProcessPool as exc:
+            logger.exception("Strategy worker pool broke")
+            self.shutdown()
+            raise StrategyUnavailable("Strategy workers are restarting") from exc
+
+
+_executor: StrategyExecutor | None = None
+
+
+def get_strategy_executor() -> StrategyExecutor:
+    global _executor
+    if _executor is None:
+        _executor = StrategyExecutor(
+            mode=settings.strategy_executor,
+            workers=settings.strategy_workers,
+            timeout_seconds=settings.strategy_timeout_seconds,
+            queue_limit=settings.strategy_queue_limit,
+            cache_size=settings.strategy_cache_size,
+        )
+    return _executor
+
+
+def shutdown_strategy_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
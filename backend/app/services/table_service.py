@@ -3,6 +3,7 @@ from typing import Any, Callable, Dict
 from redis import Redis
 
 from app.config import settings
+from app.domain.strategy.house_edge import table_strategy_house_edge
 from app.infra.redis.locks import table_lock
 from app.infra.redis import repo
 from app.utils.ids import new_id
@@ -249,9 +250,18 @@ def handle_admin_config(
         )
         if effective_min > effective_max:
             raise ValueError("Min bet cannot exceed max bet")
+        effective_decks = (
+            int(shoe_decks)
+            if shoe_decks is not None
+            else int(meta.get("pending_shoe_decks") or meta.get("shoe_decks") or settings.shoe_decks)
+        )
 
         if updates:
             repo.set_meta(redis, tid, updates)
     if emit:
-        emit("ADMIN_CONFIG_UPDATED", {"pending": updates})
+        # Cached per config tuple; a miss runs the deal enumeration, which is why the WS layer threads this handler.
+        house_edge = table_strategy_house_edge(
+            effective_decks, settings.dealer_soft_17_mode, settings.blackjack_payout
+        )
+        emit("ADMIN_CONFIG_UPDATED", {"pending": updates, "house_edge": house_edge})
     return repo.get_snapshot(redis, tid)
@@ -0,0 +1,20 @@
+import argparse
+import json
+import os
+import sys
+
+# Allow `python scripts/build_strategy_tables.py` from the backend directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.strategy.table_store import write_table_file  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the memory-mapped strategy/dealer table file")
+    parser.add_argument("--output", default="data/strategy_tables.bin")
+    args = parser.parse_args()
+    print(json.dumps(write_table_file(args.output), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Allow `python scripts/simulate_rounds.py` from the backend directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.domain.simulation import SimulationConfig, simulate_rounds  # noqa: E402
+
+
+def main() -> None:
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Monte Carlo house edge / variance for a table config")
+    parser.add_argument("--rounds", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rounds", type=int, default=50_000)
+    parser.add_argument("--decks", type=int, default=defaults.shoe_decks)
+    parser.add_argument("--reshuffle-pct", type=float, default=defaults.reshuffle_when_remaining_pct)
+    parser.add_argument("--soft-17", default=defaults.dealer_soft_17_mode, choices=["S17", "H17", "RANDOM_PER_ROUND"])
+    parser.add_argument("--blackjack-payout", type=float, default=defaults.blackjack_payout)
+    parser.add_argument("--bet", type=int, default=defaults.bet)
+    args = parser.parse_args()
+
+    config = SimulationConfig(
+        shoe_decks=args.decks,
+        reshuffle_when_remaining_pct=args.reshuffle_pct,
+        dealer_soft_17_mode=args.soft_17,
+        blackjack_payout=args.blackjack_payout,
+        bet=args.bet,
+    )
+    started = time.monotonic()
+
+    def progress(done: int, total: int) -> None:
+        elapsed = time.monotonic() - started
+        print(f"\r{done:,}/{total:,} rounds ({done / max(elapsed, 1e-9):,.0f}/s)", end="", file=sys.stderr)
+
+    result = simulate_rounds(
+        config,
+        args.rounds,
+        workers=args.workers,
+        seed=args.seed,
+        chunk_rounds=args.chunk_rounds,
+        progress=progress,
+    )
+    print(file=sys.stderr)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
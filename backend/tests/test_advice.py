@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.rules.blackjack_rules import Hand, card_code
+from app.main import app
+from app.services import advice_service
+from tests.conftest import recv_snapshot, redis_available
+
+
+def _request(cards: tuple[str, ...] = ("10H", "6S"), **overrides) -> dict:
+    hand = Hand(card_code(card) for card in cards)
+    request = {
+        "hand_id": "h1",
+        "total": hand.total,
+        "soft_aces": hand.soft_aces,
+        "card_count": len(hand),
+        "dealer_upcard": "KD",
+        "rule": "S17",
+        "bet": 20,
+        "bankroll": 980,
+        "can_double": True,
+        "risk_lambda": 1.0,
+        "true_count": None,
+    }
+    request.update(overrides)
+    return request
+
+
+def test_advice_key_normalizes_card_order_and_spelling() -> None:
+    base = advice_service.advice_key(_request())
+    assert advice_service.advice_key(_request(cards=("6C", "10D"), dealer_upcard="10S")) == base
+    assert advice_service.advice_key(_request(cards=("10H", "2S", "4D"))) != base
+    assert advice_service.advice_key(_request(rule="H17")) != base
+
+
+def test_compute_advice_uses_server_hand_without_split() -> None:
+    advice = advice_service.compute_advice(_request())
+    assert advice["inputs"]["player_total"] == 16 and advice["inputs"]["can_split"] is False
+    assert advice["recommendations"]["ev_maximizer"] == "hit"
+    counted = advice_service.compute_advice(_request(true_count=3.0))
+    assert counted["recommendations"]["ev_maximizer"] == "stand"
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_ws_advise_during_player_turn(table_id: str) -> None:
+    client = TestClient(app)
+    with client.websocket_connect("/ws/blackjack") as ws1, client.websocket_connect("/ws/blackjack") as ws2:
+        for ws, name in ((ws1, "Alice"), (ws2, "Bob")):
+            ws.send_json({"type": "HELLO", "nickname": name})
+            ws.receive_json()
+            ws.send_json({"type": "JOIN_TABLE", "table_id": table_id})
+            recv_snapshot(ws)
+        ws1.send_json({"type": "ADVISE"})
+        msg = ws1.receive_json()
+        while msg.get("type") != "ERROR":
+            msg = ws1.receive_json()
+        assert msg["code"] == "ADVISE_DENIED"
+
+        for ws in (ws1, ws2):
+            ws.send_json({"type": "READY_TOGGLE"})
+            recv_snapshot(ws)
+        ws1.send_json({"type": "START_SESSION"})
+        recv_snapshot(ws1)
+        for ws in (ws1, ws2):
+            ws.send_json({"type": "PLACE_BET", "amount": 20, "request_id": f"bet-{uuid.uuid4()}"})
+            snapshot = recv_snapshot(ws)
+        assert snapshot["meta"]["phase"] == "PLAYER_TURNS"
+
+        hits_before = advice_service.advice_cache_info()["hits"]
+        for _ in range(2):
+            ws1.send_json({"type": "ADVISE"})
+            msg = ws1.receive_json()
+            while msg.get("type") != "ADVICE":
+                msg = ws1.receive_json()
+            assert msg["advice"]["recommendations"]["ev_maximizer"] in {"stand", "hit", "double"}
+            assert msg["advice"]["inputs"]["bankroll"] == 980
+        assert advice_service.advice_cache_info()["hits"] == hits_before + 1
+
+
+def test_advise_message_is_registered() -> None:
+    from app.domain.models.messages import Advise, parse_client_message
+
+    parsed = parse_client_message({"type": "ADVISE", "use_count": True})
+    assert isinstance(parsed, Advise) and parsed.risk_lambda == 1.0
+    with pytest.raises(ValueError):
+        parse_client_message({"type": "ADVISE", "risk_lambda": 9})
@@ -0,0 +1,70 @@
+import pytest
+
+from app.domain.rules.blackjack_rules import card_names
+from app.domain.rules.counting import count_state, full_shoe_histogram, hi_lo, public_cards
+from app.infra.redis import repo
+from app.infra.redis.client import get_redis
+from app.services.round_service import _draw_cards
+from tests.conftest import redis_available
+
+
+def test_public_cards_exclude_hidden_cards() -> None:
+    assert public_cards("CARD_DEALT", {"to": "player", "card": "5H", "face_down": False}) == []
+    assert public_cards("CARD_DEALT", {"to": "dealer", "card": None, "face_down": True}) == []
+    assert public_cards("CARD_DEALT", {"to": "dealer", "card": "KD", "face_down": False}) == ["KD"]
+    assert public_cards("DEALER_REVEAL_HOLE", {"cards": ["KD", "4C"]}) == ["4C"]
+    assert public_cards("DEALER_ACTION", {"action": "draw", "card": "2S"}) == ["2S"]
+    assert public_cards("DEALER_ACTION", {"action": "stand", "total": 19}) == []
+    revealed = {"dealer": ["KD", "4C"], "players": [{"seat": 1, "cards": ["5H", "AS", "3D"]}]}
+    assert public_cards("HANDS_REVEALED", revealed) == ["5H", "AS", "3D"]
+    assert [hi_lo(card) for card in ["2H", "6S", "7D", "9C", "10H", "QS", "AD"]] == [1, 1, 0, 0, -1, -1, -1]
+
+
+def test_count_state_true_count() -> None:
+    histogram = full_shoe_histogram(2)
+    state = count_state(4, 52, histogram)
+    assert state["true_count"] == 4.0
+    assert state["remaining_by_rank"] == [8] * 9 + [32]
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_count_updates_incrementally(table_id: str) -> None:
+    redis = get_redis()
+    try:
+        repo.reset_count(redis, table_id, 1)
+        repo.note_drawn(redis, table_id, ["2H", "KD", "5C", "AS", "6D", "9S"])
+        assert repo.apply_count(redis, table_id, ["2H", "KD", "5C", "AS", "6D"]) == 5
+        # Only cards drawn from this shoe are counted.
+        assert repo.apply_count(redis, table_id, ["7H"]) == 0
+        count = repo.get_count(redis, table_id)
+        assert count is not None
+        assert count["running_count"] == 1
+        assert count["cards_remaining"] == 47
+        assert count["remaining_by_rank"][0] == 3 and count["remaining_by_rank"][9] == 15
+        repo.reset_count(redis, table_id, 1)
+        assert repo.get_count(redis, table_id)["running_count"] == 0
+    finally:
+        repo.clear_table(redis, table_id)
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_count_skips_cards_from_a_shoe_replaced_mid_round(table_id: str) -> None:
+    redis = get_redis()
+    try:
+        repo.ensure_table(redis, table_id)
+        repo.set_meta(redis, table_id, {"shoe_decks": 1})
+        repo.save_shoe(redis, table_id, 7, 1)
+        repo.reset_count(redis, table_id, 1)
+        # Hidden hands take all but two cards, then a draw of four runs off the end and reshuffles.
+        hidden = _draw_cards(redis, table_id, 50)
+        straddling = _draw_cards(redis, table_id, 4)
+        fresh = straddling[2:]
+        assert repo.shoe_remaining(redis, table_id) == 50
+
+        repo.apply_count(redis, table_id, card_names(hidden + straddling))
+        count = repo.get_count(redis, table_id)
+        assert count["cards_remaining"] == 50
+        assert min(count["remaining_by_rank"]) >= 0 and sum(count["remaining_by_rank"]) == 50
+        assert count["running_count"] == sum(hi_lo(card) for card in card_names(fresh))
+    finally:
+        repo.clear_table(redis, table_id)
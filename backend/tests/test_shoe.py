@@ -0,0 +1,111 @@
+import pytest
+
+from app.domain.rules.blackjack_rules import (
+    CARD_NAMES,
+    Hand,
+    card_code,
+    card_names,
+    hand_value,
+    hand_value_codes,
+    shoe_order,
+)
+from app.infra.redis import keys, repo
+from app.infra.redis.client import get_redis
+from app.services.round_service import _draw_cards
+from app.services.shoe_pool import ShoePool
+from tests.conftest import redis_available
+
+
+def test_shoe_order_is_replayable_from_seed() -> None:
+    order = shoe_order(1234, 6)
+    assert len(order) == 312
+    assert order == shoe_order(1234, 6)
+    assert sorted(order) == sorted(shoe_order(99, 6))
+    assert order != shoe_order(99, 6)
+    assert sorted(card_names(order)) == sorted(list(CARD_NAMES) * 6)
+
+
+def test_card_codes_round_trip_and_value_hands() -> None:
+    assert [card_code(name) for name in CARD_NAMES] == list(range(52))
+    assert card_names([card_code("10h"), card_code("AS")]) == ["10H", "AS"]
+    with pytest.raises(ValueError):
+        card_code("1X")
+    hands = [["AS", "KD"], ["AS", "AH", "9D"], ["10H", "6S", "AS"], ["KD", "QS", "2C"]]
+    assert [hand_value(cards) for cards in hands] == [(21, True), (21, True), (17, False), (22, False)]
+    assert hand_value_codes([card_code("AS"), card_code("6D")]) == (17, True)
+
+
+def test_hand_tracks_state_incrementally() -> None:
+    hand = Hand([card_code("AS"), card_code("KD")])
+    assert (hand.total, hand.soft_aces, hand.is_blackjack) == (21, 1, True)
+    hand.add(card_code("5C"))
+    assert (hand.total, hand.is_soft, hand.is_blackjack, len(hand)) == (16, False, False, 3)
+    hand.add(card_code("9H"))
+    assert hand.is_bust
+    soft = Hand([card_code("AS"), card_code("AH"), card_code("AD")])
+    assert (soft.total, soft.soft_aces) == (13, 1)
+    with pytest.raises(AttributeError):
+        hand.extra = 1  # type: ignore[attr-defined]
+
+
+def test_shoe_pool_hands_out_pre_shuffled_seeds() -> None:
+    pool = ShoePool(size=2)
+    first = pool.take(8)
+    assert pool.info()["misses"] == 1
+    pool.fill()
+    assert pool.info()["ready"] == {8: 2}
+    hits_before = shoe_order.cache_info().hits
+    seed = pool.take(8)
+    assert seed != first and pool.info()["hits"] == 1
+    assert len(shoe_order(seed, 8)) == 416
+    assert shoe_order.cache_info().hits == hits_before + 1
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_draw_cards_advances_cursor_in_one_call(table_id: str) -> None:
+    redis = get_redis()
+    try:
+        repo.save_shoe(redis, table_id, 1234, 1)
+        order = shoe_order(1234, 1)
+        assert repo.draw_cards(redis, table_id, 4) == list(order[:4])
+        assert repo.shoe_remaining(redis, table_id) == 48
+        assert repo.load_shoe(redis, table_id) == list(order[4:])
+        assert repo.draw_cards(redis, table_id, 50) == list(order[4:])
+        assert repo.draw_cards(redis, table_id, 1) == []
+        assert repo.shoe_remaining(redis, table_id) == 0
+    finally:
+        repo.clear_table(redis, table_id)
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_draw_refills_empty_or_legacy_shoe(table_id: str) -> None:
+    redis = get_redis()
+    try:
+        repo.ensure_table(redis, table_id)
+        redis.rpush(keys.table_shoe(table_id), "AS")
+        assert repo.shoe_remaining(redis, table_id) == 0
+        repo.save_shoe(redis, table_id, 7, 1)
+        repo.draw_cards(redis, table_id, 51)
+        cards = _draw_cards(redis, table_id, 3)
+        assert len(cards) == 3 and cards[0] == shoe_order(7, 1)[51]
+        decks = int(repo.get_shoe_meta(redis, table_id)["decks"])
+        assert repo.shoe_remaining(redis, table_id) == 52 * decks - 2
+    finally:
+        repo.clear_table(redis, table_id)
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_hand_cards_round_trip_packed(table_id: str) -> None:
+    redis = get_redis()
+    try:
+        codes = [card_code(card) for card in ["AS", "10H", "KC"]]
+        repo.save_hand(redis, table_id, "h1", Hand(codes))
+        assert repo.load_hand_cards(redis, table_id, "h1") == codes
+        restored = repo.load_hand(redis, table_id, "h1")
+        assert (restored.total, restored.soft_aces, len(restored)) == (21, 0, 3)
+        redis.hset(keys.table_hand(table_id, "h2"), mapping={"cards": '["AH", "QD"]'})
+        legacy = repo.load_hand(redis, table_id, "h2")
+        assert card_names(legacy.cards) == ["AH", "QD"] and legacy.is_blackjack
+    finally:
+        redis.delete(keys.table_hand(table_id, "h1"), keys.table_hand(table_id, "h2"))
+        repo.clear_table(redis, table_id)
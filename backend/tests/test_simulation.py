@@ -0,0 +1,63 @@
+import random
+
+from app.domain.simulation import BettingPolicy, RunningStats, SimulationConfig, simulate_bankroll_paths, simulate_rounds
+from app.domain.strategy.round_model import round_house_edge, round_outcome_distribution
+
+
+def test_running_stats_merge_matches_single_pass() -> None:
+    rng = random.Random(7)
+    values = [rng.gauss(0.0, 1.0) for _ in range(1000)]
+    single = RunningStats()
+    single.extend(values)
+    left, right = RunningStats(), RunningStats()
+    left.extend(values[:300])
+    right.extend(values[300:])
+    merged = left.merge(right)
+    assert merged.count == single.count
+    assert abs(merged.mean - single.mean) < 1e-12
+    assert abs(merged.variance - single.variance) < 1e-9
+
+
+def test_round_simulator_is_seeded_and_sharded() -> None:
+    config = SimulationConfig(shoe_decks=6, dealer_soft_17_mode="RANDOM_PER_ROUND", blackjack_payout=1.5, bet=10)
+    seen: list[int] = []
+    first = simulate_rounds(config, 20_000, seed=3, chunk_rounds=5_000, progress=lambda done, _: seen.append(done))
+    again = simulate_rounds(config, 20_000, seed=3, chunk_rounds=5_000)
+    assert seen == [5_000, 10_000, 15_000, 20_000]
+    assert first["per_round"] == again["per_round"]
+    stats = first["per_round"]
+    assert stats["count"] == 20_000
+    assert -2.0 <= stats["min"] and stats["max"] <= 2.0
+    assert 0.9 < stats["variance"] < 1.5
+    assert stats["ci_low"] < stats["mean"] < stats["ci_high"]
+
+    parallel = simulate_rounds(config, 20_000, workers=2, seed=3, chunk_rounds=5_000)
+    assert parallel["per_round"] == first["per_round"]
+
+
+def test_round_model_and_bankroll_paths() -> None:
+    deltas, probs = round_outcome_distribution("S17", 1.5)
+    assert abs(probs.sum() - 1.0) < 1e-12
+    assert set(deltas.tolist()) == {-2.0, -1.0, 0.0, 1.0, 1.5, 2.0}
+    # 6:5 blackjack costs the player roughly 0.3 * P(blackjack) per round.
+    assert 0.01 < round_house_edge("S17", 1.2) - round_house_edge("S17", 1.5) < 0.02
+
+    result = simulate_bankroll_paths(2_000, 500, starting_bankroll=100, min_bet=10, max_bet=50, seed=5)
+    again = simulate_bankroll_paths(2_000, 500, starting_bankroll=100, min_bet=10, max_bet=50, seed=5)
+    assert result == again
+    assert 0.0 < result["ruin_probability"] < 1.0
+    lengths = result["session_length"]
+    assert lengths["p5"] <= lengths["p50"] <= lengths["p95"] <= 500
+
+    capped = simulate_bankroll_paths(
+        2_000,
+        500,
+        starting_bankroll=100,
+        min_bet=10,
+        max_bet=50,
+        policy=BettingPolicy(kind="fraction", fraction=0.5),
+        stop_at_bankroll=200,
+        seed=5,
+    )
+    assert capped["ruin_probability"] + capped["reached_target_probability"] > 0.99
+    assert capped["final_bankroll"]["p95"] < 200 + 50 * 2
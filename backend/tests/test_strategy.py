@@ -0,0 +1,312 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.domain.simulation import SimulationConfig, simulate_rounds
+from app.domain.strategy.cache import LRUCache
+from app.domain.strategy.composition import full_shoe_counts
+from app.domain.strategy.count_tables import build_count_tables, count_card_probs, get_count_tables
+from app.domain.strategy.dealer_markov import dealer_table
+from app.domain.strategy.distribution import OutcomeDistribution
+from app.domain.strategy.house_edge import table_strategy_house_edge
+from app.domain.strategy.gt_blackjack import (
+    ANALYSIS_CACHE_SIZE,
+    analysis_cache_info,
+    analyze_decision_state,
+    clear_analysis_cache,
+    configure_analysis_cache,
+    dealer_distribution,
+    ev_hit,
+    ev_hit_one_step,
+    ev_split,
+    ev_stand,
+    double_delta_distribution,
+    expected_utility,
+    hit_delta_distribution,
+    security_level,
+    risk_averse_curve,
+    security_sweep,
+    shoe_counts_from_cards,
+    split_delta_distribution,
+    stand_delta_distribution,
+)
+from app.domain.strategy import dealer_markov, table_store
+from app.domain.strategy.tables import build_strategy_table, get_strategy_table
+from app.domain.strategy.utility import utility_function
+
+
+def test_optimal_hit_dominates_one_step() -> None:
+    for total, soft_aces in [(12, 0), (13, 1), (15, 0), (17, 1), (18, 1)]:
+        for upcard in ["A", 2, 6, 9, 10]:
+            assert ev_hit((total, soft_aces), upcard, 1, "S17") >= ev_hit_one_step(
+                (total, soft_aces), upcard, 1, "S17"
+            ) - 1e-12
+
+
+def test_optimal_hit_distribution_is_normalized() -> None:
+    outcomes = hit_delta_distribution({"cards": ["AS", "6H"]}, "7", 10, "H17")
+    assert abs(sum(prob for _, prob in outcomes) - 1.0) < 1e-9
+    assert {delta for delta, _ in outcomes} <= {-10.0, 0.0, 10.0}
+
+
+def test_optimal_hit_matches_basic_strategy() -> None:
+    # Soft 18 vs 9 is a hit, hard 12 vs 4 is a stand.
+    assert ev_hit((18, 1), 9, 1, "S17") > ev_stand(18, 9, 1, "S17")
+    assert ev_hit((12, 0), 4, 1, "S17") < ev_stand(12, 4, 1, "S17")
+
+
+def test_analyze_hit_mode() -> None:
+    optimal = analyze_decision_state((13, 1), "7", 10, 100, "S17")
+    one_step = analyze_decision_state((13, 1), "7", 10, 100, "S17", hit_mode="one_step")
+    assert optimal["inputs"]["hit_mode"] == "optimal"
+    assert one_step["inputs"]["hit_mode"] == "one_step"
+    assert optimal["actions"]["hit"]["ev"] > one_step["actions"]["hit"]["ev"]
+
+
+def test_finite_shoe_dealer_converges_to_infinite_deck() -> None:
+    infinite = dealer_distribution("6", "H17")
+    finite = dealer_distribution("6", "H17", shoe_counts=full_shoe_counts(60))
+    for outcome, prob in infinite.items():
+        assert abs(finite[outcome] - prob) < 1e-3
+
+
+def test_finite_shoe_dealer_uses_remaining_composition() -> None:
+    counts = {"A": 4, "2": 4, "3": 4, "4": 4, "5": 4, "6": 4, "7": 4, "8": 4, "9": 4, "K": 4}
+    dist = dealer_distribution("10", "S17", shoe_counts=counts)
+    assert abs(sum(dist.values()) - 1.0) < 1e-9
+    # Ten-poor shoe: a dealer showing ten finishes on 20 far less often.
+    assert dist[20] < dealer_distribution("10", "S17")[20]
+    assert shoe_counts_from_cards(["AS", "KD", "10H", "2C"]) == (1, 1, 0, 0, 0, 0, 0, 0, 0, 2)
+
+
+def test_markov_dealer_table_covers_all_upcards_and_rules() -> None:
+    table = dealer_table()
+    assert table.shape == (2, 10, 6)
+    assert abs(table.sum(axis=2) - 1.0).max() < 1e-12
+    # H17 busts more often than S17 behind a six.
+    assert table[1, 5, 5] > table[0, 5, 5]
+    ten_rich = dealer_table((1.0,) * 9 + (8.0,))
+    assert ten_rich[0, 9, 3] > table[0, 9, 3]
+
+
+def test_analysis_cache_hits_on_normalized_state() -> None:
+    clear_analysis_cache()
+    first = analyze_decision_state({"cards": ["9H", "7C"]}, "K", 10, 100, "S17")
+    second = analyze_decision_state((16, 0), "10", 10, 100, "S17", can_double=True)
+    assert first is second
+    info = analysis_cache_info()
+    assert info["hits"] == 1 and info["misses"] == 1 and info["size"] == 1
+
+    configure_analysis_cache(1)
+    analyze_decision_state((15, 0), "10", 10, 100, "S17")
+    assert analysis_cache_info()["evictions"] == 1
+    configure_analysis_cache(ANALYSIS_CACHE_SIZE)
+    clear_analysis_cache()
+    assert analysis_cache_info()["size"] == 0
+
+
+class _YieldingKey:
+    # Hashing hands the GIL to another thread, so unlocked get/put interleave between dict operations.
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def __hash__(self) -> int:
+        time.sleep(0)
+        return hash(self.value)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _YieldingKey) and other.value == self.value
+
+
+def test_lru_cache_is_safe_across_threads() -> None:
+    cache: LRUCache[int] = LRUCache(2)
+    threads, rounds = 4, 300
+
+    def worker(offset: int) -> None:
+        for step in range(rounds):
+            key = _YieldingKey((offset + step) % 3)
+            if cache.get(key) is None:
+                cache.put(key, step + 1)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for future in [pool.submit(worker, offset) for offset in range(threads)]:
+            future.result()
+    info = cache.info()
+    assert info["hits"] + info["misses"] == threads * rounds
+    assert info["size"] == len(cache) <= 2
+
+
+def test_outcome_distribution_matches_pair_list() -> None:
+    dist = double_delta_distribution((11, 0), "6", 10, "S17")
+    pairs = list(dist)
+    assert {delta for delta, _ in pairs} <= {-20.0, 0.0, 20.0}
+    assert abs(dist.total() - 1.0) < 1e-12
+    assert abs(security_level(dist)[1] - security_level(pairs)[1]) < 1e-12
+    assert abs(expected_utility(100, dist) - expected_utility(100, pairs)) < 1e-12
+
+    hand = OutcomeDistribution.from_lose_push_win(10, 0.5, 0.0, 0.5)
+    two_hands = hand.convolve(hand)
+    assert dict(two_hands) == {-20.0: 0.25, 0.0: 0.5, 20.0: 0.25}
+
+    compact = analyze_decision_state((11, 0), "6", 10, 100, "S17", outcome_format="compact")
+    wire = compact["actions"]["double"]["outcomes"]
+    assert wire["step"] == 5.0 and wire["low"] == -4 and len(wire["probs"]) == 9
+
+
+def test_split_recursion_covers_resplits_and_pairs() -> None:
+    # Splitting eights against a six beats both playing on 16 and standing.
+    split_eights = analyze_decision_state({"cards": ["8H", "8D"]}, "6", 10, 100, "S17")
+    assert split_eights["inputs"]["can_split"] is True
+    assert split_eights["recommendations"]["ev_maximizer"] == "split"
+    split_tens = analyze_decision_state({"cards": ["10H", "KD"]}, "6", 10, 100, "S17")
+    assert split_tens["recommendations"]["ev_maximizer"] == "stand"
+    assert analyze_decision_state({"cards": ["10H", "6D"]}, "6", 10, 100, "S17")["actions"]["split"]["allowed"] is False
+
+    dist = split_delta_distribution(8, "6", 10, "S17", max_hands=4)
+    assert abs(dist.total() - 1.0) < 1e-12
+    assert min(delta for delta, _ in dist) >= -80.0
+    two_hands = split_delta_distribution(8, "6", 10, "S17", max_hands=2, double_after_split=False)
+    assert min(delta for delta, _ in two_hands) == -20.0
+    assert ev_split(8, "6", 10, "S17", max_hands=4) > two_hands.moments()[0]
+
+
+def test_split_and_double_share_affordability_rule() -> None:
+    # Both need exactly one more stake on top of the placed bet.
+    for bankroll, allowed in ((10, True), (9, False)):
+        result = analyze_decision_state({"cards": ["8H", "8D"]}, "6", 10, bankroll, "S17", infer_can_double=True)
+        assert result["actions"]["double"]["allowed"] is allowed
+        assert result["actions"]["split"]["allowed"] is allowed
+
+
+def test_surrender_and_insurance_are_lazy_extras() -> None:
+    plain = analyze_decision_state({"cards": ["10H", "6C"]}, "10", 10, 100, "S17")
+    assert "surrender" not in plain["actions"] and "side_bets" not in plain
+
+    hard_16 = analyze_decision_state({"cards": ["10H", "6C"]}, "10", 10, 100, "S17", extra_actions=["surrender"])
+    assert hard_16["recommendations"]["ev_maximizer"] == "surrender"
+    # Late surrender still loses the whole bet to a dealer blackjack (ace in the hole).
+    assert abs(hard_16["actions"]["surrender"]["ev"] - (-5.0 - 5.0 / 13.0)) < 1e-9
+
+    against_ace = analyze_decision_state({"cards": ["10H", "9C"]}, "A", 10, 100, "S17", extra_actions=["insurance"])
+    assert abs(against_ace["side_bets"]["insurance"]["ev"] - 5.0 * (3 * 4 / 13 - 1)) < 1e-9
+    assert against_ace["recommendations"]["insurance"]["ev_maximizer"] == "decline"
+    three_cards = analyze_decision_state({"cards": ["10H", "2C", "4D"]}, "10", 10, 100, "S17", extra_actions=["surrender"])
+    assert "surrender" not in three_cards["actions"]
+
+
+def test_count_tables_match_neutral_engine_and_shift_decisions() -> None:
+    assert abs(count_card_probs(0)[-1] - 4.0 / 13.0) < 1e-12
+    tables = get_count_tables()
+    neutral = analyze_decision_state((16, 0), 10, 10, 100, "S17", can_double=True)
+    counted = analyze_decision_state((16, 0), 10, 10, 100, "S17", can_double=True, true_count=0)
+    for action in ("stand", "hit", "double"):
+        assert abs(neutral["actions"][action]["ev"] - counted["actions"][action]["ev"]) < 1e-12
+    assert counted["dealer_distribution"] == neutral["dealer_distribution"]
+
+    # Between buckets the answer is a linear blend of the neighbouring tables.
+    low, high = tables.unit_outcomes("S17", 2, 9, 16, 0), tables.unit_outcomes("S17", 3, 9, 16, 0)
+    assert abs(tables.unit_outcomes("S17", 2.25, 9, 16, 0) - (0.75 * low + 0.25 * high)).max() < 1e-12
+
+    # Classic index plays: 16 v 10 stands on a positive count, insurance pays from +3.
+    for true_count, expected in ((-3, "hit"), (2, "stand")):
+        advice = analyze_decision_state((16, 0), 10, 10, 100, "S17", true_count=true_count)
+        assert advice["recommendations"]["ev_maximizer"] == expected
+    insured = analyze_decision_state((20, 0), "A", 10, 100, "S17", true_count=4, extra_actions=["insurance"])
+    assert insured["recommendations"]["insurance"]["ev_maximizer"] == "take"
+    with pytest.raises(ValueError):
+        analyze_decision_state((16, 0), 10, 10, 100, "S17", hit_mode="one_step", true_count=1)
+
+
+def test_security_sweep_matches_pointwise_recommendations() -> None:
+    state = dict(can_double=True, extra_actions=["surrender"])
+    analysis = analyze_decision_state((12, 0), 4, 10, 100, "S17", **state)
+    grid = [step / 20 for step in range(81)]
+    sweep = security_sweep(analysis["actions"], grid)
+    for risk_lambda, picked in zip(grid, sweep["recommended"]):
+        pointwise = analyze_decision_state((12, 0), 4, 10, 100, "S17", risk_lambda=risk_lambda, **state)
+        assert picked == pointwise["recommendations"]["security_level"]
+    assert [(c["from"], c["to"]) for c in sweep["crossovers"]] == [("stand", "hit"), ("hit", "surrender")]
+    for crossing in sweep["crossovers"]:
+        # Both actions score the same exactly at the crossover.
+        scores = [
+            analysis["actions"][name]["ev"] - crossing["risk_lambda"] * analysis["actions"][name]["variance"] ** 0.5
+            for name in (crossing["from"], crossing["to"])
+        ]
+        assert abs(scores[0] - scores[1]) < 1e-9
+
+
+def test_utility_registry_and_bankroll_grid_curve() -> None:
+    stand = stand_delta_distribution(18, 10, 50, "S17")
+    grid = np.array([0.0, 40.0, 500.0, 5000.0])
+    for name, param in (("sqrt", None), ("log", None), ("crra", 3.0), ("cara", 0.01)):
+        pointwise = [expected_utility(bankroll, stand, name, param) for bankroll in grid]
+        assert np.allclose(stand.expected_utility_grid(grid, utility_function(name, param)), pointwise)
+    assert expected_utility(100, stand, "crra", 1.0) == expected_utility(100, stand, "log")
+    with pytest.raises(ValueError):
+        utility_function("cara", 0.0)
+
+    grid_request = dict(can_double=True, utility="crra", utility_param=4.0, bankroll_grid=range(0, 2001, 10))
+    analysis = analyze_decision_state((12, 0), 2, 50, 1000, "S17", **grid_request)
+    curve = analysis["risk_averse_curve"]
+    assert curve["recommended"][curve["bankrolls"].index(1000.0)] == analysis["recommendations"]["risk_averse"]
+    assert curve["thresholds"] and curve["recommended"][-1] == analysis["recommendations"]["ev_maximizer"]
+    assert analysis["inputs"]["utility"] == "crra" and analysis["inputs"]["utility_param"] == 4.0
+    empty = risk_averse_curve({"stand": None}, [10, 20])
+    assert empty["recommended"] == [None, None] and empty["thresholds"] == []
+
+
+def test_table_file_round_trips_through_mmap(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "tables.bin")
+    meta = table_store.write_table_file(path)
+    assert meta["config_hash"] == table_store.config_hash() and meta["rules"] == ["S17", "H17"]
+    views = table_store.map_table_file(path)
+    assert views is not None and not views["count_outcomes"].flags.writeable
+    assert np.array_equal(views["dealer"], dealer_table())
+    assert np.array_equal(views["count_outcomes"], get_count_tables().outcomes)
+
+    monkeypatch.setattr(dealer_markov, "_INSTALLED", {})
+    expected = analyze_decision_state((16, 0), 10, 10, 100, "S17", true_count=2.5)
+    clear_analysis_cache()
+    try:
+        assert table_store.load_strategy_tables(path)
+        assert isinstance(get_strategy_table().probs, memoryview)
+        assert analyze_decision_state((16, 0), 10, 10, 100, "S17", true_count=2.5) == expected
+    finally:
+        build_strategy_table()
+        build_count_tables()
+        dealer_markov._default_dealer_table.cache_clear()
+        dealer_markov._default_blackjack_probs.cache_clear()
+
+    # An edited solver changes the hash, so the stale file is not served.
+    monkeypatch.setattr(table_store, "_solver_digest", lambda: "edited")
+    assert table_store.map_table_file(path) is None
+    monkeypatch.setattr(table_store, "config_hash", lambda: "other")
+    assert table_store.map_table_file(path) is None
+    assert table_store.map_table_file(str(tmp_path / "missing.bin")) is None
+
+
+def test_table_strategy_house_edge_per_config() -> None:
+    s17 = table_strategy_house_edge(6, "S17", 1.5)
+    h17 = table_strategy_house_edge(6, "H17", 1.5)
+    mixed = table_strategy_house_edge(6, "random_per_round", 1.5)
+    assert 0.0 < s17["house_edge"] < h17["house_edge"] < 0.03
+    assert abs(mixed["house_edge"] - (s17["house_edge"] + h17["house_edge"]) / 2) < 1e-12
+    # 6:5 blackjack costs about 0.3 units per player blackjack.
+    six_to_five = table_strategy_house_edge(6, "S17", 1.2)
+    assert abs(six_to_five["house_edge"] - s17["house_edge"] - 0.3 * s17["player_blackjack_prob"]) < 1e-3
+    assert table_strategy_house_edge(6, "S17", 1.5) == s17
+
+
+def test_table_strategy_house_edge_tracks_deck_count() -> None:
+    edges = [table_strategy_house_edge(decks, "S17", 1.5)["house_edge"] for decks in (1, 2, 6, 8)]
+    assert edges == sorted(edges)
+    assert edges[-1] - edges[0] > 0.004
+
+    # A reshuffle every round deals each round from a fresh single deck, as the exact figure assumes.
+    config = SimulationConfig(
+        shoe_decks=1, dealer_soft_17_mode="S17", blackjack_payout=1.5, reshuffle_when_remaining_pct=0.99
+    )
+    simulated = simulate_rounds(config, 100_000, seed=5)
+    assert abs(simulated["house_edge"] - edges[0]) < 4 * simulated["per_round"]["stderr"]
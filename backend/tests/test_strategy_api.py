@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.http.strategy import StrategyRequest, _evaluate_single, _needs_full_analysis
+from app.infra.redis import keys, repo
+from app.infra.redis.client import get_redis
+from app.main import app
+from app.services.strategy_executor import StrategyExecutor, StrategyUnavailable
+from tests.conftest import redis_available
+
+
+def _request(**overrides) -> dict:
+    body = {
+        "player_cards": ["10H", "6S"],
+        "dealer_upcard": "10D",
+        "bet": 10,
+        "bankroll": 100,
+        "rule": "S17",
+        "can_double": True,
+    }
+    body.update(overrides)
+    return body
+
+
+def test_strategy_table_path_matches_full_path() -> None:
+    client = TestClient(app)
+    full = client.post("/strategy/blackjack", json=_request(include_utility=True)).json()
+    table = client.post("/strategy/blackjack", json=_request()).json()
+    assert not _needs_full_analysis(StrategyRequest(**_request()))
+    # Both paths return the same shape, so clients do not need to know which one answered.
+    assert table.keys() == full.keys() and table["inputs"] == full["inputs"]
+    assert table["recommendations"] == full["recommendations"]
+    assert table["recommendations"]["risk_averse"] is not None
+    for action in ("stand", "hit", "double"):
+        for metric in ("ev", "variance", "utility_score"):
+            assert abs(table["actions"][action][metric] - full["actions"][action][metric]) < 1e-9
+    # Asking for a non-default utility or a bankroll curve implies the full analysis.
+    for overrides in ({"utility": "log"}, {"utility_param": 3.0, "utility": "crra"}, {"bankroll_grid": [50, 100]}):
+        assert client.post("/strategy/blackjack", json=_request(**overrides)).json()["recommendations"]["risk_averse"]
+
+
+def test_strategy_batch_dedupes_and_isolates_errors() -> None:
+    client = TestClient(app)
+    batch = [
+        _request(),
+        _request(player_cards=["6C", "KH"]),
+        _request(dealer_upcard="ZZ"),
+        {"dealer_upcard": "5"},
+        _request(player_cards=None, player_total=11),
+    ]
+    resp = client.post("/strategy/blackjack/batch", json=batch)
+    assert resp.status_code == 200
+    body = resp.json()
+    results = body["results"]
+    assert len(results) == 5
+    assert [entry["ok"] for entry in results] == [True, True, False, False, True]
+    assert results[0]["result"] == results[1]["result"]
+    assert results[0]["result"] == client.post("/strategy/blackjack", json=_request()).json()
+    assert body["unique"] == 2
+
+
+def test_strategy_lambda_sweep_on_table_and_full_paths() -> None:
+    client = TestClient(app)
+    grid = [step / 10 for step in range(41)]
+    for include_utility in (True, False):
+        body = _request(player_cards=["10H", "2S"], dealer_upcard="4D", risk_lambdas=grid)
+        body["include_utility"] = include_utility
+        sweep = client.post("/strategy/blackjack", json=body).json()["security_sweep"]
+        assert len(sweep["recommended"]) == len(grid)
+        assert sweep["recommended"][0] != sweep["recommended"][-1]
+        assert all(0.0 <= crossing["risk_lambda"] <= 4.0 for crossing in sweep["crossovers"])
+    assert client.post("/strategy/blackjack", json=_request(risk_lambdas=[5.0])).status_code == 422
+    assert "security_sweep" not in client.post("/strategy/blackjack", json=_request()).json()
+
+
+def test_bet_endpoint_sizes_by_kelly_and_clamps_to_table_limits() -> None:
+    client = TestClient(app)
+    neutral = client.post("/strategy/bet", json={"bankroll": 10000, "dealer_soft_17_mode": "S17"}).json()
+    assert neutral["edge"] < 0 and neutral["kelly_fraction"] == 0.0
+    assert neutral["bet"] == 10 and neutral["clamped"]
+
+    hot = client.post("/strategy/bet", json={"bankroll": 10000, "true_count": 4, "min_bet": 10, "max_bet": 500}).json()
+    assert hot["edge"] > 0
+    assert hot["bet"] == int(10000 * hot["edge"] / hot["variance"])
+    half = client.post("/strategy/bet", json={"bankroll": 10000, "true_count": 4, "kelly_multiplier": 0.5}).json()
+    assert half["kelly_fraction"] == pytest.approx(hot["kelly_fraction"] / 2)
+    capped = client.post("/strategy/bet", json={"bankroll": 10**6, "true_count": 10, "max_bet": 200}).json()
+    assert capped["bet"] == 200 and capped["optimal_bet"] > 200
+
+    broke = client.post("/strategy/bet", json={"bankroll": 5, "true_count": 4}).json()
+    assert broke["eligible"] is False and broke["bet"] == 0
+    assert client.post("/strategy/bet", json={"bankroll": 100, "min_bet": 50, "max_bet": 20}).status_code == 422
+
+
+@pytest.mark.skipif(not redis_available(), reason="Redis not available")
+def test_bet_endpoint_clamps_to_the_tables_configured_limits(table_id: str) -> None:
+    client = TestClient(app)
+    redis = get_redis()
+    repo.set_meta(redis, table_id, {"min_bet": 25, "max_bet": 40})
+    try:
+        neutral = client.post("/strategy/bet", json={"bankroll": 10000, "table_id": table_id}).json()
+        assert neutral["bet"] == 25 and neutral["clamped"]
+        hot = client.post("/strategy/bet", json={"bankroll": 10**6, "true_count": 10, "table_id": table_id}).json()
+        assert hot["bet"] == 40 and hot["optimal_bet"] > 40
+        # An explicit limit still overrides the table's.
+        capped = client.post(
+            "/strategy/bet", json={"bankroll": 10**6, "true_count": 10, "max_bet": 30, "table_id": table_id}
+        ).json()
+        assert capped["bet"] == 30
+    finally:
+        redis.delete(keys.table_meta(table_id))
+
+
+def test_strategy_process_pool_times_out_and_sheds_load() -> None:
+    executor = StrategyExecutor(mode="process", workers=1, timeout_seconds=30, queue_limit=1)
+    try:
+        executor.start()
+        result = asyncio.run(executor.run(_evaluate_single, StrategyRequest.model_validate(_request())))
+        assert result["recommendations"]["ev_maximizer"] in {"stand", "hit", "double"}
+
+        executor.timeout_seconds = 0.2
+
+        async def overload() -> None:
+            with pytest.raises(asyncio.TimeoutError):
+                await executor.run(time.sleep, 1.0)
+            # The timed-out job still holds the only slot until the worker finishes it.
+            with pytest.raises(StrategyUnavailable):
+                await executor.run(time.sleep, 0)
+
+        asyncio.run(overload())
+    finally:
+        executor.shutdown()
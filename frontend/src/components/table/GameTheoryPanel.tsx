@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useRef, useState } from 'react'
 
 import type { VisualState } from '../../state/visual/types'
-import type { GtActionName, GtResponse } from '../../types/gameTheory'
+import type { GtActionName, GtRecommendedAction, GtResponse } from '../../types/gameTheory'
 import { getApiBaseUrl } from '../../ws/url'
 
 type Props = {
@@ -11,15 +11,17 @@ type Props = {
   canDouble: boolean
 }
 
-const ACTIONS: GtActionName[] = ['stand', 'hit', 'double']
+const ACTIONS: GtActionName[] = ['stand', 'hit', 'double', 'split']
 
-const actionLabel = (name: GtActionName) => {
+const actionLabel = (name: GtRecommendedAction) => {
   if (name === 'stand') return 'Stand'
   if (name === 'hit') return 'Hit'
+  if (name === 'split') return 'Split'
+  if (name === 'surrender') return 'Surrender'
   return 'Double'
 }
 
-const recommendationLabel = (name: GtActionName | null) => {
+const recommendationLabel = (name: GtRecommendedAction | null) => {
   if (!name) return '--'
   return actionLabel(name).toUpperCase()
 }
@@ -208,7 +210,7 @@ export default function GameTheoryPanel({ visual, playerId, phase, canDouble }:
           </div>
 
           <div className="muted small">
-            MVP model: infinite deck, 1-step hit approximation, no blackjack bonus payout.
+            MVP model: infinite deck, full-depth optimal hit, no blackjack bonus payout.
           </div>
           {!!updatedAt && (
             <div className="muted small">Updated: {new Date(updatedAt).toLocaleTimeString()}</div>
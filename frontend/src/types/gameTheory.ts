@@ -1,4 +1,5 @@
-export type GtActionName = 'stand' | 'hit' | 'double'
+export type GtActionName = 'stand' | 'hit' | 'double' | 'split'
+export type GtRecommendedAction = GtActionName | 'surrender'
 
 export type GtOutcome = {
   delta: number
@@ -15,9 +16,10 @@ export type GtActionMetrics = {
 }
 
 export type GtRecommendations = {
-  ev_maximizer: GtActionName | null
-  risk_averse: GtActionName | null
-  security_level: GtActionName | null
+  ev_maximizer: GtRecommendedAction | null
+  risk_averse: GtRecommendedAction | null
+  security_level: GtRecommendedAction | null
+  insurance?: Record<'ev_maximizer' | 'risk_averse' | 'security_level', 'take' | 'decline'>
 }
 
 export type GtResponse = {
@@ -30,6 +32,15 @@ export type GtResponse = {
     rule: 'S17' | 'H17'
     can_double: boolean
     risk_lambda: number
+    hit_mode: 'optimal' | 'one_step'
+    outcome_format: 'entries' | 'compact'
+    can_split: boolean
+    max_split_hands: number
+    double_after_split: boolean
+    extra_actions: ('surrender' | 'insurance')[]
+    true_count: number | null
+    utility: 'sqrt' | 'log' | 'crra' | 'cara'
+    utility_param: number
   }
   dealer_distribution: {
     17: number
@@ -39,7 +50,18 @@ export type GtResponse = {
     21: number
     bust: number
   }
-  actions: Record<GtActionName, GtActionMetrics>
+  actions: Record<GtActionName, GtActionMetrics> & { surrender?: GtActionMetrics }
+  side_bets?: { insurance?: GtActionMetrics }
   recommendations: GtRecommendations
+  risk_averse_curve?: {
+    bankrolls: number[]
+    recommended: (GtRecommendedAction | null)[]
+    thresholds: { bankroll: number; from: GtRecommendedAction; to: GtRecommendedAction }[]
+  }
+  security_sweep?: {
+    risk_lambdas: number[]
+    recommended: (GtRecommendedAction | null)[]
+    crossovers: { risk_lambda: number; from: GtRecommendedAction; to: GtRecommendedAction }[]
+  }
 }
 
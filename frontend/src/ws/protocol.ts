@@ -51,6 +51,12 @@ export type AdminConfigMsg = {
   reshuffle_when_remaining_pct?: number
 }
 
+export type AdviseMsg = {
+  type: 'ADVISE'
+  risk_lambda?: number
+  use_count?: boolean
+}
+
 export type ClientMsg =
   | HelloMsg
   | JoinTableMsg
@@ -61,6 +67,7 @@ export type ClientMsg =
   | VoteContinueMsg
   | SyncMsg
   | AdminConfigMsg
+  | AdviseMsg
 
 export const clientMsg = {
   hello: (nickname: string, reconnectToken?: string | null): HelloMsg => ({
@@ -91,4 +98,5 @@ export const clientMsg = {
     type: 'ADMIN_CONFIG',
     ...payload,
   }),
+  advise: (payload: Omit<AdviseMsg, 'type'> = {}): AdviseMsg => ({ type: 'ADVISE', ...payload }),
 } as const